@@ -0,0 +1,65 @@
+"""
+Gemeinsame Hilfsfunktionen für die Benchmark-Skripte
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Sequence, Tuple
+
+# Backend-Quellen importierbar machen
+BACKEND_SRC = Path(__file__).resolve().parent.parent / "src"
+if str(BACKEND_SRC) not in sys.path:
+    sys.path.insert(0, str(BACKEND_SRC))
+
+import numpy as np
+
+from utils.pcm import pcm_to_float32, synthetic_speech  # noqa: F401 (Re-Export für die Skripte)
+
+
+def load_clip(path: Path) -> np.ndarray:
+    """Lädt einen Referenz-Clip als 16 kHz Mono float32 (WAV ohne ffmpeg, sonst über Whisper)"""
+    if path.suffix.lower() == ".wav":
+        return pcm_to_float32(path.read_bytes())
+    import whisper
+    return whisper.load_audio(str(path))
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Wortfehlerrate (Levenshtein auf Wortebene, ohne Groß-/Kleinschreibung)"""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def time_call(func: Callable, repeats: int = 3) -> Tuple[float, object]:
+    """Führt func wiederholt aus; gibt die beste Laufzeit und das letzte Ergebnis zurück"""
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def print_table(headers: Sequence[str], rows: List[Sequence[object]]):
+    """Gibt eine Markdown-Tabelle aus"""
+    print("| " + " | ".join(headers) + " |")
+    print("|" + "|".join("---" for _ in headers) + "|")
+    for row in rows:
+        print("| " + " | ".join(
+            f"{value:.3f}" if isinstance(value, float) else str(value) for value in row
+        ) + " |")
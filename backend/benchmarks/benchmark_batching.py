@@ -0,0 +1,67 @@
+"""
+Micro-Batching mit und ohne Prompt-Kontext: gleichzeitige Live-Chunks
+mehrerer Sessions einzeln, als gemeinsamer Batch ohne Prompt und als Batch
+mit eigenem Prompt je Session (wie mit PROMPT_CONTEXT_TOKENS > 0).
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/benchmark_batching.py --audio clip.wav --sessions 4
+    python benchmarks/benchmark_batching.py --sessions 8 --chunk-seconds 5
+
+Whisper dekodiert pro Prompt einen eigenen Batch; mit einem Prompt je
+Session entspricht die Laufzeit daher etwa der Einzeltranskription.
+"""
+import argparse
+from pathlib import Path
+
+from _common import load_clip, print_table, synthetic_speech, time_call
+
+import numpy as np
+import torch
+
+from engines.engine_factory import EngineFactory
+from engines.fidelity import get_profile_options
+from utils.pcm import SAMPLE_RATE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", type=Path, help="Referenz-Clip (WAV oder von ffmpeg lesbar) statt synthetischem Audio")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--sessions", type=int, default=4, help="Gleichzeitige Chunks (je einer pro Session)")
+    parser.add_argument("--chunk-seconds", type=float, default=10)
+    parser.add_argument("--language", default="de")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    engine = EngineFactory.get_engine("whisper", args.model, device)
+    samples = int(args.chunk_seconds * SAMPLE_RATE)
+    audio = load_clip(args.audio) if args.audio else synthetic_speech(args.chunk_seconds * args.sessions)
+    # Kürzere Clips werden wiederholt, damit jede Session einen vollen Chunk erhält
+    chunks = np.split(np.resize(audio, samples * args.sessions), args.sessions)
+    prompts = [f"Sitzung {i}: Protokoll der Besprechung." for i in range(args.sessions)]
+    options = get_profile_options("live")
+    options["language"] = args.language
+
+    measurements = [
+        ("Einzeln", lambda: [engine.transcribe(chunk, None, options) for chunk in chunks]),
+        ("Batch ohne Prompt", lambda: engine.transcribe_batch(chunks, [None] * len(chunks), options)),
+        ("Batch, Prompt je Session", lambda: engine.transcribe_batch(chunks, prompts, options)),
+    ]
+    rows = []
+    baseline = None
+    for label, func in measurements:
+        seconds, _ = time_call(func, args.repeats)
+        baseline = baseline or seconds
+        rows.append([label, seconds, seconds / (args.chunk_seconds * args.sessions), baseline / seconds])
+
+    print(f"{args.sessions} Sessions à {args.chunk_seconds:.0f} s, Modell: {args.model}, Gerät: {device}")
+    print_table(["Verfahren", "Zeit [s]", "RTF", "Speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
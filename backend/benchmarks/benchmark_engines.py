@@ -0,0 +1,72 @@
+"""
+Vergleich der ASR-Backends (openai-whisper vs. faster-whisper) auf einem
+Referenz-Clip: Laufzeit, Real-Time-Factor und Wortfehlerrate.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/benchmark_engines.py --audio clip.wav --reference clip.txt --models base,small
+
+Ohne --reference wird die WER gegen die Ausgabe von openai-whisper berechnet.
+Nicht installierte Backends werden übersprungen.
+"""
+import argparse
+from pathlib import Path
+
+from _common import load_clip, print_table, time_call, word_error_rate
+
+import torch
+
+from engines.engine_factory import EngineFactory
+from utils.pcm import duration_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", type=Path, required=True, help="Referenz-Clip (WAV oder von ffmpeg lesbar)")
+    parser.add_argument("--reference", type=Path, help="Textdatei mit der Referenztranskription")
+    parser.add_argument("--models", default="base", help="Kommagetrennte Modellgrößen")
+    parser.add_argument("--engines", default=",".join(EngineFactory.available_engines()))
+    parser.add_argument("--quantization", default="none", choices=["none", "int8"])
+    parser.add_argument("--language", default="de")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    audio = load_clip(args.audio)
+    audio_seconds = duration_seconds(audio)
+    reference = args.reference.read_text(encoding="utf-8") if args.reference else None
+    options = {"language": args.language, "temperature": 0.0}
+
+    rows = []
+    for model_size in [m.strip() for m in args.models.split(",") if m.strip()]:
+        baseline_time = None
+        baseline_text = None
+        for engine_type in [e.strip() for e in args.engines.split(",") if e.strip()]:
+            try:
+                engine = EngineFactory.get_engine(engine_type, model_size, device, args.quantization)
+            except RuntimeError as e:
+                print(f"{engine_type} übersprungen: {e}")
+                continue
+
+            seconds, result = time_call(lambda: engine.transcribe(audio, None, options), args.repeats)
+            text = result["text"].strip()
+            if baseline_time is None:
+                baseline_time, baseline_text = seconds, text
+
+            wer = word_error_rate(reference if reference is not None else baseline_text, text)
+            rows.append([
+                model_size, engine_type, seconds, seconds / audio_seconds,
+                baseline_time / seconds, wer
+            ])
+            engine.release()
+
+    print(f"Clip: {args.audio} ({audio_seconds:.1f} s), Gerät: {device}, Quantisierung: {args.quantization}")
+    wer_label = "WER (Referenz)" if reference is not None else "WER (vs. erste Engine)"
+    print_table(["Modell", "Engine", "Zeit [s]", "RTF", "Speedup", wer_label], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Latenz und Token-Verbrauch der Formatierung: regelbasierte lokale
+Formatierung gegen den LLM-Durchlauf (LLM_MODEL_LIGHT) auf einem
+Fixture-Korpus mit Whisper-Segmenten.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/benchmark_formatting.py
+    python benchmarks/benchmark_formatting.py --llm   # benötigt LLM_API_KEY
+
+Ohne --corpus wird benchmarks/fixtures/formatting_corpus.json verwendet
+(Liste von {"name", "text", "segments"}).
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from _common import print_table, time_call
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "fixtures" / "formatting_corpus.json"
+
+
+def paragraph_count(html_text: str) -> int:
+    return html_text.count("<p>")
+
+
+async def run_llm(corpus, rows):
+    from services.formatting_service import FormattingService
+    from utils.metrics import metrics
+
+    service = FormattingService(mode="llm")
+    for document in corpus:
+        prompt_before = metrics.get_counter("formatting.llm.prompt_tokens")
+        completion_before = metrics.get_counter("formatting.llm.completion_tokens")
+        start = time.perf_counter()
+        text = await service.format_text(document["text"])
+        seconds = time.perf_counter() - start
+        rows.append([
+            "LLM", document["name"], seconds * 1000,
+            int(metrics.get_counter("formatting.llm.prompt_tokens") - prompt_before),
+            int(metrics.get_counter("formatting.llm.completion_tokens") - completion_before),
+            paragraph_count(text)
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--llm", action="store_true", help="Zusätzlich den LLM-Durchlauf messen")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    from services.local_formatter import format_segments
+
+    corpus = json.loads(args.corpus.read_text(encoding="utf-8"))
+    rows = []
+    for document in corpus:
+        seconds, text = time_call(lambda: format_segments(document["segments"]), args.repeats)
+        rows.append(["Lokal", document["name"], seconds * 1000, 0, 0, paragraph_count(text)])
+
+    if args.llm:
+        asyncio.run(run_llm(corpus, rows))
+
+    words = sum(len(document["text"].split()) for document in corpus)
+    print(f"Korpus: {len(corpus)} Dokumente, {words} Wörter")
+    print_table(["Verfahren", "Dokument", "Zeit [ms]", "Prompt-Tokens", "Completion-Tokens", "Absätze"], rows)
+
+
+if __name__ == "__main__":
+    main()
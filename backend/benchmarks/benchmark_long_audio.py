@@ -0,0 +1,82 @@
+"""
+Wanduhrzeit langer Aufnahmen: ein einzelner Whisper-Aufruf gegen
+Aufteilung an Pausen mit parallelen Worker-Prozessen (split/fan-out/stitch).
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/benchmark_long_audio.py --minutes 10 --processes 1 2 4 --model base
+
+Ohne --audio wird eine synthetische Aufnahme mit Pausen alle ~3 Sekunden verwendet.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from _common import load_clip, print_table, synthetic_speech
+
+
+async def run(args, audio):
+    # Worker-Prozesse lesen die Konfiguration aus der Umgebung
+    os.environ["WHISPER_MODEL"] = args.model
+    os.environ["WHISPER_DEVICE_CUDA"] = args.model
+
+    from audio_processor import AudioProcessor
+    from services.long_audio import transcribe_long_audio
+    from utils.metrics import metrics
+    from utils.pcm import duration_seconds
+    from worker_pool import TranscriptionWorkerPool
+
+    audio_seconds = duration_seconds(audio)
+    audio_processor = AudioProcessor()
+    work_dir = Path(tempfile.mkdtemp())
+    rows = []
+
+    baseline = TranscriptionWorkerPool(processes=1)
+    await baseline.start()
+    try:
+        start = time.perf_counter()
+        await baseline.transcribe(audio, post_process=False, profile=args.profile)
+        seconds = time.perf_counter() - start
+        rows.append(["Ein Aufruf", 1, 1, seconds, seconds / audio_seconds, 1.0])
+    finally:
+        await baseline.stop()
+    single = seconds
+
+    for processes in args.processes:
+        pool = TranscriptionWorkerPool(processes=processes)
+        await pool.start()
+        try:
+            chunks_before = metrics.get_counter("transcription.long_audio.chunks")
+            start = time.perf_counter()
+            await transcribe_long_audio(
+                pool, audio_processor, audio, work_dir,
+                profile=args.profile, max_chunk_length=args.chunk_ms
+            )
+            seconds = time.perf_counter() - start
+        finally:
+            await pool.stop()
+        chunks = int(metrics.get_counter("transcription.long_audio.chunks") - chunks_before)
+        rows.append(["Fan-out", processes, chunks, seconds, seconds / audio_seconds, single / seconds])
+
+    print(f"Audio: {audio_seconds:.0f} s, Modell: {args.model}, Profil: {args.profile}, CPU-Kerne: {os.cpu_count()}")
+    print_table(["Verfahren", "Prozesse", "Chunks", "Zeit [s]", "RTF", "Speedup"], rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", type=Path, help="Lange Aufnahme (WAV oder von ffmpeg lesbar)")
+    parser.add_argument("--minutes", type=float, default=10.0, help="Länge der synthetischen Aufnahme")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--profile", default="balanced")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-ms", type=int, default=30000)
+    args = parser.parse_args()
+
+    audio = load_clip(args.audio) if args.audio else synthetic_speech(args.minutes * 60)
+    asyncio.run(run(args, audio))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Latenz und Genauigkeit der Fidelity-Profile (live, balanced, archival)
+auf einem Referenz-Clip.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/benchmark_profiles.py --audio clip.wav --reference clip.txt --model base
+
+Ohne --reference wird die WER gegen die Ausgabe des Profils "archival" berechnet.
+"""
+import argparse
+from pathlib import Path
+
+from _common import load_clip, print_table, time_call, word_error_rate
+
+import torch
+
+from engines.engine_factory import EngineFactory
+from engines.fidelity import available_profiles, get_profile_options
+from utils.pcm import duration_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", type=Path, required=True, help="Referenz-Clip (WAV oder von ffmpeg lesbar)")
+    parser.add_argument("--reference", type=Path, help="Textdatei mit der Referenztranskription")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--engine", default="whisper", choices=EngineFactory.available_engines())
+    parser.add_argument("--language", default="de")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    engine = EngineFactory.get_engine(args.engine, args.model, device)
+    audio = load_clip(args.audio)
+    audio_seconds = duration_seconds(audio)
+    reference = args.reference.read_text(encoding="utf-8") if args.reference else None
+
+    results = {}
+    for profile in available_profiles():
+        options = get_profile_options(profile)
+        options["language"] = args.language
+        seconds, result = time_call(lambda: engine.transcribe(audio, None, options), args.repeats)
+        results[profile] = (seconds, result["text"].strip())
+
+    baseline = reference if reference is not None else results["archival"][1]
+    rows = [
+        [profile, seconds, seconds / audio_seconds, word_error_rate(baseline, text)]
+        for profile, (seconds, text) in results.items()
+    ]
+
+    print(f"Clip: {args.audio} ({audio_seconds:.1f} s), Modell: {args.model}, Engine: {args.engine}, Gerät: {device}")
+    wer_label = "WER (Referenz)" if reference is not None else "WER (vs. archival)"
+    print_table(["Profil", "Zeit [s]", "RTF", wer_label], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Genauigkeit vs. Geschwindigkeit: Whisper in voller Präzision und mit
+dynamischer int8-Quantisierung (CPU) auf einem Referenz-Clip.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/benchmark_quantization.py --audio clip.wav --reference clip.txt --models base,small,medium
+
+Ohne --reference wird die WER gegen die Ausgabe des nicht quantisierten Modells berechnet.
+"""
+import argparse
+from pathlib import Path
+
+from _common import load_clip, print_table, time_call, word_error_rate
+
+import torch
+import whisper
+
+from engines.whisper_engine import quantize_whisper_model
+from utils.pcm import duration_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", type=Path, required=True, help="Referenz-Clip (WAV oder von ffmpeg lesbar)")
+    parser.add_argument("--reference", type=Path, help="Textdatei mit der Referenztranskription")
+    parser.add_argument("--models", default="base,small", help="Kommagetrennte Modellgrößen")
+    parser.add_argument("--language", default="de")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    audio = load_clip(args.audio)
+    audio_seconds = duration_seconds(audio)
+    reference = args.reference.read_text(encoding="utf-8") if args.reference else None
+
+    rows = []
+    for model_size in [m.strip() for m in args.models.split(",") if m.strip()]:
+        baseline_time = None
+        baseline_text = None
+        for mode in ("none", "int8"):
+            model = whisper.load_model(model_size, device="cpu")
+            if mode == "int8":
+                model = quantize_whisper_model(model)
+
+            seconds, result = time_call(
+                lambda: model.transcribe(audio, language=args.language, fp16=False, temperature=0.0),
+                args.repeats
+            )
+            text = result["text"].strip()
+            if mode == "none":
+                baseline_time, baseline_text = seconds, text
+
+            wer = word_error_rate(reference if reference is not None else baseline_text, text)
+            rows.append([
+                model_size, mode, seconds, seconds / audio_seconds,
+                baseline_time / seconds, wer
+            ])
+            del model
+
+    print(f"Clip: {args.audio} ({audio_seconds:.1f} s), Threads: {torch.get_num_threads()}")
+    wer_label = "WER (Referenz)" if reference is not None else "WER (vs. fp32)"
+    print_table(["Modell", "Modus", "Zeit [s]", "RTF", "Speedup", wer_label], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Laufzeit der Stilleerkennung: pydub.silence.detect_nonsilent gegen die
+vektorisierte NumPy-Variante (utils.vad.detect_nonsilent) auf derselben
+WAV-Datei, inklusive Prüfung auf identische Sprachbereiche.
+
+Aufruf (aus dem backend-Verzeichnis):
+    python benchmarks/benchmark_vad.py                   # 1 Stunde synthetisches Audio
+    python benchmarks/benchmark_vad.py --minutes 5 --pydub-minutes 5
+
+pydub prüft jede Millisekunde einzeln und braucht für eine Stunde viele
+Minuten; mit --pydub-minutes wird pydub nur auf dem Anfang gemessen und
+auf die volle Länge hochgerechnet (der Aufwand wächst linear).
+"""
+import argparse
+import io
+import time
+from pathlib import Path
+
+from _common import print_table, synthetic_speech
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", type=Path, help="16-bit-WAV-Datei statt synthetischem Audio")
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--pydub-minutes", type=float, default=2, help="0 = pydub auf der vollen Länge")
+    args = parser.parse_args()
+
+    from pydub import AudioSegment
+    from pydub.silence import detect_nonsilent as pydub_detect_nonsilent
+
+    from config import settings
+    from utils.pcm import float32_to_wav, read_wav_samples
+    from utils.vad import detect_nonsilent
+
+    data = args.audio.read_bytes() if args.audio else float32_to_wav(synthetic_speech(args.minutes * 60))
+    options = dict(min_silence_len=settings.AUDIO_MIN_SILENCE_LEN, silence_thresh=settings.AUDIO_SILENCE_THRESH)
+
+    start = time.perf_counter()
+    wav = read_wav_samples(data)
+    ranges = detect_nonsilent(wav.samples, wav.sample_rate, channels=wav.channels, sample_width=wav.sample_width, **options)
+    numpy_seconds = time.perf_counter() - start
+    audio_seconds = len(wav.samples) / wav.channels / wav.sample_rate
+
+    segment = AudioSegment.from_wav(io.BytesIO(data))
+    if args.pydub_minutes:
+        segment = segment[:int(args.pydub_minutes * 60 * 1000)]
+    start = time.perf_counter()
+    pydub_ranges = pydub_detect_nonsilent(segment, **options)
+    pydub_seconds = time.perf_counter() - start
+    measured = len(segment) / 1000
+    pydub_full = pydub_seconds * audio_seconds / measured
+
+    # Vergleich auf dem von pydub gemessenen Ausschnitt
+    prefix = read_wav_samples(segment.export(format="wav").read())
+    identical = [tuple(r) for r in pydub_ranges] == detect_nonsilent(
+        prefix.samples, prefix.sample_rate, channels=prefix.channels, sample_width=prefix.sample_width, **options
+    )
+
+    print(f"Audio: {audio_seconds / 60:.1f} min, {len(ranges)} Sprachbereiche, identisch zu pydub: {identical}")
+    print_table(
+        ["Verfahren", "Gemessen [s Audio]", "Zeit [s]", "Hochgerechnet [s]", "Speedup"],
+        [
+            ["pydub", measured, pydub_seconds, pydub_full, 1.0],
+            ["NumPy", audio_seconds, numpy_seconds, numpy_seconds, pydub_full / numpy_seconds],
+        ]
+    )
+
+
+if __name__ == "__main__":
+    main()
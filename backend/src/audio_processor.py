@@ -1,16 +1,28 @@
+import asyncio
 import subprocess
 from pathlib import Path
-from typing import List
-from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
+from typing import List, NamedTuple, Optional, Tuple
+import numpy as np
 import io
 import wave
 from utils.logger import get_logger
+from utils.metrics import metrics
 from utils.exceptions import AudioProcessingError
+from utils.pcm import (
+    SAMPLE_RATE, PCMInput, WavSamples, float32_to_int16, pcm_to_float32, read_wav_samples, samples_to_wav
+)
+from utils.vad import detect_nonsilent, runs
 from config import settings
 
 logger = get_logger(__name__)
 
+
+class AudioChunk(NamedTuple):
+    """Teilstück einer Aufnahme: Sicht auf den dekodierten Puffer und Startzeit"""
+    audio: np.ndarray
+    offset_ms: int
+
+
 class AudioProcessor:
     """
     Klasse zur Verarbeitung von Audiodateien.
@@ -24,28 +36,56 @@ class AudioProcessor:
         self.silence_thresh = settings.AUDIO_SILENCE_THRESH
         self.min_chunk_length = settings.AUDIO_MIN_CHUNK_LENGTH
         self.max_chunk_length = settings.AUDIO_MAX_CHUNK_LENGTH
+        self.vad_threshold = settings.VAD_THRESHOLD_DBFS
+        self.vad_frame_ms = settings.VAD_FRAME_MS
+        self.vad_padding_ms = settings.VAD_PADDING_MS
+        self.vad_min_speech_ms = settings.VAD_MIN_SPEECH_MS
+        self.ffmpeg_timeout = settings.FFMPEG_TIMEOUT_S
+        # Obergrenze gleichzeitiger ffmpeg-Prozesse der asynchronen Konvertierung
+        self.ffmpeg_slots = asyncio.Semaphore(max(1, settings.FFMPEG_MAX_PROCESSES))
+        self._ffmpeg_running = 0
         
         logger.debug(
             f"AudioProcessor initialisiert mit: "
             f"min_silence_len={self.min_silence_len}, "
             f"silence_thresh={self.silence_thresh}, "
             f"min_chunk_length={self.min_chunk_length}, "
-            f"max_chunk_length={self.max_chunk_length}"
+            f"max_chunk_length={self.max_chunk_length}, "
+            f"vad_threshold={self.vad_threshold}"
         )
     
+    @staticmethod
+    def _wav_command(input_path: Path, output_path: Path) -> List[str]:
+        """ffmpeg-Aufruf für die Konvertierung in eine WAV-Datei"""
+        return [
+            'ffmpeg',
+            '-i', str(input_path),
+            '-ar', '16000',       # Abtastrate auf 16 kHz
+            '-ac', '1',           # Mono
+            '-sample_fmt', 's16', # 16-bit PCM
+            str(output_path)
+        ]
+
+    @staticmethod
+    def _pcm_command() -> List[str]:
+        """ffmpeg-Aufruf für die Konvertierung von stdin zu rohem PCM auf stdout"""
+        return [
+            'ffmpeg',
+            '-hide_banner',
+            '-loglevel', 'error',
+            '-i', 'pipe:0',
+            '-ar', str(SAMPLE_RATE),  # Abtastrate auf 16 kHz
+            '-ac', '1',               # Mono
+            '-f', 's16le',            # 16-bit PCM ohne Header
+            'pipe:1'
+        ]
+
     def convert_webm_to_wav(self, input_path: Path, output_path: Path) -> bool:
         """
         Konvertiert WebM-Audio zu WAV-Format mit den für Whisper erforderlichen Parametern.
         """
         try:
-            command = [
-                'ffmpeg',
-                '-i', str(input_path),
-                '-ar', '16000',       # Abtastrate auf 16 kHz
-                '-ac', '1',           # Mono
-                '-sample_fmt', 's16', # 16-bit PCM
-                str(output_path)
-            ]
+            command = self._wav_command(input_path, output_path)
             
             result = subprocess.run(command, check=True, capture_output=True)
             if result.returncode != 0:
@@ -66,65 +106,372 @@ class AudioProcessor:
                 original_error=e
             )
 
+    def convert_to_pcm(self, content: bytes) -> np.ndarray:
+        """
+        Konvertiert Audiodaten (WebM, WAV, MP3) im Speicher zu 16-kHz-float32.
+
+        Die Daten gehen über stdin an ffmpeg, das rohes s16le-PCM auf stdout
+        schreibt; es entstehen keine temporären Dateien.
+        """
+        try:
+            result = subprocess.run(self._pcm_command(), input=content, check=True, capture_output=True)
+            return pcm_to_float32(result.stdout)
+
+        except subprocess.CalledProcessError as e:
+            raise AudioProcessingError(
+                f"FFmpeg-Fehler: {e.stderr.decode(errors='replace') if e.stderr else 'Unbekannter Fehler'}",
+                original_error=e
+            )
+        except Exception as e:
+            raise AudioProcessingError(
+                "Unerwarteter Fehler bei der Audiokonvertierung",
+                original_error=e
+            )
+
+    async def _run_ffmpeg(self, command: List[str], content: Optional[bytes] = None) -> bytes:
+        """
+        Führt ffmpeg als asyncio-Subprozess aus, ohne den Event-Loop zu blockieren.
+
+        Höchstens FFMPEG_MAX_PROCESSES Prozesse laufen gleichzeitig, weitere
+        warten auf einen freien Platz. Überschreitet ein Prozess
+        FFMPEG_TIMEOUT_S oder wird der Aufruf abgebrochen, wird er beendet.
+
+        Returns:
+            Ausgabe von ffmpeg auf stdout
+        """
+        async with self.ffmpeg_slots:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.PIPE if content is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            self._ffmpeg_running += 1
+            metrics.set_gauge("ffmpeg.running", self._ffmpeg_running)
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(content), self.ffmpeg_timeout)
+            except asyncio.TimeoutError as e:
+                await self._kill(process)
+                metrics.increment("ffmpeg.timeouts")
+                raise AudioProcessingError(
+                    f"FFmpeg-Zeitüberschreitung nach {self.ffmpeg_timeout} s",
+                    original_error=e
+                )
+            except BaseException:
+                # Abbruch (z.B. Client getrennt): Kindprozess nicht weiterlaufen lassen
+                await self._kill(process)
+                raise
+            finally:
+                self._ffmpeg_running -= 1
+                metrics.set_gauge("ffmpeg.running", self._ffmpeg_running)
+
+        if process.returncode != 0:
+            raise AudioProcessingError(
+                f"FFmpeg-Fehler: {stderr.decode(errors='replace') if stderr else 'Unbekannter Fehler'}",
+                original_error=subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+            )
+        return stdout
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process):
+        """Beendet einen ffmpeg-Prozess und wartet auf sein Ende"""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        await asyncio.shield(process.wait())
+
+    async def convert_webm_to_wav_async(self, input_path: Path, output_path: Path) -> bool:
+        """Asynchrone Variante von convert_webm_to_wav (siehe _run_ffmpeg)"""
+        try:
+            await self._run_ffmpeg(self._wav_command(input_path, output_path))
+            return True
+        except AudioProcessingError:
+            raise
+        except Exception as e:
+            raise AudioProcessingError(
+                "Unerwarteter Fehler bei der Audiokonvertierung",
+                original_error=e
+            )
+
+    async def convert_to_pcm_async(self, content: bytes) -> np.ndarray:
+        """Asynchrone Variante von convert_to_pcm (siehe _run_ffmpeg)"""
+        try:
+            return pcm_to_float32(await self._run_ffmpeg(self._pcm_command(), content))
+        except AudioProcessingError:
+            raise
+        except Exception as e:
+            raise AudioProcessingError(
+                "Unerwarteter Fehler bei der Audiokonvertierung",
+                original_error=e
+            )
+
     def detect_silence(self, audio_path: Path) -> List[tuple]:
         """
-        Erkennt Stille in einer Audiodatei.
+        Erkennt Stille in einer WAV-Datei und liefert die Sprachbereiche
+        (start_ms, end_ms) dazwischen, identisch zu pydubs detect_nonsilent
+        (siehe utils.vad.detect_nonsilent).
         """
         try:
-            audio = AudioSegment.from_wav(str(audio_path))
-            silence_ranges = detect_nonsilent(
-                audio,
+            wav = read_wav_samples(audio_path.read_bytes())
+            return detect_nonsilent(
+                wav.samples,
+                wav.sample_rate,
                 min_silence_len=self.min_silence_len,
-                silence_thresh=self.silence_thresh
+                silence_thresh=self.silence_thresh,
+                channels=wav.channels,
+                sample_width=wav.sample_width
             )
-            return silence_ranges
         except Exception as e:
             raise AudioProcessingError(
                 "Fehler bei der Stilleerkennung",
                 original_error=e
             )
 
-    def split_audio(self, audio_path: Path, output_dir: Path) -> List[Path]:
+    def _frame_size(self) -> int:
+        return max(1, SAMPLE_RATE * self.vad_frame_ms // 1000)
+
+    def frame_levels(self, pcm: np.ndarray) -> np.ndarray:
+        """
+        Pegel in dBFS je VAD_FRAME_MS-Frame (RMS), berechnet auf einer
+        (Frames × Samples)-Sicht des Arrays ohne Kopie. Ein unvollständiger
+        letzter Frame wird ignoriert.
         """
-        Teilt eine Audiodatei an Stellen der Stille.
+        frame = self._frame_size()
+        n_frames = len(pcm) // frame
+        frames = np.asarray(pcm[:n_frames * frame], dtype=np.float32).reshape(n_frames, frame)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+        return 20 * np.log10(np.maximum(rms, 1e-10))
+
+    def speech_mask(self, pcm: np.ndarray) -> np.ndarray:
+        """Sprachmaske je Frame: Pegel über VAD_THRESHOLD_DBFS"""
+        return self.frame_levels(pcm) > self.vad_threshold
+
+    def speech_bounds(self, pcm: np.ndarray) -> Optional[Tuple[int, int]]:
+        """
+        Energie-basierte Sprachaktivitätserkennung auf 16-kHz-float32-PCM.
+
+        Gibt den Bereich (start, end) in Samples vom ersten bis zum letzten
+        Frame über VAD_THRESHOLD_DBFS zurück, erweitert um VAD_PADDING_MS.
+        None, wenn weniger als VAD_MIN_SPEECH_MS Sprache enthalten sind.
+        """
+        frame = self._frame_size()
+        voiced = np.flatnonzero(self.speech_mask(pcm))
+        if len(voiced) == 0 or len(voiced) * self.vad_frame_ms < self.vad_min_speech_ms:
+            return None
+
+        padding = SAMPLE_RATE * self.vad_padding_ms // 1000
+        start = max(0, int(voiced[0]) * frame - padding)
+        end = min(len(pcm), (int(voiced[-1]) + 1) * frame + padding)
+        return start, end
+
+    def speech_ranges(self, pcm: np.ndarray) -> List[tuple]:
+        """
+        Sprachbereiche (start_ms, end_ms) auf Basis der Frame-Maske.
+
+        Pausen kürzer als min_silence_len werden überbrückt, damit
+        chunk_boundaries nur an echten Sprechpausen schneidet.
+        """
+        speech_runs = runs(self.speech_mask(pcm)) * self.vad_frame_ms
+        if len(speech_runs) == 0:
+            return []
+
+        starts, ends = speech_runs[:, 0], speech_runs[:, 1]
+        keep = starts[1:] - ends[:-1] >= self.min_silence_len
+        starts = starts[np.concatenate(([True], keep))]
+        ends = ends[np.concatenate((keep, [True]))]
+        return [(int(start), int(end)) for start, end in zip(starts, ends)]
+
+    def is_silence(self, audio: PCMInput) -> bool:
+        """
+        Prüft, ob ein Live-Chunk (s16le- oder WAV-Bytes bzw. PCM-Array)
+        keine Sprache enthält (siehe speech_bounds).
         """
         try:
-            if not output_dir.exists():
-                output_dir.mkdir(parents=True)
-                
-            audio = AudioSegment.from_wav(str(audio_path))
-            silence_ranges = self.detect_silence(audio_path)
-            
-            if not silence_ranges:
-                raise AudioProcessingError("Keine geeigneten Stellen zum Teilen gefunden")
-                
-            chunks = []
-            last_end = 0
-            
-            for start, end in silence_ranges:
-                if start - last_end >= self.min_chunk_length:
-                    chunk = audio[last_end:start]
-                    chunk_path = output_dir / f"chunk_{len(chunks)}.wav"
-                    chunk.export(str(chunk_path), format="wav")
-                    chunks.append(chunk_path)
-                last_end = end
-                
-            # Letztes Segment
-            if len(audio) - last_end >= self.min_chunk_length:
-                chunk = audio[last_end:]
-                chunk_path = output_dir / f"chunk_{len(chunks)}.wav"
-                chunk.export(str(chunk_path), format="wav")
-                chunks.append(chunk_path)
-                
-            if not chunks:
-                raise AudioProcessingError("Keine gültigen Audiochunks erzeugt")
-                
-            return chunks
-            
+            return self.speech_bounds(pcm_to_float32(audio)) is None
+        except AudioProcessingError:
+            raise
+        except Exception as e:
+            raise AudioProcessingError(
+                "Fehler bei der Stilleerkennung",
+                original_error=e
+            )
+
+    def process_audio_chunk(self, audio: PCMInput) -> List[np.ndarray]:
+        """
+        Teilt einen Live-Chunk im Speicher an Sprechpausen in Teilstücke
+        von höchstens AUDIO_MAX_CHUNK_LENGTH (siehe chunk_boundaries).
+
+        Returns:
+            float32-Sichten auf das dekodierte Audio (ohne Kopie); leer,
+            wenn der Chunk keine Sprache enthält. Kürzere Chunks als
+            AUDIO_MIN_CHUNK_LENGTH werden unverändert zurückgegeben.
+        """
+        try:
+            pcm = pcm_to_float32(audio)
+            speech_ranges = self.speech_ranges(pcm)
+            if not speech_ranges:
+                return []
+
+            duration_ms = len(pcm) * 1000 // SAMPLE_RATE
+            boundaries = self.chunk_boundaries(speech_ranges, duration_ms) or [(0, duration_ms)]
+            samples_per_ms = SAMPLE_RATE // 1000
+            # Das letzte Teilstück reicht bis zum Ende (auch über volle ms hinaus)
+            cuts = [start * samples_per_ms for start, _ in boundaries[1:]]
+            return [
+                pcm[start:end]
+                for start, end in zip([0] + cuts, cuts + [len(pcm)])
+            ]
+        except AudioProcessingError:
+            raise
+        except Exception as e:
+            raise AudioProcessingError(
+                "Fehler beim Aufteilen des Audio-Chunks",
+                original_error=e
+            )
+
+    def chunk_boundaries(
+        self,
+        speech_ranges: List[tuple],
+        duration_ms: int,
+        max_chunk_length: Optional[int] = None
+    ) -> List[tuple]:
+        """
+        Berechnet Chunk-Grenzen (start_ms, end_ms) aus den Sprachbereichen.
+
+        Geschnitten wird nur in der Mitte von Pausen. Ein Chunk wird so lang
+        wie möglich gewählt, ohne max_chunk_length (Standard: AUDIO_MAX_CHUNK_LENGTH)
+        zu überschreiten, und ist mindestens min_chunk_length lang; ein zu
+        kurzer Rest wird dem letzten Chunk zugeschlagen. Das gesamte Audio bleibt abgedeckt.
+        """
+        max_chunk_length = max_chunk_length or self.max_chunk_length
+        cuts = [
+            (end + next_start) // 2
+            for (_, end), (next_start, _) in zip(speech_ranges, speech_ranges[1:])
+        ]
+
+        boundaries = []
+        chunk_start = 0
+        previous_cut = None
+        for cut in cuts:
+            if cut - chunk_start > max_chunk_length:
+                if previous_cut is not None:
+                    boundaries.append((chunk_start, previous_cut))
+                    chunk_start = previous_cut
+                elif cut - chunk_start >= self.min_chunk_length:
+                    # Keine frühere Pause: an der ersten möglichen Stelle schneiden
+                    boundaries.append((chunk_start, cut))
+                    chunk_start = cut
+                    continue
+            previous_cut = cut if cut - chunk_start >= self.min_chunk_length else None
+
+        if (
+            duration_ms - chunk_start > max_chunk_length
+            and previous_cut is not None
+            and duration_ms - previous_cut >= self.min_chunk_length
+        ):
+            boundaries.append((chunk_start, previous_cut))
+            chunk_start = previous_cut
+        if duration_ms - chunk_start >= self.min_chunk_length:
+            boundaries.append((chunk_start, duration_ms))
+        elif boundaries:
+            boundaries[-1] = (boundaries[-1][0], duration_ms)
+        return boundaries
+
+    def _split_positions(self, wav: WavSamples, max_chunk_length: Optional[int] = None) -> List[Tuple[int, int, int]]:
+        """
+        Chunk-Grenzen als (start_sample, end_sample, offset_ms) auf wav.samples.
+        Das letzte Teilstück reicht bis zum Ende des Puffers.
+        """
+        speech_ranges = detect_nonsilent(
+            wav.samples,
+            wav.sample_rate,
+            min_silence_len=self.min_silence_len,
+            silence_thresh=self.silence_thresh,
+            channels=wav.channels,
+            sample_width=wav.sample_width
+        )
+        if not speech_ranges:
+            raise AudioProcessingError("Keine geeigneten Stellen zum Teilen gefunden")
+
+        frame_count = len(wav.samples) // wav.channels
+        duration_ms = round(1000 * (frame_count / wav.sample_rate))
+        boundaries = self.chunk_boundaries(speech_ranges, duration_ms, max_chunk_length)
+        if not boundaries:
+            raise AudioProcessingError("Keine gültigen Audiochunks erzeugt")
+
+        # Frame-Position einer Millisekunde wie beim Slicing von pydub
+        starts = [min(int(start * (wav.sample_rate / 1000.0)), frame_count) * wav.channels for start, _ in boundaries]
+        return [
+            (start, end, offset_ms)
+            for start, end, (offset_ms, _) in zip(starts, starts[1:] + [len(wav.samples)], boundaries)
+        ]
+
+    def split_samples(self, wav: WavSamples, max_chunk_length: Optional[int] = None) -> List[AudioChunk]:
+        """
+        Teilt dekodierte WAV-Samples an Stellen der Stille.
+
+        Returns:
+            Sichten auf wav.samples (ohne Kopie) mit ihrer Startzeit in ms
+        """
+        return [
+            AudioChunk(wav.samples[start:end], offset_ms)
+            for start, end, offset_ms in self._split_positions(wav, max_chunk_length)
+        ]
+
+    def split_pcm(self, pcm: np.ndarray, max_chunk_length: Optional[int] = None) -> List[AudioChunk]:
+        """
+        Teilt 16-kHz-float32-Audio an Stellen der Stille.
+
+        Die Stille wird auf der 16-bit-Quantisierung erkannt (wie bei einer
+        WAV-Datei); die Chunks sind Sichten auf pcm, die der Worker-Pool
+        direkt transkribiert.
+        """
+        wav = WavSamples(float32_to_int16(pcm), SAMPLE_RATE, 1, 2)
+        return [
+            AudioChunk(pcm[start:end], offset_ms)
+            for start, end, offset_ms in self._split_positions(wav, max_chunk_length)
+        ]
+
+    def export_chunks(
+        self,
+        chunks: List[AudioChunk],
+        output_dir: Path,
+        sample_rate: int = SAMPLE_RATE,
+        channels: int = 1,
+        sample_width: int = 2
+    ) -> List[Path]:
+        """Schreibt Chunks als WAV-Dateien (chunk_<n>.wav); float32-Chunks als 16 bit"""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for index, chunk in enumerate(chunks):
+            samples = float32_to_int16(chunk.audio) if chunk.audio.dtype == np.float32 else chunk.audio
+            path = output_dir / f"chunk_{index}.wav"
+            path.write_bytes(samples_to_wav(samples, sample_rate, channels, sample_width))
+            paths.append(path)
+        return paths
+
+    def split_audio(
+        self,
+        audio_path: Path,
+        output_dir: Path,
+        max_chunk_length: Optional[int] = None
+    ) -> List[Path]:
+        """
+        Teilt eine Audiodatei an Stellen der Stille und schreibt die Chunks
+        als WAV-Dateien (zur Fehlersuche; die Transkription nutzt split_pcm).
+        Die Datei wird nur einmal dekodiert.
+        """
+        try:
+            wav = read_wav_samples(audio_path.read_bytes())
+            chunks = self.split_samples(wav, max_chunk_length)
+            return self.export_chunks(chunks, output_dir, wav.sample_rate, wav.channels, wav.sample_width)
+
         except AudioProcessingError:
             raise
         except Exception as e:
             raise AudioProcessingError(
                 "Fehler beim Aufteilen der Audiodatei",
                 original_error=e
-            ) 
+            )
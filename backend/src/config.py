@@ -102,6 +102,11 @@ class Settings(BaseSettings):
         "http://frontend:3000"  # Docker internal network
     ]
     
+    @property
+    def model_ladder(self) -> List[str]:
+        """Modellgrößen der Lastleiter, größtes Modell zuerst (leer = aus)"""
+        return [size.strip() for size in self.MODEL_LADDER.split(",") if size.strip()]
+    
     # Dynamische CORS-Origins aus Umgebungsvariablen
     @property
     def dynamic_allowed_origins(self) -> List[str]:
@@ -125,11 +130,92 @@ class Settings(BaseSettings):
     AUDIO_SILENCE_THRESH: int = -32
     AUDIO_MIN_CHUNK_LENGTH: int = 2000
     AUDIO_MAX_CHUNK_LENGTH: int = 5000
+    # Debug: Chunks zusätzlich als WAV-Dateien ablegen (Transkription nutzt Sichten im Speicher)
+    AUDIO_EXPORT_CHUNKS: bool = False
+    # ffmpeg-Konvertierung von Uploads: "pipe" (stdin/stdout, ohne temporäre Dateien) oder "file" (über TEMP_DIR)
+    AUDIO_CONVERSION_MODE: str = "pipe"
+    # Gleichzeitige ffmpeg-Prozesse je API-Prozess und Zeitlimit pro Konvertierung (Sekunden)
+    FFMPEG_MAX_PROCESSES: int = 4
+    FFMPEG_TIMEOUT_S: float = 120.0
+    # Sprachaktivitätserkennung vor Whisper: Stille an den Rändern abschneiden,
+    # Chunks ohne Sprache gar nicht dekodieren (Schwelle in dBFS, Zeiten in ms)
+    VAD_ENABLED: bool = True
+    VAD_THRESHOLD_DBFS: int = -45
+    VAD_FRAME_MS: int = 30
+    VAD_PADDING_MS: int = 200
+    VAD_MIN_SPEECH_MS: int = 250
     
     # Transcription
+    # ASR-Backend: "whisper" (openai-whisper) oder "faster-whisper" (CTranslate2)
+    ASR_ENGINE: str = "whisper"
     WHISPER_MODEL: str = "base"
     WHISPER_DEVICE_CUDA: str = "large-v3"
+    # Quantisierung für CPU-Inferenz: "none" oder "int8" (dynamisch, Linear-Layer)
+    WHISPER_QUANTIZATION: str = "none"
+    # Kleines Entwurfsmodell für Live-Slices (z.B. "tiny"; leer = Hauptmodell verwenden)
+    WHISPER_DRAFT_MODEL: str = ""
+    # Probelauf auf einem stillen Clip nach dem Laden (Start und Neuladen), bevor /ready meldet
+    WHISPER_WARMUP: bool = True
+    # Segmente mit no_speech_prob über der Schwelle (und avg_logprob < -1) werden verworfen
+    WHISPER_NO_SPEECH_THRESHOLD: float = 0.6
+    # Rollierender Prompt-Kontext pro Live-Aufnahme: die letzten N Tokens bestätigten
+    # Texts gehen als initial_prompt an Whisper (0 = aus, Whisper nutzt höchstens 223).
+    # Gebatchte Live-Chunks (TRANSCRIPTION_BATCH_SIZE) laufen ohne Kontext, da Whisper
+    # pro Prompt einen eigenen Batch dekodiert
+    PROMPT_CONTEXT_TOKENS: int = 96
+    # Sprache der Transkription (z.B. "de", "en"); "auto" erkennt sie einmal pro Aufnahme
+    WHISPER_LANGUAGE: str = "de"
+    # Mindestdauer Sprache für die Erkennung; unsichere Erkennungen und Chunks mit
+    # Konfidenz unter LANGUAGE_RECHECK_LOGPROB lösen eine neue Erkennung aus
+    LANGUAGE_DETECTION_MIN_SPEECH_S: float = 3.0
+    LANGUAGE_MIN_PROBABILITY: float = 0.5
+    LANGUAGE_RECHECK_LOGPROB: float = -1.0
     MAX_WORKERS: int = 3
+    # Anzahl Worker-Prozesse mit eigenem Whisper-Modell (0 = im API-Prozess)
+    TRANSCRIPTION_PROCESSES: int = 0
+    # torch-Threads pro Whisper-Worker (0 = verfügbare Kerne / Worker) und Inter-op-Threads
+    TORCH_THREADS_PER_WORKER: int = 0
+    TORCH_INTEROP_THREADS: int = 1
+    # Beim Start Aufteilungen Prozesse x Threads messen und die mit dem besten Gesamt-RTF wählen
+    TRANSCRIPTION_AUTOTUNE: bool = False
+    TRANSCRIPTION_AUTOTUNE_SECONDS: int = 10
+    # Modelle in einem eigenen Prozess (python model_server.py), den mehrere
+    # API-Worker (uvicorn --workers N) über einen Unix-Socket gemeinsam nutzen
+    MODEL_SERVER_ENABLED: bool = False
+    MODEL_SERVER_SOCKET: str = "/tmp/voicetodoc-model.sock"
+    MODEL_SERVER_CONNECTIONS: int = 4
+    MODEL_SERVER_POLL_S: float = 5.0
+    # Lastleiter für Live-Chunks, z.B. "large-v3,small,base" (erster Eintrag = Hauptmodell,
+    # leer = aus): bei langer Queue oder Wartezeit eine Stufe kleiner, bei Entlastung zurück
+    MODEL_LADDER: str = ""
+    LADDER_QUEUE_DEPTH: int = 8
+    LADDER_WAIT_S: float = 3.0
+    LADDER_RECOVER_DEPTH: int = 1
+    # Mindestverweildauer auf einer Stufe (Sekunden), verhindert Hin- und Herschalten
+    LADDER_HOLD_S: float = 10.0
+    # Micro-Batching: bis zu N wartende Chunks innerhalb des Zeitfensters gemeinsam dekodieren
+    # (nur Profil "live"; die übrigen Profile brauchen Fallback-Leiter bzw. Beam-Search)
+    TRANSCRIPTION_BATCH_SIZE: int = 4
+    TRANSCRIPTION_BATCH_WINDOW_MS: int = 20
+    # Standard-Fidelity-Profil: "live", "balanced" oder "archival" (siehe engines/fidelity.py)
+    TRANSCRIPTION_PROFILE: str = "balanced"
+    # Finaler Durchlauf über die gesamte Aufnahme nach Aufnahmeende (Hauptmodell)
+    TRANSCRIPTION_FINAL_PROFILE: str = "archival"
+    # Aufbewahrungsdauer abgeschlossener Aufnahme-Sessions (Sekunden)
+    TRANSCRIPTION_SESSION_TTL: int = 3600
+    # Lange Uploads an Pausen teilen und parallel auf dem Worker-Pool transkribieren (0 = aus)
+    LONG_AUDIO_THRESHOLD_S: int = 120
+    LONG_AUDIO_CHUNK_MS: int = 30000
+    # Blockierende Upload-Schritte (ffmpeg, Dateien, Dekodierung) auf eigenem Thread-Pool;
+    # mehr als UPLOAD_MAX_PENDING gleichzeitige Uploads werden mit 503 abgelehnt
+    UPLOAD_EXECUTOR_WORKERS: int = 4
+    UPLOAD_MAX_PENDING: int = 16
+    UPLOAD_RETRY_AFTER_S: int = 5
+    # Inhaltsadressierter Cache (PCM-Hash + Modell + Sprache + Prompt)
+    TRANSCRIPTION_CACHE_ENABLED: bool = True
+    TRANSCRIPTION_CACHE_DIR: Path = DATA_DIR / "cache" / "transcriptions"
+    TRANSCRIPTION_CACHE_MEMORY_MB: int = 64
+    TRANSCRIPTION_CACHE_DISK_MB: int = 512
     
     # LLM API
     LLM_API_KEY: Optional[str] = os.getenv("LLM_API_KEY")
@@ -137,6 +223,18 @@ class Settings(BaseSettings):
     LLM_MODEL_LIGHT: str = "gpt-4o-mini"  # Für einfache Textformatierung
     LLM_TEMPERATURE: float = 0.7
     LLM_MAX_TOKENS: int = 4000
+    # Formatierung der Rohtranskription: "local" (regelbasiert, ohne Netzwerk) oder "llm" (LLM_MODEL_LIGHT)
+    FORMATTING_MODE: str = "local"
+    # Lokale Formatierung: neuer Absatz nach Sprechpausen ab N Sekunden bzw. nach N Sätzen
+    FORMATTING_PARAGRAPH_PAUSE_S: float = 1.5
+    FORMATTING_PARAGRAPH_SENTENCES: int = 5
+    # Asynchrone Formatierung der Rohtranskription (getrennt vom Transkriptionspfad)
+    FORMATTING_WORKERS: int = 2
+    # Bis zu N aufeinanderfolgende Slices einer Session in einem LLM-Aufruf formatieren (1 = aus)
+    FORMATTING_BATCH_SIZE: int = 1
+    FORMATTING_BATCH_WINDOW_MS: int = 2000
+    # Aufbewahrungsdauer formatierter Ergebnisse für GET /formatting/{id} (Sekunden)
+    FORMATTING_RESULT_TTL: int = 600
     
     # Storage-Konfiguration
     STORAGE_TYPE: str = "sql"  # oder "filesystem"
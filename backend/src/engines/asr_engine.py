@@ -0,0 +1,57 @@
+from abc import ABC, abstractmethod
+from typing import Optional, List, Dict, Any, Union, Tuple
+
+import numpy as np
+
+# Whisper-kompatibles Ergebnisformat:
+# {"text": str, "language": str, "segments": [{"start", "end", "text", "avg_logprob", "no_speech_prob"}]}
+TranscriptionResult = Dict[str, Any]
+
+
+class ASREngine(ABC):
+    """Basis-Interface für Spracherkennungs-Backends"""
+
+    def __init__(self, model_size: str, device: str, quantization: str = "none"):
+        self.model_size = model_size
+        self.device = device
+        self.quantization = quantization
+
+    @abstractmethod
+    def transcribe(
+        self,
+        pcm: Union[str, np.ndarray],
+        prompt: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> TranscriptionResult:
+        """
+        Transkribiert 16 kHz Mono-PCM (float32) oder eine Audiodatei.
+
+        Args:
+            pcm: float32-Array oder Dateipfad
+            prompt: Kontext aus vorherigem Text (initial_prompt)
+            options: Dekodier-Optionen im Whisper-Format (language, word_timestamps, ...)
+        """
+        pass
+
+    def transcribe_batch(
+        self,
+        pcms: List[np.ndarray],
+        prompts: List[Optional[str]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> List[TranscriptionResult]:
+        """Transkribiert mehrere Chunks; Backends ohne Batch-Unterstützung arbeiten sequenziell"""
+        return [self.transcribe(pcm, prompt, options) for pcm, prompt in zip(pcms, prompts)]
+
+    @abstractmethod
+    def detect_language(self, pcm: np.ndarray) -> Tuple[str, float]:
+        """
+        Erkennt die Sprache anhand der ersten 30 s eines 16-kHz-float32-Arrays.
+
+        Returns:
+            (Sprachcode, Wahrscheinlichkeit)
+        """
+        pass
+
+    def release(self):
+        """Gibt die Ressourcen des Modells frei"""
+        pass
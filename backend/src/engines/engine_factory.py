@@ -0,0 +1,33 @@
+import importlib
+from typing import Dict, Type
+from .asr_engine import ASREngine
+
+class EngineFactory:
+    # Modul und Klasse je Backend; importiert wird erst beim Laden eines Modells,
+    # damit torch/whisper den Start der API nicht verzögern
+    _engines: Dict[str, str] = {
+        "whisper": "whisper_engine:WhisperEngine",
+        "faster-whisper": "faster_whisper_engine:FasterWhisperEngine"
+    }
+    
+    @classmethod
+    def available_engines(cls) -> list:
+        """Namen aller registrierten ASR-Backends"""
+        return list(cls._engines)
+    
+    @classmethod
+    def get_engine(
+        cls,
+        engine_type: str,
+        model_size: str,
+        device: str,
+        quantization: str = "none"
+    ) -> ASREngine:
+        """Erstellt eine ASR-Engine-Instanz und lädt deren Modell"""
+        if engine_type not in cls._engines:
+            raise ValueError(f"Unbekannte ASR-Engine: {engine_type}")
+        
+        module_name, class_name = cls._engines[engine_type].split(":")
+        module = importlib.import_module(f".{module_name}", __package__)
+        engine_class: Type[ASREngine] = getattr(module, class_name)
+        return engine_class(model_size, device, quantization)
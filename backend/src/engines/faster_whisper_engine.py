@@ -0,0 +1,80 @@
+import importlib
+from typing import Optional, Dict, Any, Union, Tuple
+
+import numpy as np
+
+from .asr_engine import ASREngine, TranscriptionResult
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Optionale Abhängigkeit: CTranslate2-basiertes Whisper
+try:
+    WhisperModel = importlib.import_module("faster_whisper").WhisperModel  # type: ignore[attr-defined]
+except Exception:
+    WhisperModel = None
+
+
+class FasterWhisperEngine(ASREngine):
+    """
+    ASR-Backend auf Basis von faster-whisper (CTranslate2).
+
+    Nutzt dieselben Whisper-Gewichte, rechnet auf CPU aber mit optimierten
+    int8/float32-Kernels. Installation: pip install faster-whisper
+    """
+
+    def __init__(self, model_size: str, device: str, quantization: str = "none"):
+        super().__init__(model_size, device, quantization)
+        if WhisperModel is None:
+            raise RuntimeError("faster-whisper ist nicht installiert (pip install faster-whisper)")
+
+        self.model = WhisperModel(
+            model_size,
+            device=device,
+            compute_type=self._compute_type()
+        )
+
+    def _compute_type(self) -> str:
+        """Bildet WHISPER_QUANTIZATION auf den CTranslate2-compute_type ab"""
+        mode = (self.quantization or "none").lower()
+        if mode == "int8":
+            return "int8_float16" if self.device == "cuda" else "int8"
+        if mode != "none":
+            raise ValueError(f"Unbekannter Quantisierungsmodus: {mode}")
+        return "float16" if self.device == "cuda" else "float32"
+
+    def transcribe(
+        self,
+        pcm: Union[str, np.ndarray],
+        prompt: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> TranscriptionResult:
+        # None bedeutet "Standard" (z.B. greedy), faster-whisper erwartet dafür fehlende Werte
+        options = {key: value for key, value in (options or {}).items() if value is not None}
+        # faster-whisper nutzt standardmäßig Beam-Search, Whisper greedy
+        options.setdefault("beam_size", 1)
+
+        segments, info = self.model.transcribe(pcm, initial_prompt=prompt, **options)
+        segment_dicts = [
+            {
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "avg_logprob": segment.avg_logprob,
+                "no_speech_prob": segment.no_speech_prob
+            }
+            for segment in segments  # Generator: die Dekodierung läuft hier
+        ]
+        return {
+            "text": "".join(segment["text"] for segment in segment_dicts),
+            "language": info.language,
+            "segments": segment_dicts
+        }
+
+    def detect_language(self, pcm: np.ndarray) -> Tuple[str, float]:
+        # Die Spracherkennung läuft beim Aufruf, die Segmente werden nicht dekodiert
+        _, info = self.model.transcribe(pcm, beam_size=1)
+        return info.language, float(info.language_probability)
+
+    def release(self):
+        del self.model
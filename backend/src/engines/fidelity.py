@@ -0,0 +1,69 @@
+from typing import Dict, Any, Optional
+
+from config import settings
+
+# Dekodier-Profile im Whisper-Optionsformat:
+# - word_timestamps: zusätzlicher DTW-Durchlauf über die Cross-Attention
+# - beam_size / best_of: Beam-Search bei T=0 bzw. Sampling-Kandidaten bei T>0 (None = greedy)
+# - temperature: Fallback-Leiter; jede weitere Stufe dekodiert ein Segment erneut
+FIDELITY_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Live-Slices: ein greedy Durchlauf, keine Wiederholungen
+    "live": {
+        "word_timestamps": False,
+        "beam_size": None,
+        "best_of": None,
+        "temperature": (0.0,),
+        "condition_on_previous_text": False
+    },
+    # Standard: greedy mit kurzer Fallback-Leiter für Halluzinationen/Schleifen
+    "balanced": {
+        "word_timestamps": False,
+        "beam_size": None,
+        "best_of": None,
+        "temperature": (0.0, 0.4, 0.8)
+    },
+    # Nachbearbeitung ganzer Aufnahmen: Beam-Search und vollständige Fallback-Leiter
+    "archival": {
+        "word_timestamps": True,
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+    }
+}
+
+# Profil der Live-Entwürfe (Transcriber.transcribe_draft)
+DRAFT_PROFILE = "live"
+
+
+def available_profiles() -> list:
+    """Namen aller Fidelity-Profile"""
+    return list(FIDELITY_PROFILES)
+
+
+def resolve_profile(profile: Optional[str] = None) -> str:
+    """Gibt den Profilnamen zurück, Standard aus TRANSCRIPTION_PROFILE"""
+    name = profile or settings.TRANSCRIPTION_PROFILE
+    if name not in FIDELITY_PROFILES:
+        raise ValueError(f"Unbekanntes Fidelity-Profil: {name}")
+    return name
+
+
+def supports_batching(profile: Optional[str] = None) -> bool:
+    """
+    True, wenn ein gemeinsamer Whisper-Batch (WhisperEngine.transcribe_batch:
+    ein greedy Durchlauf bei T=0 ohne Zeitstempel) dieselben Ergebnisse liefert
+    wie die Einzeltranskription mit dem Profil. Fallback-Leiter, Beam-Search
+    und Wortzeitstempel gibt es nur bei der Einzeltranskription.
+    """
+    options = FIDELITY_PROFILES[resolve_profile(profile)]
+    return (
+        tuple(options["temperature"]) == (0.0,)
+        and not options["beam_size"]
+        and not options["best_of"]
+        and not options["word_timestamps"]
+    )
+
+
+def get_profile_options(profile: Optional[str] = None) -> Dict[str, Any]:
+    """Dekodier-Optionen eines Profils (Kopie, darf verändert werden)"""
+    return dict(FIDELITY_PROFILES[resolve_profile(profile)])
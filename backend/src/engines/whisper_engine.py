@@ -0,0 +1,145 @@
+from typing import Optional, List, Dict, Any, Union, Tuple
+
+import numpy as np
+import torch
+import whisper
+
+from .asr_engine import ASREngine, TranscriptionResult
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def quantize_whisper_model(model):
+    """
+    Quantisiert die Linear-Layer eines Whisper-Modells dynamisch nach int8.
+
+    Whispers eigene Linear-Klasse wird dafür auf torch.nn.Linear
+    zurückgeführt, da quantize_dynamic nur die Basisklasse ersetzt.
+    Auf CPU rechnet Whisper ohnehin in fp32, die Typ-Konvertierung
+    der Unterklasse wird dort nicht benötigt.
+    """
+    for module in model.modules():
+        if type(module) is whisper.model.Linear:
+            module.__class__ = torch.nn.Linear
+
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+class WhisperEngine(ASREngine):
+    """ASR-Backend auf Basis von openai-whisper (PyTorch)"""
+
+    def __init__(self, model_size: str, device: str, quantization: str = "none"):
+        super().__init__(model_size, device, quantization)
+        self.model = whisper.load_model(model_size, device=device)
+        self.model = self._quantize(self.model)
+
+    def _quantize(self, model):
+        """Quantisiert das Modell gemäß Konfiguration (nur CPU)"""
+        mode = (self.quantization or "none").lower()
+        if mode == "none":
+            return model
+        if mode != "int8":
+            raise ValueError(f"Unbekannter Quantisierungsmodus: {mode}")
+        if self.device != "cpu":
+            logger.warning("int8-Quantisierung ist nur auf CPU verfügbar, verwende volle Präzision")
+            return model
+
+        model = quantize_whisper_model(model)
+        logger.info("Whisper-Modell dynamisch nach int8 quantisiert")
+        return model
+
+    def transcribe(
+        self,
+        pcm: Union[str, np.ndarray],
+        prompt: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> TranscriptionResult:
+        # FP16 für GPU-Beschleunigung nutzen
+        return self.model.transcribe(
+            pcm,
+            initial_prompt=prompt,
+            fp16=(self.device == "cuda"),  # FP16 nur auf GPU
+            **(options or {})
+        )
+
+    def transcribe_batch(
+        self,
+        pcms: List[np.ndarray],
+        prompts: List[Optional[str]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> List[TranscriptionResult]:
+        """
+        Dekodiert kurze Chunks (<= 30 s) in einem gemeinsamen Encoder- und
+        Decoder-Durchlauf bei T=0 (greedy oder Beam-Search laut beam_size,
+        ohne Temperatur-Fallback). Chunks mit gleichem Prompt werden zusammen
+        dekodiert, da Whisper pro Batch nur einen Prompt unterstützt.
+        Whispers Beam-Search unterstützt nur einen Chunk pro Durchlauf; mit
+        beam_size wird daher jeder Chunk einzeln dekodiert.
+        """
+        options = options or {}
+        results: List[Optional[TranscriptionResult]] = [None] * len(pcms)
+
+        # Nach Prompt gruppieren, zu lange Chunks einzeln verarbeiten
+        groups: Dict[Optional[str], List[int]] = {}
+        for index, pcm in enumerate(pcms):
+            if pcm.shape[0] > whisper.audio.N_SAMPLES:
+                results[index] = self.transcribe(pcm, prompts[index], options)
+            else:
+                groups.setdefault(prompts[index] or None, []).append(index)
+
+        beam_size = options.get("beam_size")
+        batches = [
+            batch
+            for indices in groups.values()
+            for batch in ([[i] for i in indices] if beam_size else [indices])
+        ]
+
+        for indices in batches:
+            mel = torch.stack([
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(pcms[i]),
+                    n_mels=self.model.dims.n_mels,
+                    device=self.model.device
+                )
+                for i in indices
+            ])
+            decoding_options = whisper.DecodingOptions(
+                language=options.get("language"),
+                temperature=0.0,
+                beam_size=beam_size,
+                prompt=prompts[indices[0]] or None,
+                without_timestamps=True,
+                fp16=(self.device == "cuda")
+            )
+            for index, decoded in zip(indices, whisper.decode(self.model, mel, decoding_options)):
+                results[index] = {
+                    "text": decoded.text,
+                    "language": decoded.language,
+                    "segments": [{
+                        "start": 0.0,
+                        "end": pcms[index].shape[0] / whisper.audio.SAMPLE_RATE,
+                        "text": decoded.text,
+                        "avg_logprob": decoded.avg_logprob,
+                        "no_speech_prob": decoded.no_speech_prob
+                    }]
+                }
+
+        return results
+
+    def detect_language(self, pcm: np.ndarray) -> Tuple[str, float]:
+        """Ein Encoder-Durchlauf plus ein Decoder-Schritt über den Sprach-Tokens"""
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(pcm),
+            n_mels=self.model.dims.n_mels,
+            device=self.model.device
+        )
+        _, probs = self.model.detect_language(mel)
+        language = max(probs, key=probs.get)
+        return language, float(probs[language])
+
+    def release(self):
+        del self.model
+        torch.cuda.empty_cache()  # GPU-Speicher freigeben
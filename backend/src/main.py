@@ -1,3 +1,7 @@
+import time
+# Startzeitpunkt für die Kaltstart-Metrik (vor allen übrigen Importen)
+STARTUP_STARTED = time.perf_counter()
+
 from fastapi import FastAPI, WebSocket, UploadFile, File, HTTPException, WebSocketDisconnect, Body, BackgroundTasks, Request, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
@@ -9,9 +13,12 @@ from pathlib import Path
 import uuid
 import logging
 import shutil
-from transcriber import Transcriber
+from engines.engine_factory import EngineFactory
+from engines.fidelity import available_profiles, resolve_profile
 from audio_processor import AudioProcessor
 from queue_manager import TranscriptionQueueManager
+from worker_pool import TranscriptionWorkerPool
+from model_server import ModelServerClient
 import json
 import backoff
 from contextlib import asynccontextmanager
@@ -19,11 +26,21 @@ from services.template_service import TemplateService, TemplateNotFoundError
 from models.template import Template, TemplateUpdate
 from typing import List
 from utils.logger import get_logger, configure_logging
-from utils.exceptions import VoiceToDocException, AudioProcessingError, TranscriptionError, handle_voice_to_doc_exception
+from utils.exceptions import VoiceToDocException, AudioProcessingError, TranscriptionError, ServiceOverloadedError, ModelNotReadyError, handle_voice_to_doc_exception
+from utils.bounded_executor import BoundedExecutor
 from config import settings
 from pydantic import BaseModel
 from services.template_processor import TemplateProcessor
+from services.formatting_service import FormattingService
+from services.transcription_cache import TranscriptionCache
+from services.transcription_sessions import TranscriptionSessionManager
+from services.long_audio import transcribe_long_audio
+from services.language_cache import SessionLanguageCache
+from services.prompt_context import SessionPromptContext
+from utils.metrics import metrics
+from utils.pcm import pcm_to_float32, duration_seconds
 import math
+import numpy as np
 
 # Verzeichnisse erstellen
 LOG_DIR = Path("/app/data/logs")
@@ -46,6 +63,25 @@ logger = get_logger(__name__)
 # Speicher für Verarbeitungsergebnisse
 processing_results: Dict[str, Any] = {}
 
+# Laufende Formatierungen je Cache-Schlüssel
+pending_formatting: Dict[str, str] = {}
+
+async def load_models(app: FastAPI):
+    """
+    Lädt und wärmt die Whisper-Modelle nach dem Start im Hintergrund auf.
+    Die API nimmt währenddessen Verbindungen an; /ready meldet 503, bis die Modelle bereit sind.
+    """
+    try:
+        await app.state.worker_pool.start()
+    except Exception as e:
+        logger.error(f"Whisper-Modelle konnten nicht geladen werden: {str(e)}", exc_info=True)
+        app.state.startup_error = str(e)
+        return
+    
+    cold_start = time.perf_counter() - STARTUP_STARTED
+    metrics.set_gauge("startup.cold_start_seconds", cold_start)
+    logger.info(f"Anwendung bereit nach {cold_start:.1f} s Kaltstart")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -59,18 +95,53 @@ async def lifespan(app: FastAPI):
         # Initialisiere Komponenten
         app.state.template_service = TemplateService()
         app.state.template_processor = TemplateProcessor()
-        app.state.transcriber = Transcriber()
         app.state.audio_processor = AudioProcessor()
+        # Blockierende Upload-Schritte laufen nicht auf dem Event-Loop
+        app.state.upload_executor = BoundedExecutor("upload")
+        
+        # Whisper-Modelle (im API-Prozess oder in Worker-Prozessen) werden in load_models geladen;
+        # mit MODEL_SERVER_ENABLED nutzen alle API-Worker den gemeinsamen Modell-Server
+        app.state.worker_pool = (
+            ModelServerClient() if settings.MODEL_SERVER_ENABLED else TranscriptionWorkerPool()
+        )
+        app.state.startup_error = None
+        
+        # LLM-Formatierung läuft asynchron neben der Transkription
+        app.state.formatting_service = FormattingService()
+        app.state.transcription_cache = (
+            TranscriptionCache() if settings.TRANSCRIPTION_CACHE_ENABLED else None
+        )
+        
+        # WHISPER_LANGUAGE=auto: Spracherkennung einmal pro Aufnahme statt pro Chunk
+        app.state.language_cache = SessionLanguageCache(
+            worker_pool=app.state.worker_pool,
+            audio_processor=app.state.audio_processor
+        )
+        
+        # Bestätigter Text einer Aufnahme als Prompt für die folgenden Chunks
+        app.state.prompt_context = SessionPromptContext()
+        
+        # Live-Aufnahmen: Entwürfe je Slice, finaler Durchlauf nach Aufnahmeende
+        app.state.session_manager = TranscriptionSessionManager(
+            worker_pool=app.state.worker_pool,
+            audio_processor=app.state.audio_processor,
+            formatter=app.state.formatting_service,
+            work_dir=TEMP_DIR,
+            language_cache=app.state.language_cache
+        )
         
-        # Queue-Manager mit Transcriber initialisieren
+        # Queue-Manager mit Worker-Pool initialisieren
         app.state.queue_manager = TranscriptionQueueManager(
-            max_workers=2,
-            transcriber=app.state.transcriber
+            worker_pool=app.state.worker_pool,
+            formatter=app.state.formatting_service,
+            prompt_context=app.state.prompt_context
         )
         
-        # Starte Dienste
+        # Starte Dienste; die Modelle laden im Hintergrund (siehe /ready)
+        app.state.model_loader = asyncio.create_task(load_models(app))
+        await app.state.formatting_service.start()
         await app.state.queue_manager.start()
-        logger.info("Alle Komponenten erfolgreich initialisiert")
+        logger.info("Alle Komponenten initialisiert, Whisper-Modelle werden geladen")
         
         yield
     finally:
@@ -78,8 +149,19 @@ async def lifespan(app: FastAPI):
         logger.info("Fahre Anwendung herunter...")
         
         # Cleanup der Komponenten
+        if hasattr(app.state, 'model_loader') and not app.state.model_loader.done():
+            app.state.model_loader.cancel()
+            await asyncio.gather(app.state.model_loader, return_exceptions=True)
         if hasattr(app.state, 'queue_manager'):
             await app.state.queue_manager.stop()
+        if hasattr(app.state, 'session_manager'):
+            await app.state.session_manager.stop()
+        if hasattr(app.state, 'formatting_service'):
+            await app.state.formatting_service.stop()
+        if hasattr(app.state, 'worker_pool'):
+            await app.state.worker_pool.stop()
+        if hasattr(app.state, 'upload_executor'):
+            await asyncio.to_thread(app.state.upload_executor.shutdown)
             
         # Bereinige temporäre Dateien
         if TEMP_DIR.exists():
@@ -135,9 +217,13 @@ async def general_exception_handler(request, exc):
 async def voice_to_doc_exception_handler(request, exc: VoiceToDocException):
     """Globaler Exception Handler für anwendungsspezifische Fehler"""
     http_exc = handle_voice_to_doc_exception(exc)
+    headers = None
+    if isinstance(exc, ServiceOverloadedError):
+        headers = {"Retry-After": str(exc.retry_after)}
     return JSONResponse(
         status_code=http_exc.status_code,
-        content=http_exc.detail
+        content=http_exc.detail,
+        headers=headers
     )
 
 class AudioUploadResponse(JSONResponse):
@@ -156,6 +242,52 @@ class AudioUploadResponse(JSONResponse):
         sanitized_content = sanitize_content(content)
         return super().render(sanitized_content)
 
+def require_models_ready():
+    """Lehnt Transkriptionen mit 503 ab, solange die Whisper-Modelle noch laden"""
+    if not app.state.worker_pool.ready:
+        raise ModelNotReadyError("Whisper-Modelle werden noch geladen", settings.UPLOAD_RETRY_AFTER_S)
+
+def submit_formatting(
+    text: str,
+    session_id: Optional[str],
+    cache_key: Optional[str],
+    segments: Optional[List[Dict[str, Any]]] = None
+) -> str:
+    """Reiht die Formatierung (mit Whisper-Segmenten) ein und übernimmt das Ergebnis in den Cache"""
+    callback = None
+    if cache_key:
+        async def callback(update: Dict[str, Any]):
+            pending_formatting.pop(cache_key, None)
+            # Gemeinsam formatierte Slices lassen sich keinem einzelnen Audio zuordnen
+            if update["status"] == "completed" and len(update["formatting_ids"]) == 1:
+                app.state.transcription_cache.set_formatted(cache_key, update["text"])
+    
+    formatting_id = app.state.formatting_service.submit(
+        text, session_id=session_id, callback=callback, segments=segments
+    )
+    if cache_key:
+        pending_formatting[cache_key] = formatting_id
+    return formatting_id
+
+def cached_upload_response(cached: Dict[str, Any], cache_key: str, session_id: Optional[str]) -> Dict[str, Any]:
+    """Antwort für einen Cache-Treffer, inklusive bereits formatiertem Text"""
+    response = {
+        "text": cached["text"],
+        "confidence": cached["confidence"],
+        "status": "success",
+        "cached": True
+    }
+    if cached.get("formatted_text") is not None:
+        response.update(formatted_text=cached["formatted_text"], formatting_status="completed")
+        return response
+    
+    # Formatierung noch ausstehend: auf den laufenden Job verweisen statt erneut zu formatieren
+    formatting_id = pending_formatting.get(cache_key)
+    if formatting_id is None or app.state.formatting_service.get_job(formatting_id) is None:
+        formatting_id = submit_formatting(cached["text"], session_id, cache_key)
+    response.update(formatting_id=formatting_id, formatting_status="pending")
+    return response
+
 @app.post("/upload_audio", 
     tags=["Audio"],
     summary="Audio-Datei hochladen und transkribieren",
@@ -168,7 +300,9 @@ class AudioUploadResponse(JSONResponse):
                     "example": {
                         "text": "Beispieltext der Transkription",
                         "confidence": 0.95,
-                        "status": "success"
+                        "status": "success",
+                        "formatting_id": "3f1c2a9e-...",
+                        "formatting_status": "pending"
                     }
                 }
             }
@@ -196,20 +330,45 @@ class AudioUploadResponse(JSONResponse):
         }
     }
 )
-@backoff.on_exception(backoff.expo, Exception, max_tries=3)
+@backoff.on_exception(
+    backoff.expo,
+    Exception,
+    max_tries=3,
+    # Client-Fehler und Überlast nicht wiederholen: 400/503 sollen sofort beim Client ankommen
+    giveup=lambda e: isinstance(e, (HTTPException, ServiceOverloadedError))
+)
 async def upload_audio(
     file: UploadFile = File(
         ...,
         description="Audio-Datei im WebM, WAV oder MP3 Format"
+    ),
+    session_id: Optional[str] = Form(
+        None,
+        description="Optionale Aufnahme-ID; Slices derselben Session können gemeinsam formatiert werden"
+    ),
+    profile: Optional[str] = Form(
+        None,
+        description="Fidelity-Profil: live, balanced oder archival (Standard: TRANSCRIPTION_PROFILE)"
+    ),
+    draft: bool = Form(
+        False,
+        description="Schneller Entwurf mit WHISPER_DRAFT_MODEL; mit session_id wird das Audio für den finalen Durchlauf gesammelt"
     )
 ):
     """
     Lädt eine Audiodatei hoch und transkribiert sie.
     
     - **file**: Die hochzuladende Audiodatei
+    - **session_id**: Optionale ID der laufenden Aufnahme
+    - **profile**: Fidelity-Profil (Wortzeitstempel, Beam-Search, Temperatur-Fallback)
+    - **draft**: Live-Slice als Entwurf transkribieren (ohne Cache und LLM-Formatierung);
+      der finale Text folgt über POST /sessions/{session_id}/finalize
+    
+    Der Whisper-Rohtext wird sofort zurückgegeben. Die LLM-Formatierung läuft
+    im Hintergrund und ist über GET /formatting/{formatting_id} abrufbar.
     
     Returns:
-        Ein Dictionary mit dem transkribierten Text, der Konfidenz und dem Status
+        Ein Dictionary mit dem Rohtext, der Konfidenz, dem Status und der Formatierungs-ID
     
     Raises:
         HTTPException: Bei ungültigen Dateiformaten oder Verarbeitungsfehlern
@@ -221,50 +380,94 @@ async def upload_audio(
                 detail="Nicht unterstütztes Audioformat. Erlaubt sind: WebM, WAV, MP3"
             )
         
-        # Eindeutigen Dateinamen generieren
-        webm_file = TEMP_DIR / f"{uuid.uuid4()}.webm"
-        wav_file = TEMP_DIR / f"{uuid.uuid4()}.wav"
-        
         try:
-            # WebM-Datei speichern
-            content = await file.read()
-            if len(content) == 0:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Die Audiodatei ist leer"
+            profile = resolve_profile(profile)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Ungültiges Fidelity-Profil: {profile}. Erlaubt sind: {', '.join(available_profiles())}"
+            )
+        require_models_ready()
+        
+        executor = app.state.upload_executor
+        
+        # Upload einlesen
+        content = await file.read()
+        if len(content) == 0:
+            raise HTTPException(
+                status_code=400,
+                detail="Die Audiodatei ist leer"
+            )
+            
+        # Blockierende Schritte laufen auf dem begrenzten Upload-Executor;
+        # ist dessen Warteschlange voll, wird mit 503 und Retry-After abgelehnt
+        async with executor.admit():
+            # Zu 16-kHz-PCM konvertieren: Grundlage für Cache-Schlüssel und Whisper-Eingabe
+            pcm = await convert_upload(content)
+                
+            language_cache = app.state.language_cache
+            # Slices einer Session erhalten den bisher bestätigten Text als Kontext
+            prompt_context = app.state.prompt_context
+            prompt = prompt_context.get(session_id)
+            if draft:
+                # Entwurf sofort liefern; der finale Durchlauf ersetzt ihn nach Aufnahmeende
+                language = await language_cache.resolve(session_id, pcm)
+                text, confidence = await app.state.worker_pool.transcribe_draft(pcm, prompt, language=language)
+                language_cache.report(session_id, confidence)
+                prompt_context.confirm(session_id, text)
+                if session_id:
+                    app.state.session_manager.add_draft(session_id, pcm, text)
+                return {
+                    "text": text,
+                    "confidence": confidence,
+                    "status": "success",
+                    "draft": True
+                }
+                
+            cache = app.state.transcription_cache
+            cache_key = (
+                await executor.run(
+                    cache.make_key, pcm, prompt, language=settings.WHISPER_LANGUAGE, profile=profile
                 )
+                if cache else None
+            )
+            cached = await executor.run(cache.get, cache_key) if cache else None
+            if cached:
+                # Treffer: weder Whisper noch LLM werden aufgerufen
+                prompt_context.confirm(session_id, cached["text"])
+                return cached_upload_response(cached, cache_key, session_id)
                 
-            with open(webm_file, "wb") as buffer:
-                buffer.write(content)
-            
-            # Zu WAV konvertieren
-            if not app.state.audio_processor.convert_webm_to_wav(webm_file, wav_file):
-                raise HTTPException(
-                    status_code=500,
-                    detail="Fehler bei der Audio-Konvertierung"
+            # Ohne session_id wird die Sprache nur für diesen Upload erkannt
+            language = await language_cache.resolve(session_id, pcm)
+            if settings.LONG_AUDIO_THRESHOLD_S and duration_seconds(pcm) > settings.LONG_AUDIO_THRESHOLD_S:
+                # Lange Aufnahmen: an Pausen teilen und parallel auf allen Workern transkribieren
+                text, confidence, segments = await transcribe_long_audio(
+                    app.state.worker_pool, app.state.audio_processor, pcm, TEMP_DIR,
+                    profile=profile, language=language, executor=executor
                 )
-            
-            # Transkription durchführen
-            text, confidence = app.state.transcriber.transcribe_audio(wav_file)
-            
+            else:
+                # Transkription auf dem nächsten freien Worker durchführen, ohne auf das LLM zu warten
+                text, confidence, segments = await app.state.worker_pool.transcribe(
+                    pcm, prompt, post_process=False, profile=profile, language=language, with_segments=True
+                )
+            language_cache.report(session_id, confidence)
+            prompt_context.confirm(session_id, text)
+                
+            # Während eines Modellwechsels ist unklar, welches Modell transkribiert hat
+            store = cache is not None and not app.state.worker_pool.reloading
+            if store:
+                await executor.run(cache.put, cache_key, text, confidence)
+            formatting_id = submit_formatting(text, session_id, cache_key if store else None, segments)
+                
             return {
                 "text": text,
                 "confidence": confidence,
-                "status": "success"
+                "status": "success",
+                "formatting_id": formatting_id,
+                "formatting_status": "pending"
             }
-            
-        except Exception as e:
-            raise
-        finally:
-            # Aufräumen der temporären Dateien
-            for file in [webm_file, wav_file]:
-                if file.exists():
-                    try:
-                        file.unlink()
-                    except Exception as e:
-                        logger.warning(f"Fehler beim Löschen der temporären Datei {file}: {str(e)}")
     
-    except HTTPException:
+    except (HTTPException, ServiceOverloadedError):
         raise
     except Exception as e:
         logger.error(f"Fehler beim Hochladen/Transkribieren: {str(e)}", exc_info=True)
@@ -273,21 +476,152 @@ async def upload_audio(
             detail=f"Verarbeitungsfehler: {str(e)}"
         )
 
+async def convert_upload(content: bytes) -> np.ndarray:
+    """
+    Konvertiert hochgeladene Audiodaten zu 16-kHz-float32 (Aufruf innerhalb
+    von executor.admit()).
+
+    ffmpeg läuft als asyncio-Subprozess mit begrenzter Parallelität
+    (FFMPEG_MAX_PROCESSES) und Zeitlimit. Im Modus "pipe" (AUDIO_CONVERSION_MODE)
+    laufen die Daten über stdin/stdout, "file" schreibt Upload und WAV wie
+    bisher nach TEMP_DIR.
+    """
+    executor = app.state.upload_executor
+    audio_processor = app.state.audio_processor
+    if settings.AUDIO_CONVERSION_MODE == "pipe":
+        return await audio_processor.convert_to_pcm_async(content)
+
+    webm_file = TEMP_DIR / f"{uuid.uuid4()}.webm"
+    wav_file = TEMP_DIR / f"{uuid.uuid4()}.wav"
+    try:
+        await executor.run(webm_file.write_bytes, content)
+        if not await audio_processor.convert_webm_to_wav_async(webm_file, wav_file):
+            raise HTTPException(
+                status_code=500,
+                detail="Fehler bei der Audio-Konvertierung"
+            )
+        return await executor.run(lambda: pcm_to_float32(wav_file.read_bytes()))
+    finally:
+        for path in [webm_file, wav_file]:
+            try:
+                path.unlink(missing_ok=True)
+            except Exception as e:
+                logger.warning(f"Fehler beim Löschen der temporären Datei {path}: {str(e)}")
+
+async def read_recording(file: UploadFile) -> np.ndarray:
+    """Konvertiert eine hochgeladene Aufnahme und dekodiert sie zu 16-kHz-float32"""
+    executor = app.state.upload_executor
+    content = await file.read()
+    if len(content) == 0:
+        raise HTTPException(status_code=400, detail="Die Audiodatei ist leer")
+    async with executor.admit():
+        return await convert_upload(content)
+
+@app.post("/sessions/{session_id}/finalize",
+    tags=["Audio"],
+    summary="Finalen Durchlauf einer Live-Aufnahme starten"
+)
+async def finalize_session(
+    session_id: str,
+    file: Optional[UploadFile] = File(
+        None,
+        description="Optional die vollständige Aufnahme; sonst werden die Entwurfs-Slices verwendet"
+    )
+):
+    """
+    Transkribiert die gesamte Aufnahme im Hintergrund mit dem Hauptmodell
+    (Profil TRANSCRIPTION_FINAL_PROFILE) und kehrt sofort zurück.
+    Der Fortschritt ist über GET /sessions/{session_id} abrufbar.
+    """
+    require_models_ready()
+    try:
+        pcm = await read_recording(file) if file is not None else None
+        session = app.state.session_manager.finalize(session_id, pcm)
+        # Die Aufnahme ist beendet, der Prompt-Kontext der Slices wird nicht mehr benötigt
+        app.state.prompt_context.discard(session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except AudioProcessingError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return session.to_dict()
+
+@app.get("/sessions/{session_id}",
+    tags=["Audio"],
+    summary="Stand einer Live-Aufnahme abrufen"
+)
+async def get_session(session_id: str):
+    """Gibt Entwurfstext, Status und ggf. den finalen Text einer Aufnahme zurück"""
+    session = app.state.session_manager.get(session_id)
+    if session is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Session {session_id} nicht gefunden"
+        )
+    return session.to_dict()
+
+@app.get("/metrics",
+    tags=["System"],
+    summary="Laufzeitmetriken abrufen"
+)
+async def get_metrics(request: Request):
+    """Gibt Zähler und Messwerte des API-Prozesses zurück (z.B. Cache-Treffer)"""
+    snapshot = metrics.snapshot()
+    cache = getattr(request.app.state, "transcription_cache", None)
+    if cache:
+        snapshot["transcription_cache"] = cache.stats()
+    return snapshot
+
+@app.get("/formatting/{formatting_id}",
+    tags=["Audio"],
+    summary="Formatierte Transkription abrufen"
+)
+async def get_formatting_result(formatting_id: str):
+    """
+    Gibt den Stand der asynchronen LLM-Formatierung zurück.
+    
+    Wurden mehrere Slices gemeinsam formatiert, enthält `batch` alle
+    zugehörigen Formatierungs-IDs und `text` die gemeinsame Fassung.
+    """
+    job = app.state.formatting_service.get_job(formatting_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Formatierung {formatting_id} nicht gefunden"
+        )
+    return job.to_dict()
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """
     WebSocket-Endpunkt für Echtzeit-Audiostreaming und Transkription.
+    
+    Audio wird als Binärnachricht gesendet. Das Fidelity-Profil der Session
+    lässt sich per Query-Parameter (?profile=live) oder per Textnachricht
+    {"type": "config", "profile": "archival"} festlegen.
     """
     connection_id = str(uuid.uuid4())
     logger.info(f"Neue WebSocket-Verbindung: {connection_id}")
     
     await websocket.accept()
-    previous_text = ""
+    if not app.state.worker_pool.ready:
+        await websocket.send_json({"type": "error", "error": "Whisper-Modelle werden noch geladen"})
+        # 1013: Try Again Later
+        await websocket.close(code=1013)
+        return
+    session_profile = websocket.query_params.get("profile") or None
+    if session_profile not in (None, *available_profiles()):
+        await websocket.send_json({
+            "type": "error",
+            "error": f"Ungültiges Fidelity-Profil: {session_profile}"
+        })
+        session_profile = None
     reconnect_attempts = 0
     MAX_RECONNECT_ATTEMPTS = 3
     
     async def send_transcription_update(update: Dict[str, Any]):
         """Callback-Funktion für Transkriptions-Updates mit Fehlerbehandlung"""
+        if update.get("type") == "transcription_result":
+            app.state.language_cache.report(connection_id, update["result"]["confidence"])
         try:
             await websocket.send_json(update)
         except WebSocketDisconnect:
@@ -315,11 +649,42 @@ async def websocket_endpoint(websocket: WebSocket):
             return False
         return True
     
+    async def handle_control_message(text: str, current_profile: Optional[str]) -> Optional[str]:
+        """Verarbeitet Steuernachrichten und gibt das (neue) Profil der Session zurück"""
+        try:
+            control = json.loads(text)
+        except json.JSONDecodeError:
+            await websocket.send_json({"type": "error", "error": "Ungültige Steuernachricht"})
+            return current_profile
+        
+        if control.get("type") != "config" or "profile" not in control:
+            await websocket.send_json({"type": "error", "error": "Unbekannte Steuernachricht"})
+            return current_profile
+        
+        profile = control["profile"]
+        if profile not in available_profiles():
+            await websocket.send_json({
+                "type": "error",
+                "error": f"Ungültiges Fidelity-Profil: {profile}. Erlaubt sind: {', '.join(available_profiles())}"
+            })
+            return current_profile
+        
+        await websocket.send_json({"type": "config_updated", "profile": profile})
+        return profile
+    
     try:
         while True:
             try:
-                # Audio-Chunks empfangen
-                data = await websocket.receive_bytes()
+                # Audio-Chunks oder Steuernachrichten empfangen
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                
+                if message.get("text") is not None:
+                    session_profile = await handle_control_message(message["text"], session_profile)
+                    continue
+                
+                data = message.get("bytes") or b""
                 
                 # Validierung der Audiodaten
                 if len(data) == 0:
@@ -337,6 +702,9 @@ async def websocket_endpoint(websocket: WebSocket):
                     })
                     continue
                 
+                # Sprache einmal pro Verbindung erkennen und für alle Chunks übernehmen
+                language = await app.state.language_cache.resolve(connection_id, data)
+                
                 # Audio in Chunks aufteilen
                 chunks = app.state.audio_processor.process_audio_chunk(data)
                 total_chunks = len(chunks)
@@ -359,10 +727,12 @@ async def websocket_endpoint(websocket: WebSocket):
                         # Chunk zur Verarbeitungsqueue hinzufügen
                         task_id = await app.state.queue_manager.add_task(
                             audio_data=chunk,
-                            previous_text=previous_text,
+                            previous_text=None,  # Prompt-Kontext setzt der Queue-Manager
                             websocket_id=connection_id,
                             callback=send_transcription_update,
-                            total_chunks=total_chunks
+                            total_chunks=total_chunks,
+                            profile=session_profile,
+                            language=language
                         )
                         
                         # Status-Update senden
@@ -397,6 +767,8 @@ async def websocket_endpoint(websocket: WebSocket):
         logger.error(f"Kritischer WebSocket-Fehler: {str(e)}", exc_info=True)
     finally:
         logger.info(f"WebSocket-Verbindung geschlossen: {connection_id}")
+        app.state.language_cache.discard(connection_id)
+        app.state.prompt_context.discard(connection_id)
         await websocket.close()
 
 # Benutzerdefinierte OpenAPI-Dokumentation
@@ -437,9 +809,33 @@ app.openapi = custom_openapi
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint für Docker und Monitoring"""
+    """Liveness: der Prozess läuft und beantwortet Anfragen (unabhängig vom Modell)"""
     return {"status": "healthy", "service": "voicetodoc-backend"}
 
+@app.get("/ready")
+async def readiness_check(request: Request):
+    """
+    Readiness: 200 erst, wenn die Whisper-Modelle geladen und aufgewärmt sind,
+    sonst 503. Load-Balancer und Rolling Deploys sollten diesen Endpunkt prüfen.
+    """
+    worker_pool = request.app.state.worker_pool
+    if worker_pool.ready and request.app.state.model_loader.done():
+        state = "ready"
+    elif request.app.state.startup_error:
+        state = "failed"
+    else:
+        state = "loading"
+    
+    gauges = metrics.snapshot()["gauges"]
+    content = {
+        "status": state,
+        "processes": worker_pool.processes,
+        "cold_start_seconds": gauges.get("startup.cold_start_seconds"),
+        "model_load_seconds": gauges.get("startup.model_load_seconds"),
+        "error": request.app.state.startup_error
+    }
+    return JSONResponse(status_code=200 if state == "ready" else 503, content=content)
+
 @app.post("/templates/")
 async def create_template(
     name: str = Body(...),
@@ -631,8 +1027,12 @@ class ConfigUpdate(BaseModel):
     AUDIO_SILENCE_THRESH: int | None = None
     AUDIO_MIN_CHUNK_LENGTH: int | None = None
     AUDIO_MAX_CHUNK_LENGTH: int | None = None
+    ASR_ENGINE: str | None = None
     WHISPER_MODEL: str | None = None
     WHISPER_DEVICE_CUDA: str | None = None
+    WHISPER_QUANTIZATION: str | None = None
+    WHISPER_DRAFT_MODEL: str | None = None
+    TRANSCRIPTION_PROFILE: str | None = None
     MAX_WORKERS: int | None = None
     LOG_LEVEL: int | None = None
     ALLOWED_ORIGINS: List[str] | None = None
@@ -676,6 +1076,8 @@ async def get_config():
 async def update_config(config_update: ConfigUpdate, request: Request):
     updated_settings = {}
     valid_models = ["tiny", "base", "small", "medium", "large", "large-v3"]
+    valid_quantizations = ["none", "int8"]
+    valid_engines = EngineFactory.available_engines()
     needs_transcriber_reload = False
     
     update_dict = config_update.model_dump(exclude_unset=True)
@@ -693,6 +1095,26 @@ async def update_config(config_update: ConfigUpdate, request: Request):
                     status_code=400,
                     detail=f"Ungültiges Whisper-Modell für CUDA: {value}. Erlaubt sind: {', '.join(valid_models)}"
                 )
+            if key == "WHISPER_DRAFT_MODEL" and value and value not in valid_models:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Ungültiges Entwurfsmodell: {value}. Erlaubt sind: {', '.join(valid_models)}"
+                )
+            if key == "WHISPER_QUANTIZATION" and value not in valid_quantizations:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Ungültiger Quantisierungsmodus: {value}. Erlaubt sind: {', '.join(valid_quantizations)}"
+                )
+            if key == "TRANSCRIPTION_PROFILE" and value not in available_profiles():
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Ungültiges Fidelity-Profil: {value}. Erlaubt sind: {', '.join(available_profiles())}"
+                )
+            if key == "ASR_ENGINE" and value not in valid_engines:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Ungültige ASR-Engine: {value}. Erlaubt sind: {', '.join(valid_engines)}"
+                )
             if key == "MAX_WORKERS" and not (1 <= value <= 10):
                 raise HTTPException(
                     status_code=400,
@@ -700,7 +1122,7 @@ async def update_config(config_update: ConfigUpdate, request: Request):
                 )
             
             # Prüfe ob sich ein Whisper-Modell ändert
-            if key in ["WHISPER_MODEL", "WHISPER_DEVICE_CUDA"] and getattr(settings, key) != value:
+            if key in ["ASR_ENGINE", "WHISPER_MODEL", "WHISPER_DEVICE_CUDA", "WHISPER_QUANTIZATION", "WHISPER_DRAFT_MODEL"] and getattr(settings, key) != value:
                 needs_transcriber_reload = True
             
             setattr(settings, key, value)
@@ -711,11 +1133,11 @@ async def update_config(config_update: ConfigUpdate, request: Request):
         
         # Transcriber neu initialisieren wenn nötig
         if needs_transcriber_reload:
-            # Verwende request.app.state.transcriber statt nicht-existierender globaler Instanz
-            if hasattr(request.app.state, 'transcriber') and request.app.state.transcriber:
-                request.app.state.transcriber.reload_model()
+            # Modelle im Hintergrund neu laden, der Status ist über /model/status abrufbar
+            if hasattr(request.app.state, 'worker_pool') and request.app.state.worker_pool:
+                request.app.state.worker_pool.start_reload()
             else:
-                logger.warning("Transcriber nicht verfügbar, Neuladen übersprungen")
+                logger.warning("Worker-Pool nicht verfügbar, Neuladen übersprungen")
             
     except Exception as e:
         logger.error(f"Fehler beim Speichern der Konfiguration: {str(e)}", exc_info=True)
@@ -724,10 +1146,37 @@ async def update_config(config_update: ConfigUpdate, request: Request):
             detail=f"Fehler beim Speichern der Konfiguration: {str(e)}"
         )
     
+    reload_status = None
+    if needs_transcriber_reload and getattr(request.app.state, 'worker_pool', None):
+        reload_status = request.app.state.worker_pool.reload_status.to_dict()
+    
     return {
         "message": "Konfiguration aktualisiert",
         "updated_settings": updated_settings,
-        "transcriber_reloaded": needs_transcriber_reload
+        "transcriber_reloaded": needs_transcriber_reload,
+        "reload_status": reload_status
+    }
+
+@app.get("/model/status",
+    tags=["Konfiguration"],
+    summary="Status des Whisper-Modells und eines laufenden Neuladens"
+)
+async def get_model_status(request: Request):
+    """
+    Gibt den Status des letzten bzw. laufenden Modell-Neuladens zurück.
+    
+    Returns:
+        Dict mit Zustand (idle, loading, draining, ready, failed), Modell und Fortschritt
+    """
+    worker_pool = getattr(request.app.state, 'worker_pool', None)
+    if worker_pool is None:
+        raise HTTPException(status_code=503, detail="Worker-Pool nicht verfügbar")
+    
+    return {
+        "reloading": worker_pool.reloading,
+        "processes": worker_pool.processes,
+        "threads_per_worker": worker_pool.threads,
+        "reload": worker_pool.reload_status.to_dict()
     }
 
 class TemplateProcessingRequest(BaseModel):
@@ -0,0 +1,430 @@
+import asyncio
+import json
+import os
+import signal
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from config import settings
+from engines.fidelity import resolve_profile
+from utils.exceptions import ModelNotReadyError, TranscriptionError
+from utils.logger import get_logger, configure_logging, log_function_call
+from utils.metrics import metrics
+from utils.pcm import PCMInput
+from worker_pool import TranscriptionWorkerPool, ModelReloadStatus
+
+logger = get_logger(__name__)
+
+# Nachricht: 4 Byte Header-Länge (big-endian), JSON-Header, danach die unter
+# "payloads" angegebenen Binärdaten (PCM) ohne Umkodierung hintereinander
+_LENGTH = struct.Struct(">I")
+
+
+async def _send_message(writer: asyncio.StreamWriter, header: Dict[str, Any], payloads: Sequence[Any] = ()):
+    """Schreibt eine Nachricht (Header und Binärdaten) auf den Socket"""
+    header = dict(header, payloads=[len(payload) for payload in payloads])
+    # default=float: Konfidenzen können numpy-Skalare sein
+    data = json.dumps(header, ensure_ascii=False, default=float).encode("utf-8")
+    writer.write(_LENGTH.pack(len(data)) + data)
+    for payload in payloads:
+        writer.write(payload)
+    await writer.drain()
+
+
+async def _read_message(reader: asyncio.StreamReader) -> Tuple[Dict[str, Any], List[bytes]]:
+    """Liest eine Nachricht; IncompleteReadError, wenn die Gegenseite die Verbindung schließt"""
+    (size,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    header = json.loads(await reader.readexactly(size))
+    payloads = [await reader.readexactly(length) for length in header.get("payloads", [])]
+    return header, payloads
+
+
+def _encode_audio(audio: Union[Path, str, PCMInput]) -> Tuple[Dict[str, str], Any]:
+    """Beschreibung und Binärdaten einer Audio-Eingabe; float32-Arrays werden nicht kopiert"""
+    if isinstance(audio, (str, Path)):
+        return {"kind": "path", "path": str(audio)}, b""
+    if isinstance(audio, np.ndarray):
+        pcm = np.ascontiguousarray(audio, dtype=np.float32)
+        return {"kind": "float32"}, memoryview(pcm).cast("B")
+    return {"kind": "bytes"}, bytes(audio)
+
+
+def _decode_audio(meta: Dict[str, str], payload: bytes) -> Union[Path, PCMInput]:
+    """Gegenstück zu _encode_audio"""
+    if meta["kind"] == "path":
+        return Path(meta["path"])
+    if meta["kind"] == "float32":
+        return np.frombuffer(payload, dtype=np.float32)
+    return payload
+
+
+class ModelServer:
+    """
+    Eigenständiger Prozess, der die Whisper-Modelle besitzt (über einen
+    TranscriptionWorkerPool mit TRANSCRIPTION_PROCESSES Workern).
+
+    Mehrere API-Worker (uvicorn --workers N) reichen ihre Aufträge über
+    einen Unix-Socket ein (siehe ModelServerClient), statt jeweils ein
+    eigenes Modell zu laden. Start: python model_server.py
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[Union[str, Path]] = None,
+        worker_pool: Optional[TranscriptionWorkerPool] = None
+    ):
+        self.socket_path = Path(socket_path or settings.MODEL_SERVER_SOCKET)
+        self.worker_pool = worker_pool or TranscriptionWorkerPool()
+        self.startup_error: Optional[str] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._load_task: Optional[asyncio.Task] = None
+
+    @log_function_call
+    async def start(self):
+        """Öffnet den Socket sofort und lädt die Modelle im Hintergrund"""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=str(self.socket_path))
+        # Nur Prozesse desselben Benutzers bzw. derselben Gruppe dürfen Aufträge einreichen
+        os.chmod(self.socket_path, 0o660)
+        self._load_task = asyncio.create_task(self._load_models())
+        logger.info(f"Modell-Server lauscht auf {self.socket_path}")
+
+    async def _load_models(self):
+        try:
+            await self.worker_pool.start()
+        except Exception as e:
+            logger.error(f"Whisper-Modelle konnten nicht geladen werden: {str(e)}", exc_info=True)
+            self.startup_error = str(e)
+
+    @log_function_call
+    async def stop(self):
+        """Schließt den Socket und gibt die Modelle frei"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._load_task is not None and not self._load_task.done():
+            self._load_task.cancel()
+            await asyncio.gather(self._load_task, return_exceptions=True)
+        await self.worker_pool.stop()
+        self.socket_path.unlink(missing_ok=True)
+
+    def status(self) -> Dict[str, Any]:
+        """Zustand des Pools; wird jeder Antwort beigelegt"""
+        pool = self.worker_pool
+        return {
+            "ready": pool.ready,
+            "startup_error": self.startup_error,
+            "size": pool.size,
+            "processes": pool.processes,
+            "threads": pool.threads,
+            "reloading": pool.reloading,
+            "reload_status": pool.reload_status.to_dict()
+        }
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Bearbeitet die Aufträge einer Verbindung nacheinander"""
+        try:
+            while True:
+                try:
+                    header, payloads = await _read_message(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                response = await self._dispatch(header, payloads)
+                await _send_message(writer, response)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, header: Dict[str, Any], payloads: List[bytes]) -> Dict[str, Any]:
+        """Führt einen Auftrag auf dem Worker-Pool aus"""
+        op = header.get("op")
+        pool = self.worker_pool
+        try:
+            result = None
+            if op == "transcribe":
+                audio = _decode_audio(header["audio"], payloads[0])
+                result = await pool.transcribe(
+                    audio, header.get("previous_text"), header.get("post_process", True), header.get("profile"),
+                    header.get("language"), header.get("model_size"), header.get("with_segments", False)
+                )
+            elif op == "transcribe_draft":
+                audio = _decode_audio(header["audio"], payloads[0])
+                result = await pool.transcribe_draft(audio, header.get("previous_text"), header.get("language"))
+            elif op == "transcribe_batch":
+                chunks = [_decode_audio(meta, payload) for meta, payload in zip(header["audio"], payloads)]
+                result = await pool.transcribe_batch(
+                    chunks, header.get("previous_texts"), header.get("post_process", True), header.get("profile"),
+                    header.get("language"), header.get("model_size"), header.get("with_segments", False)
+                )
+            elif op == "detect_language":
+                audio = _decode_audio(header["audio"], payloads[0])
+                result = await pool.detect_language(audio)
+            elif op == "reload":
+                # Die API hat die neue Konfiguration bereits gespeichert
+                settings.load_from_file()
+                pool.start_reload()
+            elif op != "status":
+                raise ValueError(f"Unbekannte Operation: {op}")
+            response = {"ok": True, "result": result}
+        except Exception as e:
+            logger.error(f"Fehler bei Auftrag {op}: {str(e)}")
+            response = {"ok": False, "error": str(e), "error_type": type(e).__name__}
+        response.update(self.status())
+        return response
+
+
+class ModelServerClient:
+    """
+    Ersatz für TranscriptionWorkerPool in API-Workern, wenn MODEL_SERVER_ENABLED
+    gesetzt ist: gleiche Schnittstelle, die Aufträge laufen auf dem ModelServer.
+
+    Bis zu MODEL_SERVER_CONNECTIONS Verbindungen werden offen gehalten und
+    wiederverwendet; jede trägt höchstens einen Auftrag gleichzeitig.
+    """
+
+    def __init__(self, socket_path: Optional[Union[str, Path]] = None, connections: Optional[int] = None):
+        self.socket_path = Path(socket_path or settings.MODEL_SERVER_SOCKET)
+        self.connections = max(1, connections or settings.MODEL_SERVER_CONNECTIONS)
+        self.reload_status = ModelReloadStatus()
+        self._status: Dict[str, Any] = {}
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(self.connections)
+        self._started = False
+        self._start_task: Optional[asyncio.Task] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._reload_task: Optional[asyncio.Task] = None
+
+    @property
+    def size(self) -> int:
+        """Anzahl gleichzeitig möglicher Aufträge (offene Verbindungen)"""
+        return self.connections
+
+    @property
+    def in_process(self) -> bool:
+        return False
+
+    @property
+    def processes(self) -> Optional[int]:
+        return self._status.get("processes")
+
+    @property
+    def threads(self) -> Optional[int]:
+        return self._status.get("threads")
+
+    @property
+    def ready(self) -> bool:
+        """True, solange der Modell-Server erreichbar ist und seine Modelle geladen hat"""
+        return self._started and bool(self._status.get("ready"))
+
+    @property
+    def reloading(self) -> bool:
+        pending = self._reload_task is not None and not self._reload_task.done()
+        return pending or bool(self._status.get("reloading"))
+
+    @log_function_call
+    async def start(self):
+        """
+        Wartet, bis der Modell-Server erreichbar ist und seine Modelle geladen hat.
+        Gleichzeitige Aufrufe warten auf denselben Start.
+        """
+        if self._start_task is None:
+            self._start_task = asyncio.create_task(self._start())
+        await asyncio.shield(self._start_task)
+
+    async def _start(self):
+        delay = 0.5
+        while True:
+            try:
+                await self._request({"op": "status"})
+            except ModelNotReadyError as e:
+                logger.info(f"Modell-Server unter {self.socket_path} noch nicht erreichbar: {str(e)}")
+            else:
+                if self._status.get("ready"):
+                    break
+                if self._status.get("startup_error"):
+                    raise RuntimeError(f"Modell-Server konnte nicht starten: {self._status['startup_error']}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+        self._started = True
+        self._monitor_task = asyncio.create_task(self._monitor())
+        logger.info(
+            f"Verbunden mit Modell-Server {self.socket_path} "
+            f"({self.processes} Worker-Prozesse, {self.connections} Verbindungen)"
+        )
+
+    async def _monitor(self):
+        """Fragt den Zustand regelmäßig ab, damit /ready und /model/status aktuell bleiben"""
+        while True:
+            await asyncio.sleep(settings.MODEL_SERVER_POLL_S)
+            try:
+                await self._request({"op": "status"})
+            except ModelNotReadyError:
+                pass
+
+    @log_function_call
+    async def stop(self):
+        """Schließt alle Verbindungen; der Modell-Server läuft weiter"""
+        for task in (self._start_task, self._monitor_task, self._reload_task):
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._start_task = None
+        self._monitor_task = None
+        self._started = False
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    def start_reload(self) -> ModelReloadStatus:
+        """Löst das Neuladen auf dem Modell-Server aus und kehrt sofort zurück"""
+        self.reload_status = ModelReloadStatus(state="loading", started_at=time.time())
+        self._reload_task = asyncio.create_task(self._request({"op": "reload"}))
+        return self.reload_status
+
+    async def _request(self, header: Dict[str, Any], payloads: Sequence[Any] = ()) -> Any:
+        """
+        Sendet einen Auftrag über eine freie Verbindung und wartet auf die Antwort.
+        Ist der Server nicht erreichbar, wird ModelNotReadyError (HTTP 503) geworfen.
+        """
+        async with self._slots:
+            try:
+                if self._idle:
+                    reader, writer = self._idle.pop()
+                else:
+                    reader, writer = await asyncio.open_unix_connection(str(self.socket_path))
+            except OSError as e:
+                self._status["ready"] = False
+                raise ModelNotReadyError(f"Modell-Server nicht erreichbar: {str(e)}", settings.UPLOAD_RETRY_AFTER_S)
+
+            try:
+                await _send_message(writer, header, payloads)
+                response, _ = await _read_message(reader)
+            except (OSError, asyncio.IncompleteReadError) as e:
+                writer.close()
+                self._status["ready"] = False
+                raise ModelNotReadyError(f"Verbindung zum Modell-Server verloren: {str(e)}", settings.UPLOAD_RETRY_AFTER_S)
+            except BaseException:
+                # Abgebrochene Aufträge hinterlassen eine Verbindung in undefiniertem Zustand
+                writer.close()
+                raise
+            self._idle.append((reader, writer))
+
+        self._status = {key: value for key, value in response.items() if key not in ("ok", "result")}
+        if response.get("reload_status"):
+            self.reload_status = ModelReloadStatus(**response["reload_status"])
+        if not response["ok"]:
+            if response.get("error_type") == "ValueError":
+                raise ValueError(response["error"])
+            raise TranscriptionError(response["error"])
+        return response["result"]
+
+    async def _timed_request(self, metric: str, header: Dict[str, Any], payloads: Sequence[Any]) -> Any:
+        """Wie _request, erfasst zusätzlich die Latenz inklusive IPC"""
+        if not self._started:
+            raise RuntimeError("Modell-Server-Client wurde nicht gestartet")
+        start = time.perf_counter()
+        result = await self._request(header, payloads)
+        metrics.observe(f"transcription.latency.{metric}", time.perf_counter() - start)
+        return result
+
+    async def transcribe(
+        self,
+        audio: Union[Path, PCMInput],
+        previous_text: Optional[str] = None,
+        post_process: bool = True,
+        profile: Optional[str] = None,
+        language: Optional[str] = None,
+        model_size: Optional[str] = None,
+        with_segments: bool = False
+    ) -> tuple:
+        """Siehe TranscriptionWorkerPool.transcribe"""
+        profile = resolve_profile(profile)
+        meta, payload = _encode_audio(audio)
+        result = await self._timed_request(profile, {
+            "op": "transcribe",
+            "audio": meta,
+            "previous_text": previous_text,
+            "post_process": post_process,
+            "profile": profile,
+            "language": language,
+            "model_size": model_size,
+            "with_segments": with_segments
+        }, [payload])
+        return tuple(result)
+
+    async def transcribe_draft(
+        self,
+        audio: PCMInput,
+        previous_text: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> Tuple[str, float]:
+        """Siehe TranscriptionWorkerPool.transcribe_draft"""
+        meta, payload = _encode_audio(audio)
+        text, confidence = await self._timed_request("draft", {
+            "op": "transcribe_draft",
+            "audio": meta,
+            "previous_text": previous_text,
+            "language": language
+        }, [payload])
+        return text, confidence
+
+    async def detect_language(self, audio: PCMInput) -> Tuple[str, float]:
+        """Siehe TranscriptionWorkerPool.detect_language"""
+        meta, payload = _encode_audio(audio)
+        language, probability = await self._timed_request("language", {
+            "op": "detect_language",
+            "audio": meta
+        }, [payload])
+        return language, probability
+
+    async def transcribe_batch(
+        self,
+        audio_chunks: List[PCMInput],
+        previous_texts: Optional[List[Optional[str]]] = None,
+        post_process: bool = True,
+        profile: Optional[str] = None,
+        language: Optional[str] = None,
+        model_size: Optional[str] = None,
+        with_segments: bool = False
+    ) -> List[tuple]:
+        """Siehe TranscriptionWorkerPool.transcribe_batch"""
+        profile = resolve_profile(profile)
+        encoded = [_encode_audio(chunk) for chunk in audio_chunks]
+        results = await self._timed_request(f"{profile}.batch", {
+            "op": "transcribe_batch",
+            "audio": [meta for meta, _ in encoded],
+            "previous_texts": previous_texts,
+            "post_process": post_process,
+            "profile": profile,
+            "language": language,
+            "model_size": model_size,
+            "with_segments": with_segments
+        }, [payload for _, payload in encoded])
+        return [tuple(result) for result in results]
+
+
+async def serve():
+    """Startet den Modell-Server und läuft bis SIGINT/SIGTERM"""
+    server = ModelServer()
+    await server.start()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        await stop.wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    configure_logging(level=settings.log_level)
+    asyncio.run(serve())
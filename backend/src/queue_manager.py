@@ -1,17 +1,24 @@
 import asyncio
-from typing import Optional, Dict, Any, Callable, Awaitable, List, Tuple, NamedTuple
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable, Awaitable, List, Tuple, NamedTuple
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 import uuid
-import tempfile
-from pathlib import Path
-from transcriber import Transcriber
+from worker_pool import TranscriptionWorkerPool
+from services.formatting_service import FormattingService
+from services.model_ladder import ModelLadder
+from engines.fidelity import supports_batching
+from services.prompt_context import SessionPromptContext
 import time
 from utils.logger import get_logger, log_function_call
+from config import settings
+from utils.pcm import PCMInput, pcm_duration
 from fastapi.responses import JSONResponse
 import math
 
+if TYPE_CHECKING:
+    from transcriber import Transcriber
+
 logger = get_logger(__name__)
 
 class TranscriptionProgress(NamedTuple):
@@ -25,7 +32,7 @@ class TranscriptionProgress(NamedTuple):
 class TranscriptionTask:
     """Repräsentiert eine Transkriptionsaufgabe in der Queue"""
     id: str
-    audio_data: bytes
+    audio_data: PCMInput
     previous_text: str
     created_at: datetime
     websocket_id: str
@@ -35,6 +42,12 @@ class TranscriptionTask:
     progress: Optional[TranscriptionProgress] = None
     start_time: Optional[float] = None
     chunk_times: List[float] = field(default_factory=list)
+    total_chunks: int = 1
+    profile: Optional[str] = None  # Fidelity-Profil, None = Standard
+    language: Optional[str] = None  # Sprache der Session, None = WHISPER_LANGUAGE
+    model_size: Optional[str] = None  # Stufe der Lastleiter, None = Hauptmodell
+    audio_seconds: float = 0.0
+    sequence: Optional[int] = None  # Chunk-Nummer der Session für den Prompt-Kontext
 
 class TranscriptionQueueManager:
     """Verwaltet die asynchrone Verarbeitung von Transkriptionsaufgaben"""
@@ -42,20 +55,47 @@ class TranscriptionQueueManager:
     def __init__(
         self, 
         max_queue_size: int = 100,
-        max_workers: int = 2,
-        transcriber: Optional[Transcriber] = None
+        max_workers: Optional[int] = None,
+        transcriber: Optional["Transcriber"] = None,
+        worker_pool: Optional[TranscriptionWorkerPool] = None,
+        batch_size: Optional[int] = None,
+        batch_window_ms: Optional[int] = None,
+        formatter: Optional[FormattingService] = None,
+        model_ladder: Optional[ModelLadder] = None,
+        prompt_context: Optional[SessionPromptContext] = None
     ):
+        if worker_pool is None:
+            if transcriber is None:
+                raise ValueError("Transcriber or worker pool instance must be provided")
+            worker_pool = TranscriptionWorkerPool(processes=0, transcriber=transcriber)
+            self._owns_pool = True
+        else:
+            self._owns_pool = False
+        
+        self.worker_pool = worker_pool
+        self.transcriber = transcriber
+        # Mit Formatter wird der Rohtext sofort gesendet und asynchron formatiert
+        self.formatter = formatter
+        # Mit Prompt-Kontext wird der Prompt erst beim Start eines Tasks gelesen
+        # und der Text in Chunk-Reihenfolge bestätigt
+        self.prompt_context = prompt_context
+        
         self.queue = asyncio.Queue(maxsize=max_queue_size)
-        self.max_workers = max_workers
+        # Standardmäßig ein Queue-Worker pro freiem Pool-Slot
+        self.max_workers = max_workers or worker_pool.size
         self.active_tasks: Dict[str, TranscriptionTask] = {}
         self.workers: List[asyncio.Task] = []
+        self._pool_start: Optional[asyncio.Task] = None
         self.callbacks: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {}
         
-        if transcriber is None:
-            raise ValueError("Transcriber instance must be provided")
+        # Micro-Batching wartender Chunks
+        self.batch_size = max(1, batch_size or settings.TRANSCRIPTION_BATCH_SIZE)
+        self.batch_window = (
+            settings.TRANSCRIPTION_BATCH_WINDOW_MS if batch_window_ms is None else batch_window_ms
+        ) / 1000.0
         
-        self.transcriber = transcriber
-        self.transcriber_lock = asyncio.Semaphore(1)
+        # Echtzeitfaktor je Modell und lastabhängige Modellwahl (MODEL_LADDER)
+        self.model_ladder = model_ladder or ModelLadder()
         
         # Worker-ID-Counter
         self._worker_id = 0
@@ -68,7 +108,11 @@ class TranscriptionQueueManager:
         
     @log_function_call
     async def start(self):
-        """Startet die Worker-Tasks"""
+        """
+        Startet die Worker-Tasks. Der Worker-Pool startet im Hintergrund,
+        die Worker beginnen, sobald seine Modelle geladen sind.
+        """
+        self._pool_start = asyncio.create_task(self.worker_pool.start())
         for worker_id in range(self.max_workers):
             worker = asyncio.create_task(
                 self._process_queue(worker_id)
@@ -83,6 +127,11 @@ class TranscriptionQueueManager:
             worker.cancel()
         await asyncio.gather(*self.workers, return_exceptions=True)
         self.workers.clear()
+        if self._pool_start is not None and not self._pool_start.done():
+            self._pool_start.cancel()
+            await asyncio.gather(self._pool_start, return_exceptions=True)
+        if self._owns_pool:
+            await self.worker_pool.stop()
         logger.info("Transkriptions-Worker gestoppt")
 
     def _calculate_progress(self, task: TranscriptionTask) -> TranscriptionProgress:
@@ -108,33 +157,46 @@ class TranscriptionQueueManager:
     @log_function_call()
     async def add_task(
         self, 
-        audio_data: bytes, 
+        audio_data: PCMInput, 
         previous_text: str,
         websocket_id: str,
         callback: Callable[[Dict[str, Any]], Awaitable[None]],
-        total_chunks: int = 1  # Neue Parameter für Fortschrittsanzeige
+        total_chunks: int = 1,  # Neue Parameter für Fortschrittsanzeige
+        profile: Optional[str] = None,
+        language: Optional[str] = None
     ) -> str:
         """
         Fügt eine neue Transkriptionsaufgabe zur Queue hinzu
         
         Args:
-            audio_data: Audio-Bytes im WAV-Format
-            previous_text: Vorheriger Transkriptionstext
+            audio_data: Audio-Bytes (WAV oder s16le) oder float32-PCM
+            previous_text: Vorheriger Transkriptionstext (mit prompt_context
+                beim Start des Tasks durch den Session-Kontext ersetzt)
             websocket_id: ID der WebSocket-Verbindung
             callback: Async Callback-Funktion für Ergebnisse
+            profile: Fidelity-Profil der Session (live, balanced, archival)
+            language: Sprache der Session (siehe SessionLanguageCache)
             
         Returns:
             Task-ID
         """
         task_id = str(uuid.uuid4())
+        # Bei Überlast laufen neue Chunks auf einem kleineren Modell
+        model_size = self.model_ladder.select(self.queue.qsize(), self._oldest_wait())
         task = TranscriptionTask(
             id=task_id,
             audio_data=audio_data,
             previous_text=previous_text,
             created_at=datetime.now(),
             websocket_id=websocket_id,
-            total_chunks=total_chunks  # Gesamtanzahl der erwarteten Chunks
+            total_chunks=total_chunks,  # Gesamtanzahl der erwarteten Chunks
+            profile=profile,
+            language=language,
+            model_size=model_size,
+            audio_seconds=self._audio_seconds(audio_data)
         )
+        if self.prompt_context:
+            task.sequence = self.prompt_context.reserve(websocket_id)
         
         self.active_tasks[task_id] = task
         self.callbacks[task_id] = callback
@@ -156,135 +218,277 @@ class TranscriptionQueueManager:
         
         return task_id
 
+    def _oldest_wait(self) -> float:
+        """Wartezeit des ältesten noch nicht verarbeiteten Tasks in Sekunden"""
+        now = datetime.now()
+        waits = [
+            (now - task.created_at).total_seconds()
+            for task in self.active_tasks.values() if task.status == "pending"
+        ]
+        return max(waits, default=0.0)
+
+    @staticmethod
+    def _audio_seconds(audio_data: PCMInput) -> float:
+        """
+        Audiodauer eines Chunks für den Echtzeitfaktor (0 bei ungültigen Daten).
+        Läuft auf dem Event-Loop, daher nur aus Header bzw. Sampleanzahl.
+        """
+        try:
+            return pcm_duration(audio_data)
+        except Exception:
+            return 0.0
+
     @log_function_call()
     async def _transcribe_audio(
         self,
         worker_id: int,
-        audio_data: bytes,
-        previous_text: str
-    ) -> Tuple[str, float]:
+        audio_data: PCMInput,
+        previous_text: str,
+        profile: Optional[str] = None,
+        language: Optional[str] = None,
+        model_size: Optional[str] = None
+    ) -> tuple:
         """
-        Führt die Transkription mit dem gemeinsam genutzten Transcriber durch
+        Führt die Transkription auf dem nächsten freien Worker des Pools durch.
+        Mit FormattingService werden die Segmente für die Formatierung mitgeliefert.
         """
-        async with self.transcriber_lock:
-            # Temporäre Datei für Audio erstellen
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_path = Path(temp_file.name)
-                try:
-                    # Audio-Daten in temporäre Datei schreiben
-                    temp_file.write(audio_data)
-                    temp_file.flush()
-                    
-                    # Transkription durchführen
-                    text, confidence = self.transcriber.transcribe_audio(
-                        temp_path,
-                        previous_text
+        # Audio-Bytes werden im Worker dekodiert und direkt an Whisper übergeben
+        return await self.worker_pool.transcribe(
+            audio_data, previous_text, post_process=self.formatter is None, profile=profile,
+            language=language, model_size=model_size, with_segments=self.formatter is not None
+        )
+
+    async def _collect_batch(self) -> List[str]:
+        """
+        Wartet auf den nächsten Task und sammelt innerhalb des Batch-Fensters
+        bis zu batch_size weitere wartende Tasks ein. Tasks mit einem Profil
+        ohne Batch-Unterstützung werden nicht gesammelt.
+        """
+        task_ids = [await self.queue.get()]
+        task = self.active_tasks.get(task_ids[0])
+        if task is not None and not self._batches(task.profile):
+            return task_ids
+        deadline = time.monotonic() + self.batch_window
+        
+        while len(task_ids) < self.batch_size:
+            try:
+                task_ids.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                task_ids.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        return task_ids
+
+    def _batches(self, profile: Optional[str]) -> bool:
+        """True, wenn Chunks mit diesem Profil gemeinsam dekodiert werden"""
+        return self.batch_size > 1 and supports_batching(profile)
+
+    async def _transcribe_batch(
+        self,
+        worker_id: int,
+        tasks: List[TranscriptionTask]
+    ) -> List[tuple]:
+        """
+        Transkribiert die gesammelten Tasks. Einzelne Tasks und Profile mit
+        Fallback-Leiter, Beam-Search oder Wortzeitstempeln (siehe
+        supports_batching) laufen über die normale Transkription, mehrere
+        als ein gemeinsamer Whisper-Batch je Fidelity-Profil, Sprache und
+        Modell. Der Echtzeitfaktor wird je Modell erfasst.
+        """
+        groups: Dict[Tuple[Optional[str], Optional[str], Optional[str]], List[int]] = {}
+        for index, task in enumerate(tasks):
+            groups.setdefault((task.profile, task.language, task.model_size), []).append(index)
+        
+        results: List[Optional[tuple]] = [None] * len(tasks)
+        for (profile, language, model_size), indices in groups.items():
+            start = time.perf_counter()
+            if len(indices) == 1 or not supports_batching(profile):
+                group_results = [
+                    await self._transcribe_audio(
+                        worker_id, tasks[i].audio_data, tasks[i].previous_text, profile, language, model_size
                     )
-                    
-                    return text, confidence
-                    
-                finally:
-                    # Temporäre Datei aufräumen
-                    temp_path.unlink()
+                    for i in indices
+                ]
+            else:
+                logger.debug(f"Worker {worker_id}: Batch mit {len(indices)} Chunks")
+                group_results = await self.worker_pool.transcribe_batch(
+                    [tasks[i].audio_data for i in indices],
+                    [tasks[i].previous_text for i in indices],
+                    post_process=self.formatter is None,
+                    profile=profile,
+                    language=language,
+                    model_size=model_size,
+                    with_segments=self.formatter is not None
+                )
+            self.model_ladder.record(
+                model_size,
+                time.perf_counter() - start,
+                sum(tasks[i].audio_seconds for i in indices)
+            )
+            for index, result in zip(indices, group_results):
+                results[index] = result
+        
+        return results
 
     async def _process_queue(self, worker_id: int):
         """Worker-Prozess für die Verarbeitung von Queue-Einträgen"""
         logger.info(f"Worker {worker_id} gestartet")
         
+        try:
+            await asyncio.shield(self._pool_start)
+        except asyncio.CancelledError:
+            logger.info(f"Worker {worker_id} wird beendet")
+            return
+        except Exception as e:
+            logger.error(f"Worker {worker_id} beendet, Worker-Pool nicht verfügbar: {str(e)}")
+            return
+        
         while True:
             try:
-                task_id = await self.queue.get()
-                task = self.active_tasks.get(task_id)
+                task_ids = await self._collect_batch()
+            except asyncio.CancelledError:
+                logger.info(f"Worker {worker_id} wird beendet")
+                break
+            
+            try:
+                tasks = []
+                for task_id in task_ids:
+                    task = self.active_tasks.get(task_id)
+                    if not task:
+                        continue
+                    
+                    task.status = "processing"
+                    task.start_time = time.time()
+                    # Whisper dekodiert je Prompt einen eigenen Batch; gebatchte
+                    # Chunks laufen daher ohne Prompt-Kontext
+                    if self.prompt_context and not self._batches(task.profile):
+                        task.previous_text = self.prompt_context.get(task.websocket_id)
+                    tasks.append(task)
+                    
+                    # Status-Update senden
+                    await self._notify(task.id, {
+                        "type": "status_update",
+                        "task_id": task.id,
+                        "status": "processing"
+                    })
                 
-                if not task:
-                    self.queue.task_done()
+                if not tasks:
                     continue
                 
-                task.status = "processing"
-                task.start_time = time.time()
-                callback = self.callbacks.get(task_id)
-                
+                # Transkription durchführen
+                chunk_start_time = time.time()
                 try:
-                    # Status-Update senden
-                    if callback:
-                        await callback({
-                            "type": "status_update",
-                            "task_id": task_id,
-                            "status": "processing"
-                        })
-                    
-                    # Transkription durchführen
-                    chunk_start_time = time.time()
-                    text, confidence = await self._transcribe_audio(
-                        worker_id,
-                        task.audio_data,
-                        task.previous_text
-                    )
-                    
-                    # Chunk-Zeit speichern
-                    chunk_time = time.time() - chunk_start_time
-                    task.chunk_times.append(chunk_time)
-                    
-                    # Fortschritt berechnen und Update senden
-                    progress = self._calculate_progress(task)
-                    if callback:
-                        await callback({
-                            "type": "progress_update",
-                            "task_id": task_id,
-                            "status": "processing",
-                            "progress": progress._asdict()
-                        })
-                    
-                    # Ergebnis speichern
-                    def sanitize_confidence(conf):
-                        if isinstance(conf, float):
-                            if math.isnan(conf) or math.isinf(conf):
-                                return 0.0
-                        return conf
-
-                    task.result = {
-                        "text": text,
-                        "confidence": sanitize_confidence(confidence),
-                        "processing_time": time.time() - task.start_time
-                    }
-                    task.status = "completed"
-                    
-                    # Abschluss-Update senden
-                    if callback:
-                        await callback({
-                            "type": "transcription_result",
-                            "task_id": task_id,
-                            "status": "completed",
-                            "result": task.result,
-                            "progress": progress._asdict()
-                        })
-                    
+                    results = await self._transcribe_batch(worker_id, tasks)
                 except Exception as e:
-                    logger.error(f"Fehler bei der Verarbeitung von Task {task_id}: {str(e)}")
-                    task.status = "failed"
-                    task.error = str(e)
-                    
-                    if callback:
-                        await callback({
-                            "type": "error",
-                            "task_id": task_id,
-                            "status": "failed",
-                            "error": str(e)
-                        })
+                    for task in tasks:
+                        await self._fail_task(task, e)
+                    continue
                 
-                finally:
-                    # Aufräumen
-                    self.queue.task_done()
-                    if task_id in self.active_tasks:
-                        del self.active_tasks[task_id]
-                    if task_id in self.callbacks:
-                        del self.callbacks[task_id]
+                # Bei Batches teilen sich alle Tasks die gemessene Zeit
+                chunk_time = time.time() - chunk_start_time
+                for task, (text, confidence, *segments) in zip(tasks, results):
+                    await self._complete_task(task, text, confidence, chunk_time, *segments)
                     
             except asyncio.CancelledError:
                 logger.info(f"Worker {worker_id} wird beendet")
                 break
             except Exception as e:
-                logger.error(f"Unerwarteter Fehler in Worker {worker_id}: {str(e)}") 
+                logger.error(f"Unerwarteter Fehler in Worker {worker_id}: {str(e)}")
+            finally:
+                # Aufräumen
+                for task_id in task_ids:
+                    self.queue.task_done()
+                    self.active_tasks.pop(task_id, None)
+                    self.callbacks.pop(task_id, None)
+
+    async def _notify(self, task_id: str, update: Dict[str, Any]):
+        """Sendet ein Update an den Callback eines Tasks (falls vorhanden)"""
+        callback = self.callbacks.get(task_id)
+        if callback:
+            try:
+                await callback(update)
+            except Exception as e:
+                logger.error(f"Fehler beim Senden des Updates für Task {task_id}: {str(e)}")
+
+    async def _complete_task(
+        self,
+        task: TranscriptionTask,
+        text: str,
+        confidence: float,
+        chunk_time: float,
+        segments: Optional[List[Dict[str, Any]]] = None
+    ):
+        """Speichert das Ergebnis eines Tasks und sendet die Abschluss-Updates"""
+        # Chunk-Zeit speichern
+        task.chunk_times.append(chunk_time)
+        
+        # Fortschritt berechnen und Update senden
+        progress = self._calculate_progress(task)
+        await self._notify(task.id, {
+            "type": "progress_update",
+            "task_id": task.id,
+            "status": "processing",
+            "progress": progress._asdict()
+        })
+        
+        # Ergebnis speichern
+        def sanitize_confidence(conf):
+            if isinstance(conf, float):
+                if math.isnan(conf) or math.isinf(conf):
+                    return 0.0
+            return conf
+
+        task.result = {
+            "text": text,
+            "confidence": sanitize_confidence(confidence),
+            "processing_time": time.time() - task.start_time
+        }
+        if self.formatter:
+            # Formatierung folgt als separates formatting_result-Update
+            task.result["formatting_id"] = self.formatter.submit(
+                text,
+                session_id=task.websocket_id,
+                callback=self.callbacks.get(task.id),
+                task_id=task.id,
+                segments=segments
+            )
+            task.result["formatting_status"] = "pending"
+        task.status = "completed"
+        if self.prompt_context:
+            self.prompt_context.confirm(task.websocket_id, text, task.sequence)
+        
+        # Abschluss-Update senden
+        await self._notify(task.id, {
+            "type": "transcription_result",
+            "task_id": task.id,
+            "status": "completed",
+            "result": task.result,
+            "progress": progress._asdict()
+        })
+
+    async def _fail_task(self, task: TranscriptionTask, error: Exception):
+        """Markiert einen Task als fehlgeschlagen und informiert den Client"""
+        logger.error(f"Fehler bei der Verarbeitung von Task {task.id}: {str(error)}")
+        task.status = "failed"
+        task.error = str(error)
+        if self.prompt_context:
+            # Reihenfolge weiterführen, damit spätere Chunks bestätigt werden
+            self.prompt_context.confirm(task.websocket_id, "", task.sequence)
+        
+        await self._notify(task.id, {
+            "type": "error",
+            "task_id": task.id,
+            "status": "failed",
+            "error": str(error)
+        })
 
 class AudioUploadResponse(JSONResponse):
     def render(self, content: dict) -> bytes:
@@ -0,0 +1,308 @@
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Callable, Awaitable, List
+
+from openai import AsyncOpenAI
+from config import settings
+from services import local_formatter
+from utils.logger import get_logger, log_function_call
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+FORMATTING_MODES = ("local", "llm")
+
+FORMATTING_PROMPT = """
+    Formatiere den Text für bessere Lesbarkeit:
+    1. Teile den Text in logische Absätze
+    2. Füge Satzzeichen korrekt ein
+    3. Markiere Sprecherwechsel wenn erkennbar
+    4. Behalte den ursprünglichen Inhalt bei
+
+    Wichtig:
+    - Keine inhaltlichen Änderungen
+    - Keine Interpretationen
+    - Nur einfache Formatierung mit <p> Tags
+"""
+
+
+@dataclass
+class FormattingJob:
+    """Repräsentiert eine ausstehende Formatierung einer Rohtranskription"""
+    id: str
+    raw_text: str
+    session_id: Optional[str] = None
+    task_id: Optional[str] = None
+    callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    segments: Optional[List[Dict[str, Any]]] = None  # Whisper-Segmente (start, end, text)
+    created_at: float = field(default_factory=time.time)
+    status: str = "pending"  # pending, processing, completed, failed
+    text: Optional[str] = None
+    batch: List[str] = field(default_factory=list)  # IDs aller gemeinsam formatierten Jobs
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "formatting_id": self.id,
+            "status": self.status,
+            "raw_text": self.raw_text,
+            "text": self.text,
+            "batch": self.batch,
+            "error": self.error
+        }
+
+
+class FormattingService:
+    """
+    Formatiert Rohtranskriptionen asynchron, getrennt vom Transkriptionspfad.
+    Der Whisper-Text wird sofort ausgeliefert, die formatierte Fassung folgt
+    als eigenes Update (Callback oder Abfrage).
+
+    FORMATTING_MODE wählt zwischen der regelbasierten lokalen Formatierung
+    (Standard, ohne Netzwerk) und dem LLM als optionalem Qualitätsmodus.
+    Aufeinanderfolgende Slices derselben Session können gemeinsam
+    formatiert werden (batch_size > 1).
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        max_workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_window_ms: Optional[int] = None,
+        result_ttl: Optional[int] = None,
+        mode: Optional[str] = None
+    ):
+        self.mode = mode or settings.FORMATTING_MODE
+        if self.mode not in FORMATTING_MODES:
+            raise ValueError(f"Unbekannter Formatierungsmodus: {self.mode}")
+        # Der lokale Modus benötigt keinen LLM-Zugang
+        self.client = client or (AsyncOpenAI(api_key=settings.LLM_API_KEY) if self.mode == "llm" else None)
+        self.max_workers = max(1, max_workers or settings.FORMATTING_WORKERS)
+        self.batch_size = max(1, batch_size or settings.FORMATTING_BATCH_SIZE)
+        self.batch_window = (
+            settings.FORMATTING_BATCH_WINDOW_MS if batch_window_ms is None else batch_window_ms
+        ) / 1000.0
+        self.result_ttl = settings.FORMATTING_RESULT_TTL if result_ttl is None else result_ttl
+
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.jobs: Dict[str, FormattingJob] = {}
+        self.workers: List[asyncio.Task] = []
+
+    @log_function_call
+    async def start(self):
+        """Startet die Formatierungs-Worker"""
+        for worker_id in range(self.max_workers):
+            self.workers.append(asyncio.create_task(self._process_queue(worker_id)))
+        logger.info(f"{self.max_workers} Formatierungs-Worker gestartet")
+
+    @log_function_call
+    async def stop(self):
+        """Stoppt alle Formatierungs-Worker"""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers.clear()
+        logger.info("Formatierungs-Worker gestoppt")
+
+    def submit(
+        self,
+        raw_text: str,
+        session_id: Optional[str] = None,
+        callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        task_id: Optional[str] = None,
+        segments: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        """
+        Reiht eine Rohtranskription zur Formatierung ein und kehrt sofort zurück.
+
+        Args:
+            raw_text: Whisper-Text
+            session_id: Slices derselben Session dürfen gemeinsam formatiert werden
+            callback: Async Callback für das formatting_result-Update
+            task_id: ID des zugehörigen Transkriptions-Tasks
+            segments: Whisper-Segmente; die lokale Formatierung setzt damit
+                Absätze an Sprechpausen (FORMATTING_PARAGRAPH_PAUSE_S)
+
+        Returns:
+            Formatierungs-ID
+        """
+        self._purge_expired()
+
+        job = FormattingJob(
+            id=str(uuid.uuid4()),
+            raw_text=raw_text,
+            session_id=session_id,
+            task_id=task_id,
+            callback=callback,
+            segments=segments
+        )
+        self.jobs[job.id] = job
+        self.queue.put_nowait(job.id)
+        return job.id
+
+    def get_job(self, job_id: str) -> Optional[FormattingJob]:
+        """Gibt einen Formatierungs-Job zurück (None, falls unbekannt oder abgelaufen)"""
+        return self.jobs.get(job_id)
+
+    def _purge_expired(self):
+        """Entfernt abgeschlossene Jobs, deren Ergebnis älter als result_ttl ist"""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.result_ttl
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    async def format_text(self, raw_text: str, segments: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Formatiert eine Rohtranskription lokal oder mit dem leichtgewichtigen LLM.
+        Lokal werden vorhandene Segmente genutzt, um Absätze an Pausen zu setzen.
+        """
+        if self.mode == "local":
+            if segments:
+                return local_formatter.format_segments(segments)
+            return local_formatter.format_text(raw_text)
+
+        response = await self.client.chat.completions.create(
+            model=settings.LLM_MODEL_LIGHT,
+            messages=[
+                {"role": "system", "content": FORMATTING_PROMPT},
+                {"role": "user", "content": f"Hier ist die Rohtranskription:\n\n{raw_text}"}
+            ],
+            temperature=0.3,
+            timeout=30.0  # 30 Sekunden Timeout
+        )
+
+        if not response or not response.choices:
+            raise ValueError("Keine Antwort vom LLM erhalten")
+
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            metrics.increment("formatting.llm.prompt_tokens", int(usage.prompt_tokens or 0))
+            metrics.increment("formatting.llm.completion_tokens", int(usage.completion_tokens or 0))
+
+        return response.choices[0].message.content
+
+    async def _collect_batch(self) -> List[str]:
+        """
+        Wartet auf den nächsten Job und sammelt innerhalb des Batch-Fensters
+        bis zu batch_size weitere wartende Jobs ein.
+        """
+        job_ids = [await self.queue.get()]
+        deadline = time.monotonic() + self.batch_window
+
+        while len(job_ids) < self.batch_size:
+            try:
+                job_ids.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job_ids.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return job_ids
+
+    @staticmethod
+    def _group_by_session(jobs: List[FormattingJob]) -> List[List[FormattingJob]]:
+        """Fasst Jobs derselben Session in Eingangsreihenfolge zusammen"""
+        groups: Dict[str, List[FormattingJob]] = {}
+        result = []
+        for job in jobs:
+            if job.session_id is None:
+                result.append([job])
+            elif job.session_id in groups:
+                groups[job.session_id].append(job)
+            else:
+                groups[job.session_id] = [job]
+                result.append(groups[job.session_id])
+        return result
+
+    async def _process_queue(self, worker_id: int):
+        """Worker für die Verarbeitung von Formatierungs-Jobs"""
+        while True:
+            try:
+                job_ids = await self._collect_batch()
+            except asyncio.CancelledError:
+                break
+
+            try:
+                jobs = [self.jobs[job_id] for job_id in job_ids if job_id in self.jobs]
+                await asyncio.gather(*(
+                    self._format_batch(batch) for batch in self._group_by_session(jobs)
+                ))
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Unerwarteter Fehler in Formatierungs-Worker {worker_id}: {str(e)}")
+            finally:
+                for _ in job_ids:
+                    self.queue.task_done()
+
+    @staticmethod
+    def _join_segments(batch: List[FormattingJob]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Hängt die Segmente der Jobs aneinander (die Zeitstempel jedes Slices
+        beginnen bei 0, die Grenze zählt daher nicht als Pause). Fehlen bei
+        einem Job die Segmente, wird nur der Text formatiert.
+        """
+        if any(job.segments is None for job in batch):
+            return None
+        return [segment for job in batch for segment in job.segments]
+
+    async def _format_batch(self, batch: List[FormattingJob]):
+        """Formatiert einen oder mehrere Jobs in einem Aufruf"""
+        batch_ids = [job.id for job in batch]
+        raw_text = " ".join(job.raw_text.strip() for job in batch).strip()
+        segments = self._join_segments(batch)
+
+        for job in batch:
+            job.status = "processing"
+            job.batch = batch_ids
+
+        try:
+            # Leerer Text muss nicht formatiert werden
+            start = time.perf_counter()
+            text = await self.format_text(raw_text, segments) if raw_text else raw_text
+            metrics.observe(f"formatting.latency.{self.mode}", time.perf_counter() - start)
+            status, error = "completed", None
+            logger.info(f"Transkription formatiert: {len(batch)} Slice(s), {len(text)} Zeichen")
+        except Exception as e:
+            logger.error(f"Fehler bei der Textformatierung: {str(e)}")
+            # Bei Timeout oder anderen Fehlern bleibt der Rohtext gültig
+            text, status, error = raw_text, "failed", str(e)
+
+        finished_at = time.time()
+        for job in batch:
+            job.text = text
+            job.status = status
+            job.error = error
+            job.finished_at = finished_at
+
+        # Ein Update pro Empfänger, auch wenn mehrere Slices zusammengefasst wurden
+        notified = []
+        for job in batch:
+            if job.callback is None or job.callback in notified:
+                continue
+            notified.append(job.callback)
+            try:
+                await job.callback({
+                    "type": "formatting_result",
+                    "status": status,
+                    "formatting_ids": batch_ids,
+                    "task_ids": [j.task_id for j in batch if j.callback is job.callback],
+                    "text": text,
+                    "error": error
+                })
+            except Exception as e:
+                logger.error(f"Fehler beim Senden des Formatierungs-Updates: {str(e)}")
@@ -0,0 +1,161 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict
+
+import numpy as np
+
+from audio_processor import AudioProcessor
+from config import settings
+from utils.logger import get_logger
+from utils.metrics import metrics
+from utils.pcm import SAMPLE_RATE, PCMInput, pcm_to_float32
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SessionLanguage:
+    """Erkannte Sprache einer Aufnahme"""
+    language: str
+    probability: float
+    detected_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    # Gesetzt, wenn die Konfidenz eines Chunks unter LANGUAGE_RECHECK_LOGPROB fiel
+    recheck: bool = False
+
+
+class SessionLanguageCache:
+    """
+    Spracherkennung einmal pro Aufnahme statt pro Chunk.
+
+    Mit WHISPER_LANGUAGE=auto wird die Sprache am ersten ausreichend langen
+    Sprachabschnitt einer Session erkannt (LANGUAGE_DETECTION_MIN_SPEECH_S)
+    und für alle weiteren Chunks der Session übernommen. Liegt die
+    Wahrscheinlichkeit der Erkennung unter LANGUAGE_MIN_PROBABILITY oder fällt
+    die Konfidenz eines Chunks unter LANGUAGE_RECHECK_LOGPROB, wird beim
+    nächsten Chunk neu erkannt. Bei fester Sprache ist der Cache wirkungslos.
+    """
+
+    def __init__(
+        self,
+        worker_pool,
+        audio_processor: Optional[AudioProcessor] = None,
+        ttl: Optional[int] = None
+    ):
+        self.worker_pool = worker_pool
+        self.audio_processor = audio_processor or AudioProcessor()
+        self.ttl = settings.TRANSCRIPTION_SESSION_TTL if ttl is None else ttl
+        self._entries: Dict[str, SessionLanguage] = {}
+        # Verhindert parallele Erkennungen für dieselbe Session
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """True, wenn die Sprache automatisch erkannt wird"""
+        return settings.WHISPER_LANGUAGE == "auto"
+
+    def get(self, session_id: str) -> Optional[SessionLanguage]:
+        """Gibt die zwischengespeicherte Sprache einer Session zurück"""
+        return self._entries.get(session_id)
+
+    async def resolve(self, session_id: Optional[str], audio: PCMInput) -> Optional[str]:
+        """
+        Sprache für einen Chunk einer Session.
+
+        Args:
+            session_id: Schlüssel der Aufnahme; None erkennt ohne Zwischenspeicherung
+                (einzelner Upload)
+            audio: Audio des Chunks (16 kHz Mono, float32 oder WAV-/s16le-Bytes)
+
+        Returns:
+            Sprachcode; None, solange noch nicht genug Sprache für eine
+            Erkennung vorlag (Whisper erkennt dann selbst)
+        """
+        if not self.enabled:
+            return settings.WHISPER_LANGUAGE
+
+        pcm = pcm_to_float32(audio)
+        if session_id is None:
+            detected = await self._detect(pcm)
+            return detected.language if detected else None
+
+        self._purge_expired()
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(session_id)
+            if entry is not None and not entry.recheck:
+                entry.last_used = time.time()
+                metrics.increment("language.cache_hits")
+                return entry.language
+
+            detected = await self._detect(pcm)
+            if detected is None:
+                # Bisherige Sprache behalten, bis genug Sprache vorliegt
+                return entry.language if entry else None
+
+            if entry is not None and entry.language != detected.language:
+                metrics.increment("language.changes")
+                logger.info(
+                    f"Sprache der Session {session_id} gewechselt: {entry.language} -> {detected.language}"
+                )
+            self._entries[session_id] = detected
+            return detected.language
+
+    def report(self, session_id: Optional[str], confidence: float):
+        """
+        Meldet die Konfidenz (mittlere avg_logprob) eines transkribierten Chunks.
+        Liegt sie unter LANGUAGE_RECHECK_LOGPROB, wird die Sprache neu erkannt.
+        """
+        entry = self._entries.get(session_id) if session_id else None
+        if entry is None or entry.recheck:
+            return
+        if confidence < settings.LANGUAGE_RECHECK_LOGPROB:
+            entry.recheck = True
+            metrics.increment("language.rechecks")
+
+    def discard(self, session_id: str):
+        """
+        Entfernt den Eintrag einer beendeten Session. Den Lock hält ggf. noch
+        eine laufende Erkennung; er bleibt dann bis zum nächsten Aufräumen.
+        """
+        self._entries.pop(session_id, None)
+        lock = self._locks.get(session_id)
+        if lock is not None and not lock.locked():
+            del self._locks[session_id]
+
+    async def _detect(self, pcm: np.ndarray) -> Optional[SessionLanguage]:
+        """Erkennt die Sprache am Sprachabschnitt des Chunks, sofern lang genug"""
+        bounds = self.audio_processor.speech_bounds(pcm)
+        if bounds is None:
+            return None
+        start, end = bounds
+        if (end - start) / SAMPLE_RATE < settings.LANGUAGE_DETECTION_MIN_SPEECH_S:
+            return None
+
+        language, probability = await self.worker_pool.detect_language(pcm[start:end])
+        metrics.increment("language.detections")
+        metrics.increment(f"language.detected.{language}")
+        # Unsichere Erkennungen gelten nur für diesen Chunk
+        return SessionLanguage(
+            language=language,
+            probability=probability,
+            recheck=probability < settings.LANGUAGE_MIN_PROBABILITY
+        )
+
+    def _purge_expired(self):
+        """Entfernt Sessions, die länger als die TTL nicht genutzt wurden"""
+        now = time.time()
+        expired = [
+            session_id for session_id, entry in self._entries.items()
+            if now - entry.last_used > self.ttl
+        ]
+        for session_id in expired:
+            self.discard(session_id)
+        # Locks verworfener Sessions, deren Erkennung inzwischen abgeschlossen ist
+        orphaned = [
+            session_id for session_id, lock in self._locks.items()
+            if session_id not in self._entries and not lock.locked()
+        ]
+        for session_id in orphaned:
+            del self._locks[session_id]
@@ -0,0 +1,104 @@
+import html
+import re
+from typing import Optional, List, Dict, Any, Tuple
+
+from config import settings
+
+# Satzende: Satzzeichen (ggf. mit schließendem Anführungszeichen/Klammer) vor Leerraum
+SENTENCE_END = re.compile(r"(?:(?<=[.!?…])|(?<=[.!?…][\"'»“)\]]))\s+")
+SENTENCE_CLOSED = re.compile(r"[.!?…][\"'»“)\]]?$")
+# Punkt ohne Satzende: Ordnungszahlen ("3. März") und gängige Abkürzungen
+NO_SENTENCE_END = re.compile(
+    r"(?:\b\d+|\b(?:Dr|Prof|Nr|bzw|ca|ggf|vgl|usw|etc|evtl|inkl|z\.B|u\.a|d\.h|Hr|Fr|St))\.$",
+    re.IGNORECASE
+)
+
+
+def _sentences(text: str) -> List[str]:
+    """Zerlegt Text an Satzenden; Leerraum wird vereinheitlicht"""
+    sentences: List[str] = []
+    for part in SENTENCE_END.split(" ".join(text.split())):
+        if not part:
+            continue
+        if sentences and NO_SENTENCE_END.search(sentences[-1]):
+            sentences[-1] = f"{sentences[-1]} {part}"
+        else:
+            sentences.append(part)
+    return sentences
+
+
+def _units(segments: List[Dict[str, Any]]) -> List[Tuple[str, float]]:
+    """
+    Fasst Whisper-Segmente zu Sätzen zusammen.
+
+    Returns:
+        Liste von (Satz, Pause vor dem Satz in Sekunden); Sätze, die über
+        Segmentgrenzen reichen, werden zusammengefügt
+    """
+    units: List[Tuple[str, float]] = []
+    pending: Optional[str] = None  # unvollständiger Satz am Ende des letzten Segments
+    pending_pause = 0.0
+    previous_end: Optional[float] = None
+
+    for segment in segments:
+        start = segment.get("start")
+        pause = (
+            max(0.0, start - previous_end)
+            if start is not None and previous_end is not None else 0.0
+        )
+        previous_end = segment.get("end", previous_end)
+
+        for index, sentence in enumerate(_sentences(segment.get("text", ""))):
+            if index == 0 and pending is not None:
+                sentence, pause = f"{pending} {sentence}", pending_pause
+                pending = None
+            elif index > 0:
+                pause = 0.0
+            if SENTENCE_CLOSED.search(sentence) and not NO_SENTENCE_END.search(sentence):
+                units.append((sentence, pause))
+            else:
+                pending, pending_pause = sentence, pause
+
+    if pending is not None:
+        units.append((pending, pending_pause))
+    return units
+
+
+def _capitalize(text: str) -> str:
+    return text[:1].upper() + text[1:]
+
+
+def format_segments(
+    segments: List[Dict[str, Any]],
+    paragraph_pause: Optional[float] = None,
+    max_sentences: Optional[int] = None
+) -> str:
+    """
+    Formatiert eine Transkription regelbasiert mit <p>-Tags, ohne LLM.
+
+    Ein neuer Absatz beginnt an Satzgrenzen nach einer Sprechpause von
+    mindestens FORMATTING_PARAGRAPH_PAUSE_S (Abstand der Whisper-Segmente)
+    oder nach FORMATTING_PARAGRAPH_SENTENCES Sätzen. Der Wortlaut bleibt
+    unverändert, nur der Absatzanfang wird großgeschrieben.
+
+    Args:
+        segments: Whisper-Segmente mit start, end und text
+    """
+    paragraph_pause = settings.FORMATTING_PARAGRAPH_PAUSE_S if paragraph_pause is None else paragraph_pause
+    max_sentences = max_sentences or settings.FORMATTING_PARAGRAPH_SENTENCES
+
+    paragraphs: List[List[str]] = []
+    for sentence, pause in _units(segments):
+        if not paragraphs or pause >= paragraph_pause or len(paragraphs[-1]) >= max_sentences:
+            paragraphs.append([])
+        paragraphs[-1].append(sentence)
+
+    return "".join(
+        f"<p>{html.escape(_capitalize(' '.join(paragraph)), quote=False)}</p>"
+        for paragraph in paragraphs
+    )
+
+
+def format_text(text: str) -> str:
+    """Wie format_segments für reinen Text (ohne Pausen, nur Satzgrenzen)"""
+    return format_segments([{"text": text}])
@@ -0,0 +1,129 @@
+import asyncio
+import re
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_processor import AudioProcessor
+from config import settings
+from utils.bounded_executor import BoundedExecutor
+from utils.exceptions import AudioProcessingError
+from utils.logger import get_logger
+from utils.metrics import metrics
+from utils.pcm import SAMPLE_RATE
+
+logger = get_logger(__name__)
+
+
+def split_pcm(
+    audio_processor: AudioProcessor,
+    pcm: np.ndarray,
+    work_dir: Optional[Path] = None,
+    max_chunk_length: Optional[int] = None
+) -> List[np.ndarray]:
+    """
+    Teilt 16-kHz-float32-Audio an den Chunk-Grenzen von split_audio, im
+    Speicher als Sichten auf pcm (blockierend). Ohne geeignete Pausen wird
+    das Audio ungeteilt zurückgegeben. Mit AUDIO_EXPORT_CHUNKS werden die
+    Chunks zur Fehlersuche zusätzlich als WAV in work_dir abgelegt.
+    """
+    try:
+        chunks = audio_processor.split_pcm(pcm, max_chunk_length)
+    except AudioProcessingError as e:
+        logger.info(f"Audio wird ungeteilt transkribiert: {str(e)}")
+        return [pcm]
+
+    logger.debug(f"Chunk-Grenzen (ms): {[chunk.offset_ms for chunk in chunks]}")
+    if settings.AUDIO_EXPORT_CHUNKS and work_dir is not None:
+        paths = audio_processor.export_chunks(chunks, work_dir)
+        logger.info(f"{len(paths)} Chunks zur Fehlersuche exportiert: {work_dir}")
+    return [chunk.audio for chunk in chunks]
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+def stitch_texts(texts: List[str], max_overlap_words: int = 8) -> str:
+    """
+    Fügt die Texte aufeinanderfolgender Chunks zusammen.
+
+    Wörter, die am Ende eines Chunks und am Anfang des nächsten doppelt
+    erkannt wurden, werden einmal entfernt (Vergleich ohne Groß-/Klein-
+    schreibung und Satzzeichen). Einzelne Wörter gelten erst ab vier
+    Zeichen als Dublette, damit häufige kurze Wörter erhalten bleiben.
+    """
+    words: List[str] = []
+    for text in texts:
+        next_words = text.split()
+        limit = min(max_overlap_words, len(words), len(next_words))
+        for overlap in range(limit, 0, -1):
+            tail = [_normalize_word(word) for word in words[-overlap:]]
+            head = [_normalize_word(word) for word in next_words[:overlap]]
+            if tail == head and (overlap > 1 or len(tail[0]) >= 4):
+                next_words = next_words[overlap:]
+                break
+        words.extend(next_words)
+    return " ".join(words)
+
+
+async def transcribe_long_audio(
+    worker_pool,
+    audio_processor: AudioProcessor,
+    pcm: np.ndarray,
+    work_dir: Path,
+    profile: Optional[str] = None,
+    max_chunk_length: Optional[int] = None,
+    language: Optional[str] = None,
+    executor: Optional[BoundedExecutor] = None
+) -> Tuple[str, float, List[Dict[str, Any]]]:
+    """
+    Transkribiert lange Aufnahmen parallel: Aufteilung an Pausen, alle
+    Chunks gleichzeitig auf dem Worker-Pool, Zusammenfügen in Reihenfolge.
+
+    Die Chunks werden ohne Prompt-Kontext transkribiert, damit sie
+    unabhängig voneinander laufen können. Die Parallelität entspricht der
+    Anzahl der Worker-Prozesse (TRANSCRIPTION_PROCESSES). Die Sprache wird
+    vorab einmal für die gesamte Aufnahme bestimmt und an alle Chunks übergeben.
+    Die Aufteilung läuft auf dem begrenzten Upload-Executor (executor);
+    exportierte Chunks werden nach der Transkription wieder entfernt.
+
+    Returns:
+        Tuple aus Rohtext, nach Chunk-Dauer gewichteter Konfidenz und den
+        Segmenten aller Chunks mit Zeitstempeln relativ zum Aufnahmebeginn
+    """
+    chunk_dir = work_dir / f"long_{uuid.uuid4()}"
+    max_chunk_length = max_chunk_length or settings.LONG_AUDIO_CHUNK_MS
+    try:
+        if executor is not None:
+            chunks = await executor.run(split_pcm, audio_processor, pcm, chunk_dir, max_chunk_length)
+        else:
+            chunks = await asyncio.to_thread(split_pcm, audio_processor, pcm, chunk_dir, max_chunk_length)
+
+        logger.info(f"Lange Aufnahme in {len(chunks)} Chunks aufgeteilt")
+        metrics.increment("transcription.long_audio.uploads")
+        metrics.increment("transcription.long_audio.chunks", len(chunks))
+
+        results = await asyncio.gather(*[
+            worker_pool.transcribe(chunk, post_process=False, profile=profile, language=language, with_segments=True)
+            for chunk in chunks
+        ])
+    finally:
+        # Mit AUDIO_EXPORT_CHUNKS exportierte Chunks nur während der Verarbeitung aufbewahren
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+
+    text = stitch_texts([text for text, _, _ in results])
+    weights = [len(chunk) for chunk in chunks]
+    confidence = float(np.average([conf for _, conf, _ in results], weights=weights)) if results else 0.0
+
+    # Die Chunks liegen lückenlos hintereinander: Zeitstempel um den Chunk-Beginn verschieben
+    offsets = np.cumsum([0] + weights[:-1]) / SAMPLE_RATE
+    segments = [
+        {**segment, "start": segment["start"] + offset, "end": segment["end"] + offset}
+        for offset, (_, _, chunk_segments) in zip(offsets.tolist(), results)
+        for segment in chunk_segments
+    ]
+    return text, confidence, segments
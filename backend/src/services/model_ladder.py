@@ -0,0 +1,106 @@
+import time
+from typing import Optional, Dict, List
+
+from config import settings
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Glättung des gemessenen Echtzeitfaktors je Modell
+RTF_EMA_ALPHA = 0.2
+
+
+class ModelLadder:
+    """
+    Lastabhängige Modellwahl für Live-Chunks.
+
+    Die Leiter (MODEL_LADDER, z.B. large-v3 -> small -> base) beginnt mit dem
+    Hauptmodell. Überschreitet die Queue-Tiefe LADDER_QUEUE_DEPTH oder die
+    Wartezeit des ältesten Chunks LADDER_WAIT_S, laufen neue Chunks eine Stufe
+    kleiner; sinkt die Last unter LADDER_RECOVER_DEPTH (und die Wartezeit unter
+    die Hälfte der Schwelle), geht es eine Stufe zurück. Zwischen zwei Wechseln
+    liegen mindestens LADDER_HOLD_S Sekunden.
+
+    Zusätzlich wird der Echtzeitfaktor (Verarbeitungszeit pro Sekunde Audio)
+    je Modellgröße gemessen.
+    """
+
+    def __init__(
+        self,
+        models: Optional[List[str]] = None,
+        queue_depth: Optional[int] = None,
+        wait_s: Optional[float] = None,
+        recover_depth: Optional[int] = None,
+        hold_s: Optional[float] = None
+    ):
+        self.models = models if models is not None else settings.model_ladder
+        self.queue_depth = settings.LADDER_QUEUE_DEPTH if queue_depth is None else queue_depth
+        self.wait_s = settings.LADDER_WAIT_S if wait_s is None else wait_s
+        self.recover_depth = settings.LADDER_RECOVER_DEPTH if recover_depth is None else recover_depth
+        self.hold_s = settings.LADDER_HOLD_S if hold_s is None else hold_s
+
+        self.tier = 0
+        self._switched_at = float("-inf")
+        # Gleitender Mittelwert des Echtzeitfaktors je Modellgröße
+        self.rtf: Dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.models) > 1
+
+    @property
+    def model_size(self) -> Optional[str]:
+        """Modell der aktuellen Stufe; None = Hauptmodell"""
+        return self.models[self.tier] if self.tier > 0 else None
+
+    def label(self, model_size: Optional[str] = None) -> str:
+        """Name eines Modells für Metriken (None = Hauptmodell)"""
+        if model_size:
+            return model_size
+        return self.models[0] if self.models else "main"
+
+    def select(self, queue_depth: int, wait_seconds: float) -> Optional[str]:
+        """
+        Passt die Stufe an die aktuelle Last an und gibt das Modell für
+        einen neuen Chunk zurück.
+
+        Args:
+            queue_depth: Anzahl wartender Chunks
+            wait_seconds: Wartezeit des ältesten wartenden Chunks
+        """
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        if now - self._switched_at >= self.hold_s:
+            overloaded = queue_depth >= self.queue_depth or wait_seconds >= self.wait_s
+            relieved = queue_depth <= self.recover_depth and wait_seconds < self.wait_s / 2
+            if overloaded and self.tier < len(self.models) - 1:
+                self._switch(self.tier + 1, now, queue_depth, wait_seconds)
+            elif relieved and self.tier > 0:
+                self._switch(self.tier - 1, now, queue_depth, wait_seconds)
+        return self.model_size
+
+    def _switch(self, tier: int, now: float, queue_depth: int, wait_seconds: float):
+        direction = "down" if tier > self.tier else "up"
+        logger.info(
+            f"Lastleiter: {self.models[self.tier]} -> {self.models[tier]} "
+            f"(Queue {queue_depth}, Wartezeit {wait_seconds:.1f} s)"
+        )
+        self.tier = tier
+        self._switched_at = now
+        metrics.increment("transcription.ladder.switches")
+        metrics.increment(f"transcription.ladder.step_{direction}")
+        metrics.set_gauge("transcription.ladder.tier", tier)
+
+    def record(self, model_size: Optional[str], processing_seconds: float, audio_seconds: float):
+        """Erfasst den Echtzeitfaktor einer Transkription"""
+        if audio_seconds <= 0:
+            return
+        label = self.label(model_size)
+        rtf = processing_seconds / audio_seconds
+        metrics.observe(f"transcription.rtf.{label}", rtf)
+        previous = self.rtf.get(label)
+        self.rtf[label] = rtf if previous is None else previous + RTF_EMA_ALPHA * (rtf - previous)
+        metrics.set_gauge(f"transcription.rtf_avg.{label}", self.rtf[label])
@@ -0,0 +1,152 @@
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Deque
+
+from config import settings
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Whisper-BPE zerlegt deutschen Text in etwa ein Token pro drei Zeichen;
+# die Schätzung spart den Tokenizer (und damit torch/whisper) im API-Prozess
+CHARS_PER_TOKEN = 3
+
+
+def estimate_tokens(word: str) -> int:
+    """Geschätzte Anzahl Whisper-Tokens eines Worts inklusive Leerzeichen"""
+    return max(1, math.ceil(len(word) / CHARS_PER_TOKEN))
+
+
+def trim_prompt(text: Optional[str], max_tokens: Optional[int] = None) -> Optional[str]:
+    """
+    Kürzt einen Prompt von vorne auf ganze Wörter innerhalb des Token-Budgets
+    (PROMPT_CONTEXT_TOKENS). Whisper nutzt ohnehin nur das Ende des Prompts.
+    """
+    max_tokens = settings.PROMPT_CONTEXT_TOKENS if max_tokens is None else max_tokens
+    if not text or max_tokens <= 0:
+        return None
+
+    words = text.split()
+    kept = []
+    budget = max_tokens
+    for word in reversed(words):
+        budget -= estimate_tokens(word)
+        if budget < 0:
+            break
+        kept.append(word)
+    return " ".join(reversed(kept)) or None
+
+
+@dataclass
+class PromptContext:
+    """Bestätigte Wörter einer Aufnahme, älteste vorne"""
+    words: Deque[str] = field(default_factory=deque)
+    tokens: int = 0
+    last_used: float = field(default_factory=time.time)
+    # Chunk-Nummern für die Bestätigung in Aufnahme-Reihenfolge
+    next_sequence: int = 0
+    confirmed_sequence: int = 0
+    pending: Dict[int, str] = field(default_factory=dict)
+
+
+class SessionPromptContext:
+    """
+    Rollierender Prompt-Kontext pro Live-Aufnahme.
+
+    Der bestätigte Text jedes Chunks wird an den Kontext der Session
+    angehängt; ältere Wörter fallen heraus, sobald das Token-Budget
+    (PROMPT_CONTEXT_TOKENS) überschritten ist. Der Kontext geht als
+    initial_prompt an Whisper, damit Fachbegriffe und Schreibweisen über
+    Chunk-Grenzen erhalten bleiben, ohne dass der Prompt unbegrenzt wächst.
+
+    Werden Chunks parallel transkribiert, vergibt reserve() beim Einreihen
+    eine Chunk-Nummer; confirm() mit dieser Nummer hält später fertige
+    Chunks zurück, bis alle vorherigen bestätigt sind.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, ttl: Optional[int] = None):
+        self.max_tokens = settings.PROMPT_CONTEXT_TOKENS if max_tokens is None else max_tokens
+        self.ttl = settings.TRANSCRIPTION_SESSION_TTL if ttl is None else ttl
+        self._contexts: Dict[str, PromptContext] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_tokens > 0
+
+    def get(self, session_id: Optional[str]) -> Optional[str]:
+        """Prompt für den nächsten Chunk einer Session (None = kein Kontext)"""
+        if not self.enabled or not session_id:
+            return None
+
+        self._purge_expired()
+        context = self._contexts.get(session_id)
+        if context is None or not context.words:
+            return None
+        context.last_used = time.time()
+        metrics.observe("prompt_context.tokens", context.tokens)
+        return " ".join(context.words)
+
+    def reserve(self, session_id: Optional[str]) -> Optional[int]:
+        """Vergibt die nächste Chunk-Nummer einer Session (für confirm)"""
+        if not self.enabled or not session_id:
+            return None
+
+        context = self._contexts.setdefault(session_id, PromptContext())
+        sequence = context.next_sequence
+        context.next_sequence += 1
+        context.last_used = time.time()
+        return sequence
+
+    def confirm(self, session_id: Optional[str], text: str, sequence: Optional[int] = None):
+        """
+        Hängt den bestätigten Text eines Chunks an und kürzt auf das Budget.
+
+        Mit sequence (aus reserve) wird der Text erst übernommen, wenn alle
+        vorherigen Chunks bestätigt sind; fehlgeschlagene Chunks werden mit
+        leerem Text bestätigt, damit die Reihenfolge weiterläuft. Chunks einer
+        bereits verworfenen Session (discard) werden ignoriert.
+        """
+        if not self.enabled or not session_id or (sequence is None and not text):
+            return
+
+        if sequence is None:
+            self._append(self._contexts.setdefault(session_id, PromptContext()), text)
+            return
+
+        context = self._contexts.get(session_id)
+        if context is None:
+            return
+        context.pending[sequence] = text
+        while context.confirmed_sequence in context.pending:
+            self._append(context, context.pending.pop(context.confirmed_sequence))
+            context.confirmed_sequence += 1
+        context.last_used = time.time()
+
+    def _append(self, context: PromptContext, text: Optional[str]):
+        """Hängt Wörter an den Kontext an und entfernt die ältesten über dem Budget"""
+        if not text:
+            return
+
+        for word in text.split():
+            context.words.append(word)
+            context.tokens += estimate_tokens(word)
+        while context.tokens > self.max_tokens and context.words:
+            context.tokens -= estimate_tokens(context.words.popleft())
+        context.last_used = time.time()
+
+    def discard(self, session_id: str):
+        """Entfernt den Kontext einer beendeten Session"""
+        self._contexts.pop(session_id, None)
+
+    def _purge_expired(self):
+        """Entfernt Sessions, die länger als die TTL nicht genutzt wurden"""
+        now = time.time()
+        expired = [
+            session_id for session_id, context in self._contexts.items()
+            if now - context.last_used > self.ttl
+        ]
+        for session_id in expired:
+            del self._contexts[session_id]
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+from config import settings
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class TranscriptionCache:
+    """
+    Inhaltsadressierter Cache für Transkriptionen.
+
+    Der Schlüssel ist ein Hash über das dekodierte PCM-Audio sowie Engine,
+    Modell, Quantisierung, Sprache, Fidelity-Profil und Prompt. Einträge
+    liegen in einem Speicher- und einem Festplatten-Tier, beide mit
+    größenbasierter LRU-Verdrängung. Treffer und Fehlschläge werden in utils.metrics gezählt.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        memory_limit_bytes: Optional[int] = None,
+        disk_limit_bytes: Optional[int] = None
+    ):
+        self.cache_dir = Path(cache_dir or settings.TRANSCRIPTION_CACHE_DIR)
+        self.memory_limit = (
+            settings.TRANSCRIPTION_CACHE_MEMORY_MB * 1024 * 1024
+            if memory_limit_bytes is None else memory_limit_bytes
+        )
+        self.disk_limit = (
+            settings.TRANSCRIPTION_CACHE_DISK_MB * 1024 * 1024
+            if disk_limit_bytes is None else disk_limit_bytes
+        )
+
+        self._lock = threading.Lock()
+        # Schlüssel -> (Eintrag, Größe in Bytes); älteste Einträge vorne
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_size = 0
+        # Schlüssel -> Dateigröße; älteste Einträge vorne
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_size = 0
+
+        if self.disk_limit > 0:
+            self._load_disk_index()
+
+    @staticmethod
+    def make_key(
+        pcm: np.ndarray,
+        prompt: Optional[str] = None,
+        language: str = "de",
+        profile: str = ""
+    ) -> str:
+        """Erzeugt den Cache-Schlüssel für dekodiertes 16-kHz-float32-Audio"""
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(pcm, dtype=np.float32).tobytes())
+        model_identity = "|".join([
+            settings.ASR_ENGINE,
+            settings.WHISPER_MODEL,
+            settings.WHISPER_DEVICE_CUDA,
+            settings.WHISPER_QUANTIZATION,
+            language,
+            profile,
+            prompt or ""
+        ])
+        digest.update(model_identity.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load_disk_index(self):
+        """Baut den LRU-Index des Festplatten-Tiers aus den vorhandenen Dateien auf"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            files = sorted(self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+            for path in files:
+                size = path.stat().st_size
+                self._disk[path.stem] = size
+                self._disk_size += size
+            self._evict_disk()
+            logger.info(f"Transkriptions-Cache: {len(self._disk)} Einträge auf der Festplatte")
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Transkriptions-Caches: {str(e)}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Gibt einen Eintrag zurück oder None; Festplatten-Treffer werden in den Speicher übernommen"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                metrics.increment("transcription_cache.hits.memory")
+                return dict(self._memory[key][0])
+
+            if key in self._disk:
+                try:
+                    path = self._path(key)
+                    entry = json.loads(path.read_text(encoding="utf-8"))
+                    os.utime(path)
+                    self._disk.move_to_end(key)
+                    self._store_memory(key, entry)
+                    metrics.increment("transcription_cache.hits.disk")
+                    return dict(entry)
+                except Exception as e:
+                    logger.warning(f"Cache-Eintrag {key} nicht lesbar: {str(e)}")
+                    self._remove_disk(key)
+
+            metrics.increment("transcription_cache.misses")
+            return None
+
+    def put(self, key: str, text: str, confidence: float, formatted_text: Optional[str] = None):
+        """Speichert eine Transkription in beiden Tiers"""
+        entry = {
+            "text": text,
+            "confidence": confidence,
+            "formatted_text": formatted_text,
+            "created_at": time.time()
+        }
+        with self._lock:
+            self._store_memory(key, entry)
+            self._store_disk(key, entry)
+
+    def set_formatted(self, key: str, formatted_text: str):
+        """Ergänzt einen vorhandenen Eintrag um den formatierten Text"""
+        with self._lock:
+            entry = None
+            if key in self._memory:
+                entry = dict(self._memory[key][0])
+            elif key in self._disk:
+                try:
+                    entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+                except Exception:
+                    entry = None
+            if entry is None:
+                return
+
+            entry["formatted_text"] = formatted_text
+            self._store_memory(key, entry)
+            self._store_disk(key, entry)
+
+    def _store_memory(self, key: str, entry: Dict[str, Any]):
+        size = len(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        if key in self._memory:
+            self._memory_size -= self._memory.pop(key)[1]
+        if size > self.memory_limit:
+            return
+
+        self._memory[key] = (entry, size)
+        self._memory_size += size
+        while self._memory_size > self.memory_limit:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_size -= evicted_size
+            metrics.increment("transcription_cache.evictions.memory")
+
+    def _store_disk(self, key: str, entry: Dict[str, Any]):
+        if self.disk_limit <= 0:
+            return
+        try:
+            data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Atomar schreiben, damit abgebrochene Schreibvorgänge keine halben Einträge hinterlassen
+            tmp_path = self._path(key).with_suffix(".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self._path(key))
+
+            if key in self._disk:
+                self._disk_size -= self._disk.pop(key)
+            self._disk[key] = len(data)
+            self._disk_size += len(data)
+            self._evict_disk()
+        except Exception as e:
+            logger.error(f"Fehler beim Schreiben des Cache-Eintrags {key}: {str(e)}")
+
+    def _evict_disk(self):
+        while self._disk_size > self.disk_limit and self._disk:
+            key = next(iter(self._disk))
+            self._remove_disk(key)
+            metrics.increment("transcription_cache.evictions.disk")
+
+    def _remove_disk(self, key: str):
+        self._disk_size -= self._disk.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Füllstand beider Tiers"""
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_size,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_size
+            }
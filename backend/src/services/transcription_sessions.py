@@ -0,0 +1,230 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+from audio_processor import AudioProcessor
+from config import settings
+from engines.fidelity import DRAFT_PROFILE, resolve_profile
+from services.formatting_service import FormattingService
+from services.language_cache import SessionLanguageCache
+from services.prompt_context import trim_prompt
+from services.long_audio import split_pcm
+from utils.logger import get_logger, log_function_call
+from utils.pcm import duration_seconds
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class TranscriptionSession:
+    """Eine Live-Aufnahme: Entwürfe der Slices und der finale Text"""
+    id: str
+    created_at: float = field(default_factory=time.time)
+    state: str = "recording"  # recording, finalizing, completed, failed
+    slices: List[np.ndarray] = field(default_factory=list)
+    draft_texts: List[str] = field(default_factory=list)  # ein Eintrag je Slice, ggf. leer
+    boundaries: List[int] = field(default_factory=list)  # Ende jedes Slices in Samples ab Aufnahmebeginn
+    text: Optional[str] = None
+    chunks: int = 0
+    progress: float = 0.0  # 0.0 - 1.0 des finalen Durchlaufs
+    formatting_id: Optional[str] = None
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.id,
+            "state": self.state,
+            "draft_text": " ".join(text for text in self.draft_texts if text),
+            "text": self.text,
+            "chunks": self.chunks,
+            "progress": self.progress,
+            "formatting_id": self.formatting_id,
+            "error": self.error
+        }
+
+
+class TranscriptionSessionManager:
+    """
+    Zweistufige Transkription von Live-Aufnahmen.
+
+    Während der Aufnahme liefert das Entwurfsmodell schnelle Texte je Slice;
+    das Audio der Slices und ihre Grenzen werden pro Session gesammelt. Nach
+    Aufnahmeende transkribiert ein Hintergrund-Job die gesamte Aufnahme mit
+    dem Hauptmodell, geteilt an denselben Grenzen wie die Entwürfe, und
+    ersetzt damit die Entwürfe. Audio hinter dem letzten Slice (Rest der
+    vollständigen Aufnahme) bildet einen weiteren Chunk.
+
+    Stammen die Entwürfe bereits vom Hauptmodell mit dem Profil des finalen
+    Durchlaufs, werden sie übernommen und nur der Rest transkribiert.
+    """
+
+    def __init__(
+        self,
+        worker_pool,
+        audio_processor: AudioProcessor,
+        formatter: Optional[FormattingService] = None,
+        work_dir: Optional[Path] = None,
+        profile: Optional[str] = None,
+        ttl: Optional[int] = None,
+        language_cache: Optional[SessionLanguageCache] = None
+    ):
+        self.worker_pool = worker_pool
+        self.audio_processor = audio_processor
+        self.formatter = formatter
+        self.work_dir = Path(work_dir or settings.TEMP_DIR)
+        self.profile = resolve_profile(profile or settings.TRANSCRIPTION_FINAL_PROFILE)
+        self.ttl = settings.TRANSCRIPTION_SESSION_TTL if ttl is None else ttl
+        # Sprache der Live-Slices auch für den finalen Durchlauf übernehmen
+        self.language_cache = language_cache
+
+        self.sessions: Dict[str, TranscriptionSession] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get(self, session_id: str) -> Optional[TranscriptionSession]:
+        """Gibt eine Session zurück (None, falls unbekannt oder abgelaufen)"""
+        self._purge_expired()
+        return self.sessions.get(session_id)
+
+    def add_draft(self, session_id: str, pcm: np.ndarray, text: str) -> TranscriptionSession:
+        """Speichert Audio und Entwurfstext eines Live-Slices"""
+        self._purge_expired()
+
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = TranscriptionSession(id=session_id)
+        if session.state == "recording":
+            session.slices.append(pcm)
+            session.draft_texts.append(text)
+            session.boundaries.append((session.boundaries[-1] if session.boundaries else 0) + len(pcm))
+        return session
+
+    def finalize(self, session_id: str, pcm: Optional[np.ndarray] = None) -> TranscriptionSession:
+        """
+        Startet den finalen Durchlauf im Hintergrund und kehrt sofort zurück.
+
+        Args:
+            session_id: ID der Aufnahme
+            pcm: Optional die vollständige Aufnahme; sonst werden die
+                gesammelten Slices verwendet
+
+        Raises:
+            ValueError: Wenn für die Session kein Audio vorliegt
+        """
+        self._purge_expired()
+        session = self.sessions.get(session_id)
+        if session is None:
+            if pcm is None:
+                raise ValueError(f"Unbekannte Session: {session_id}")
+            session = self.sessions[session_id] = TranscriptionSession(id=session_id)
+
+        if session.state != "recording":
+            # Bereits abgeschlossen oder in Arbeit
+            return session
+
+        if pcm is None:
+            if not session.slices:
+                raise ValueError(f"Kein Audio für Session {session_id}")
+            pcm = np.concatenate(session.slices)
+        # Das Audio der Slices wird nicht mehr benötigt
+        session.slices = []
+        session.state = "finalizing"
+        self._tasks[session_id] = asyncio.create_task(self._run_final_pass(session, pcm))
+        return session
+
+    @log_function_call
+    async def stop(self):
+        """Bricht laufende finale Durchläufe ab"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def _drafts_are_final(self) -> bool:
+        """True, wenn Modell und Profil der Entwürfe denen des finalen Durchlaufs entsprechen"""
+        draft_model = settings.WHISPER_DRAFT_MODEL or settings.WHISPER_MODEL
+        return draft_model == settings.WHISPER_MODEL and self.profile == DRAFT_PROFILE
+
+    async def _run_final_pass(self, session: TranscriptionSession, pcm: np.ndarray):
+        """Transkribiert die gesamte Aufnahme (bzw. den Rest hinter den Entwürfen) mit dem Hauptmodell"""
+        work_dir = self.work_dir / f"session_{session.id}"
+        start = time.perf_counter()
+        try:
+            # Grenzen der Entwürfe wiederverwenden; ohne Entwürfe an Pausen teilen
+            boundaries = [boundary for boundary in session.boundaries if boundary < len(pcm)]
+            if session.boundaries:
+                chunks = np.split(pcm, boundaries)
+            else:
+                chunks = await asyncio.to_thread(split_pcm, self.audio_processor, pcm, work_dir)
+
+            texts = []
+            previous_text = None
+            if session.boundaries and self._drafts_are_final():
+                # Die Entwürfe entsprechen bereits dem finalen Durchlauf; nur der Rest hinter
+                # dem letzten Slice (bei hochgeladener Gesamtaufnahme) fehlt noch
+                has_tail = len(boundaries) == len(session.boundaries)
+                drafted = len(chunks) - 1 if has_tail else len(chunks)
+                texts = [text for text in session.draft_texts[:drafted] if text]
+                previous_text = trim_prompt(texts[-1]) if texts else None
+                chunks = chunks[drafted:]
+
+            chunks = [chunk for chunk in chunks if len(chunk)]
+            session.chunks = len(chunks)
+            language = (
+                await self.language_cache.resolve(session.id, pcm)
+                if self.language_cache is not None and chunks else None
+            )
+
+            for index, chunk in enumerate(chunks):
+                # Chunks nacheinander, damit jeder den vorherigen Text als Kontext erhält
+                text, _ = await self.worker_pool.transcribe(
+                    chunk,
+                    previous_text=previous_text,
+                    post_process=False,
+                    profile=self.profile,
+                    language=language
+                )
+                if text:
+                    texts.append(text)
+                    previous_text = trim_prompt(text)
+                session.progress = (index + 1) / len(chunks)
+
+            session.progress = 1.0
+            session.text = " ".join(texts)
+            if self.formatter is not None and session.text:
+                session.formatting_id = self.formatter.submit(session.text, session_id=session.id)
+            session.state = "completed"
+            logger.info(
+                f"Finaler Durchlauf für Session {session.id}: {len(chunks)} Chunks, "
+                f"{duration_seconds(pcm):.1f} s Audio in {time.perf_counter() - start:.1f} s"
+            )
+
+        except asyncio.CancelledError:
+            session.state = "failed"
+            session.error = "Abgebrochen"
+            raise
+        except Exception as e:
+            logger.error(f"Fehler beim finalen Durchlauf für Session {session.id}: {str(e)}")
+            session.state = "failed"
+            session.error = str(e)
+        finally:
+            session.finished_at = time.time()
+            self._tasks.pop(session.id, None)
+            if self.language_cache is not None:
+                self.language_cache.discard(session.id)
+
+    def _purge_expired(self):
+        """Entfernt abgeschlossene und nie beendete Aufnahmen nach Ablauf der TTL"""
+        now = time.time()
+        expired = [
+            session_id for session_id, session in self.sessions.items()
+            if (session.finished_at is not None and now - session.finished_at > self.ttl)
+            or (session.state == "recording" and now - session.created_at > self.ttl)
+        ]
+        for session_id in expired:
+            del self.sessions[session_id]
@@ -1,69 +1,236 @@
-import whisper
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 import numpy as np
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Union, Dict, Any
 from utils.logger import get_logger
 import torch
 from config import settings
 from openai import OpenAI
 from utils.singleton import Singleton
+from utils.pcm import pcm_to_float32, duration_seconds, PCMInput, SAMPLE_RATE
+from utils.metrics import metrics
+from audio_processor import AudioProcessor
+from engines.asr_engine import ASREngine
+from engines.engine_factory import EngineFactory
+from engines.fidelity import DRAFT_PROFILE, get_profile_options
+from services.formatting_service import FORMATTING_PROMPT
+from services.local_formatter import format_segments
 
 logger = get_logger(__name__)
 
+# Whisper verwirft "keine Sprache" nur, wenn zusätzlich die Log-Wahrscheinlichkeit niedrig ist
+NO_SPEECH_LOGPROB_THRESHOLD = -1.0
+# Glättung der gemessenen Dekodierzeiten für die Schätzung der VAD-Einsparung
+DECODE_EMA_ALPHA = 0.2
+# Eingebauter stiller Clip für den Probelauf nach dem Laden eines Modells
+WARMUP_AUDIO = np.zeros(SAMPLE_RATE, dtype=np.float32)
+
 class Transcriber(Singleton):
     def _init(self, model_size: str = None, api_key: str = None):
         """Initialisierung des Transcribers"""
-        self.model = None
+        self.engine: Optional[ASREngine] = None
+        # Optionales kleines Modell für schnelle Live-Entwürfe (WHISPER_DRAFT_MODEL)
+        self.draft_engine: Optional[ASREngine] = None
+        # Kleinere Modelle der Lastleiter (MODEL_LADDER), nach Modellgröße
+        self.ladder_engines: Dict[str, ASREngine] = {}
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.client = OpenAI(api_key=api_key or settings.LLM_API_KEY)
+        # Zählt laufende Transkriptionen pro Engine, damit eine ersetzte
+        # Engine erst nach Abschluss aller Aufrufe freigegeben wird
+        self._engine_condition = threading.Condition()
+        self._engine_users: Dict[int, int] = {}
+        # Sprachaktivitätserkennung vor Whisper (VAD_ENABLED)
+        self.audio_processor = AudioProcessor()
+        # Gemessene Dekodierzeit pro Aufruf und pro Sekunde Audio (gleitender Mittelwert)
+        self._decode_call_seconds = 0.0
+        self._decode_rate = 0.0
         self.load_model(model_size)
     
-    def load_model(self, model_size: str = None):
-        """Lädt das Whisper-Modell mit den angegebenen Parametern."""
+    @property
+    def model(self):
+        """Das von der aktiven Engine geladene Modell"""
+        return self.engine.model if self.engine else None
+    
+    @property
+    def model_size(self) -> Optional[str]:
+        """Modellgröße der aktiven Engine"""
+        return self.engine.model_size if self.engine else None
+    
+    def _resolve_model_size(self, model_size: Optional[str] = None) -> str:
+        """Bestimmt die Modellgröße anhand der Konfiguration"""
+        if model_size is None:
+            model_size = settings.WHISPER_DEVICE_CUDA if self.device == "cuda" else settings.WHISPER_MODEL
+        return model_size
+    
+    def _create_engine(self, model_size: str) -> ASREngine:
+        """Lädt eine ASR-Engine, ohne die aktive Engine zu verändern"""
         try:
-            if model_size is None:
-                model_size = settings.WHISPER_DEVICE_CUDA if self.device == "cuda" else settings.WHISPER_MODEL
+            logger.info(f"Lade {settings.ASR_ENGINE}-Modell: {model_size} auf {self.device}")
             
-            logger.info(f"Lade Whisper-Modell: {model_size} auf {self.device}")
-            
-            self.model = whisper.load_model(model_size, device=self.device)
+            engine = EngineFactory.get_engine(
+                settings.ASR_ENGINE,
+                model_size=model_size,
+                device=self.device,
+                quantization=settings.WHISPER_QUANTIZATION
+            )
             logger.info(f"Whisper-Modell '{model_size}' erfolgreich geladen")
+            return engine
             
         except Exception as e:
             logger.error(f"Fehler beim Laden des Whisper-Modells: {str(e)}")
             raise
     
-    def reload_model(self):
-        """Lädt das Modell mit aktuellen Konfigurationseinstellungen neu."""
+    def load_model(self, model_size: str = None):
+        """Lädt das Whisper-Modell mit den angegebenen Parametern."""
+        self.engine = self._create_engine(self._resolve_model_size(model_size))
+        self.draft_engine = self._create_draft_engine()
+        self.ladder_engines = self._create_ladder_engines(self.engine, self.draft_engine)
+    
+    def _create_draft_engine(self) -> Optional[ASREngine]:
+        """Lädt das Entwurfsmodell, sofern konfiguriert und vom Hauptmodell verschieden"""
+        draft_size = settings.WHISPER_DRAFT_MODEL
+        if not draft_size or draft_size == self.model_size:
+            return None
+        return self._create_engine(draft_size)
+    
+    def _create_ladder_engines(
+        self,
+        engine: ASREngine,
+        draft_engine: Optional[ASREngine] = None
+    ) -> Dict[str, ASREngine]:
+        """
+        Lädt die kleineren Stufen der Lastleiter. Die erste Stufe ist das
+        Hauptmodell; Stufen mit der Größe von Haupt- oder Entwurfsmodell
+        nutzen deren Engine.
+        """
+        engines: Dict[str, ASREngine] = {}
+        for size in settings.model_ladder[1:]:
+            if size == engine.model_size:
+                engines[size] = engine
+            elif draft_engine is not None and size == draft_engine.model_size:
+                engines[size] = draft_engine
+            elif size not in engines:
+                engines[size] = self._create_engine(size)
+        return engines
+    
+    @staticmethod
+    def _unique_engines(*engines: Optional[ASREngine]) -> List[ASREngine]:
+        """Entfernt fehlende und mehrfach genutzte Engines"""
+        unique: List[ASREngine] = []
+        for engine in engines:
+            if engine is not None and all(engine is not known for known in unique):
+                unique.append(engine)
+        return unique
+    
+    def _all_engines(self) -> List[ASREngine]:
+        """Alle geladenen Engines (Haupt-, Entwurfs- und Leiter-Engines)"""
+        return self._unique_engines(self.engine, self.draft_engine, *self.ladder_engines.values())
+    
+    def warm_up(self) -> float:
+        """
+        Probelauf von Haupt- und Entwurfs-Engine auf dem stillen Clip, damit
+        die erste echte Anfrage nicht die Initialisierungskosten trägt
+        (Speicherallokation, Kernel-Auswahl, ggf. CUDA-Kontext).
+
+        Returns:
+            Dauer des Probelaufs in Sekunden
+        """
+        start = time.perf_counter()
+        for engine in self._all_engines():
+            self._warm_up_engine(engine)
+        elapsed = time.perf_counter() - start
+        metrics.set_gauge("startup.warmup_seconds", elapsed)
+        logger.info(f"Whisper-Warm-up abgeschlossen in {elapsed:.2f} s")
+        return elapsed
+
+    def _warm_up_engine(self, engine: ASREngine):
+        """Dekodiert den stillen Clip direkt auf der Engine (ohne VAD, die ihn überspringen würde)"""
+        engine.transcribe(WARMUP_AUDIO, None, self._decoding_options("live"))
+
+    @property
+    def draft_model_size(self) -> Optional[str]:
+        """Modellgröße der Entwurfs-Engine (None = Entwürfe laufen auf dem Hauptmodell)"""
+        return self.draft_engine.model_size if self.draft_engine else None
+    
+    @contextmanager
+    def _acquire_engine(self, draft: bool = False, model_size: Optional[str] = None):
+        """
+        Hält eine Referenz auf die aktuelle Engine für die Dauer eines Aufrufs.
+        Mit draft=True die Entwurfs-Engine, falls geladen, sonst die Haupt-Engine.
+        Mit model_size eine Stufe der Lastleiter (unbekannte Größen: Haupt-Engine).
+        """
+        with self._engine_condition:
+            if model_size:
+                engine = self.ladder_engines.get(model_size, self.engine)
+            else:
+                engine = self.draft_engine if draft and self.draft_engine else self.engine
+            self._engine_users[id(engine)] = self._engine_users.get(id(engine), 0) + 1
+        try:
+            yield engine
+        finally:
+            with self._engine_condition:
+                self._engine_users[id(engine)] -= 1
+                self._engine_condition.notify_all()
+    
+    def reload_model(self, model_size: str = None):
+        """
+        Lädt das Modell mit aktuellen Konfigurationseinstellungen neu (Hot-Swap).
+
+        Die neue Engine wird geladen, während die alte weiter transkribiert.
+        Danach wird sie atomar ausgetauscht; die alte Engine wird erst
+        freigegeben, wenn alle laufenden Transkriptionen damit beendet sind.
+        """
         logger.info("Lade Whisper-Modell neu...")
-        if self.model:
-            # Cleanup des alten Modells
-            del self.model
-            torch.cuda.empty_cache()  # GPU-Speicher freigeben
+        new_engine = self._create_engine(self._resolve_model_size(model_size))
+        draft_size = settings.WHISPER_DRAFT_MODEL
+        new_draft = (
+            self._create_engine(draft_size)
+            if draft_size and draft_size != new_engine.model_size else None
+        )
+        new_ladder = self._create_ladder_engines(new_engine, new_draft)
+        
+        if settings.WHISPER_WARMUP:
+            # Neue Engines vor der Aktivierung aufwärmen
+            for engine in self._unique_engines(new_engine, new_draft, *new_ladder.values()):
+                self._warm_up_engine(engine)
         
-        self.load_model()
+        with self._engine_condition:
+            old_engines = self._all_engines()
+            self.engine, self.draft_engine, self.ladder_engines = new_engine, new_draft, new_ladder
+            # Auf laufende Transkriptionen mit den alten Engines warten
+            self._engine_condition.wait_for(
+                lambda: all(self._engine_users.get(id(old), 0) == 0 for old in old_engines)
+            )
+            for old in old_engines:
+                self._engine_users.pop(id(old), None)
+        
+        for old in old_engines:
+            # Cleanup des alten Modells
+            old.release()
+        logger.info(f"Whisper-Modell auf '{new_engine.model_size}' umgestellt")
 
-    def post_process_transcription(self, raw_text: str) -> str:
+    def post_process_transcription(
+        self,
+        raw_text: str,
+        segments: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
         """
-        Verarbeitet die Rohtranskription mit einem leichtgewichtigen LLM für bessere Lesbarkeit.
+        Verarbeitet die Rohtranskription für bessere Lesbarkeit: lokal anhand der
+        Segmentgrenzen und Pausen oder mit einem leichtgewichtigen LLM
+        (FORMATTING_MODE=llm). Blockiert bis zur LLM-Antwort; die API nutzt
+        dafür den FormattingService.
         """
+        if settings.FORMATTING_MODE != "llm":
+            return format_segments(segments or [{"text": raw_text}])
+
         try:
             # Timeout hinzufügen
             response = self.client.chat.completions.create(
                 model=settings.LLM_MODEL_LIGHT,
                 messages=[
-                    {"role": "system", "content": """
-                        Formatiere den Text für bessere Lesbarkeit:
-                        1. Teile den Text in logische Absätze
-                        2. Füge Satzzeichen korrekt ein
-                        3. Markiere Sprecherwechsel wenn erkennbar
-                        4. Behalte den ursprünglichen Inhalt bei
-                        
-                        Wichtig:
-                        - Keine inhaltlichen Änderungen
-                        - Keine Interpretationen
-                        - Nur einfache Formatierung mit <p> Tags
-                    """},
+                    {"role": "system", "content": FORMATTING_PROMPT},
                     {"role": "user", "content": f"Hier ist die Rohtranskription:\n\n{raw_text}"}
                 ],
                 temperature=0.3,
@@ -83,37 +250,162 @@ class Transcriber(Singleton):
             # Bei Timeout oder anderen Fehlern den Originaltext zurückgeben
             return raw_text
 
+    def _prepare_audio(self, audio: Union[Path, str, PCMInput]) -> Union[str, np.ndarray]:
+        """
+        Bereitet die Eingabe für Whisper vor: Pfade werden durchgereicht,
+        PCM-Daten werden im Speicher zu float32 dekodiert (kein ffmpeg, keine Temp-Datei).
+        """
+        if isinstance(audio, (str, Path)):
+            return str(audio)
+        return pcm_to_float32(audio)
+
+    @staticmethod
+    def _resolve_language(language: Optional[str] = None) -> Optional[str]:
+        """
+        Sprache für die Dekodierung: explizit übergeben (z.B. aus der Sitzung
+        erkannt) oder WHISPER_LANGUAGE; None lässt Whisper selbst erkennen.
+        """
+        language = language or settings.WHISPER_LANGUAGE
+        return None if language == "auto" else language
+
+    def _decoding_options(self, profile: Optional[str] = None, language: Optional[str] = None) -> Dict[str, Any]:
+        """Dekodier-Optionen für die Engine gemäß Fidelity-Profil"""
+        options = get_profile_options(profile)
+        options["language"] = self._resolve_language(language)
+        options["no_speech_threshold"] = settings.WHISPER_NO_SPEECH_THRESHOLD
+        return options
+
+    def _voice_activity(self, pcm: np.ndarray) -> Optional[np.ndarray]:
+        """
+        VAD vor Whisper: schneidet Stille an den Rändern ab und gibt None zurück,
+        wenn der Chunk keine Sprache enthält und gar nicht dekodiert werden muss.
+        Die eingesparte Dekodierzeit wird aus den gemessenen Dekodierzeiten geschätzt.
+        """
+        if not settings.VAD_ENABLED or len(pcm) == 0:
+            return pcm
+
+        metrics.increment("vad.chunks")
+        bounds = self.audio_processor.speech_bounds(pcm)
+        if bounds is None:
+            metrics.increment("vad.chunks_skipped")
+            metrics.increment("vad.skipped_seconds", duration_seconds(pcm))
+            metrics.increment("vad.decode_seconds_saved", self._decode_call_seconds)
+            return None
+
+        start, end = bounds
+        trimmed = duration_seconds(pcm) - duration_seconds(pcm[start:end])
+        if trimmed > 0:
+            metrics.increment("vad.trimmed_seconds", trimmed)
+            metrics.increment("vad.decode_seconds_saved", trimmed * self._decode_rate)
+        return pcm[start:end]
+
+    def _record_decode(self, elapsed: float, audio_seconds: float, calls: int = 1):
+        """Aktualisiert die gleitenden Mittel der Dekodierzeit"""
+        per_call = elapsed / max(calls, 1)
+        self._decode_call_seconds += DECODE_EMA_ALPHA * (per_call - self._decode_call_seconds)
+        if audio_seconds > 0:
+            rate = elapsed / audio_seconds
+            self._decode_rate += DECODE_EMA_ALPHA * (rate - self._decode_rate)
+
+    @staticmethod
+    def _drop_no_speech(result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Verwirft Segmente, die Whisper selbst als "keine Sprache" einstuft
+        (no_speech_prob über WHISPER_NO_SPEECH_THRESHOLD bei niedriger avg_logprob).
+        """
+        segments = result.get("segments") or []
+        kept = [
+            seg for seg in segments
+            if not (
+                seg.get("no_speech_prob", 0.0) > settings.WHISPER_NO_SPEECH_THRESHOLD
+                and seg.get("avg_logprob", 0.0) < NO_SPEECH_LOGPROB_THRESHOLD
+            )
+        ]
+        if len(kept) == len(segments):
+            return result
+
+        metrics.increment("no_speech.discarded_segments", len(segments) - len(kept))
+        text = "".join(seg.get("text", "") for seg in kept)
+        return {**result, "text": text, "segments": kept}
+
+    @staticmethod
+    def _empty_result() -> Dict[str, Any]:
+        return {"text": "", "segments": []}
+
+    @staticmethod
+    def _segments(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Zeitstempel und Text der Segmente für die Formatierung (Absätze an Pausen)"""
+        return [
+            {"start": float(seg.get("start", 0.0)), "end": float(seg.get("end", 0.0)), "text": seg.get("text", "")}
+            for seg in result.get("segments") or []
+        ]
+
+    def _run_whisper(
+        self,
+        audio: Union[Path, str, PCMInput],
+        previous_text: Optional[str] = None,
+        profile: Optional[str] = None,
+        draft: bool = False,
+        language: Optional[str] = None,
+        model_size: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Führt die eigentliche Transkription mit der aktiven Engine durch"""
+        audio_input = self._prepare_audio(audio)
+        audio_seconds = 0.0
+        if isinstance(audio_input, np.ndarray):
+            audio_input = self._voice_activity(audio_input)
+            if audio_input is None:
+                return self._empty_result()
+            audio_seconds = duration_seconds(audio_input)
+
+        options = self._decoding_options(profile, language)
+        with self._acquire_engine(draft, model_size) as engine:
+            start = time.perf_counter()
+            result = engine.transcribe(audio_input, previous_text, options)
+            self._record_decode(time.perf_counter() - start, audio_seconds)
+        return self._drop_no_speech(result)
+
+    @staticmethod
+    def _confidence(result: Dict[str, Any]) -> float:
+        """Durchschnittliche Log-Wahrscheinlichkeit über alle Segmente"""
+        confidence = 0.0
+        if "segments" in result and result["segments"]:
+            confidences = [seg.get("avg_logprob", 0.0) for seg in result["segments"]]
+            confidence = np.mean(confidences) if confidences else 0.0
+        return confidence
+
     def transcribe_audio(
         self, 
-        audio_path: Path, 
-        previous_text: Optional[str] = None
+        audio: Union[Path, PCMInput], 
+        previous_text: Optional[str] = None,
+        profile: Optional[str] = None,
+        language: Optional[str] = None,
+        model_size: Optional[str] = None
     ) -> Tuple[str, float]:
         """
-        Transkribiert eine Audiodatei und formatiert den Text für den Quill-Editor.
+        Transkribiert eine Audiodatei oder PCM-Daten und formatiert den Text für den Quill-Editor.
+
+        Args:
+            audio: Pfad zur Audiodatei, WAV-/s16le-Bytes oder float32-Array (16 kHz Mono)
+            previous_text: Optionaler Kontext für Whisper (initial_prompt)
+            profile: Fidelity-Profil (live, balanced, archival); Standard aus der Konfiguration
+            language: Sprachcode (z.B. aus SessionLanguageCache); Standard aus WHISPER_LANGUAGE
+            model_size: Stufe der Lastleiter (MODEL_LADDER); None = Hauptmodell
         """
         try:
-            # Transkription mit Whisper durchführen
-            # FP16 für GPU-Beschleunigung nutzen
-            result = self.model.transcribe(
-                str(audio_path),
-                language="de",
-                initial_prompt=previous_text,
-                word_timestamps=True,
-                fp16=(self.device == "cuda")  # FP16 nur auf GPU
-            )
+            result = self._run_whisper(audio, previous_text, profile, language=language, model_size=model_size)
             
             # Rohen Text aus dem Result extrahieren
             raw_text = result["text"].strip()
             
-            # Text nachbearbeiten
-            processed_text = self.post_process_transcription(raw_text)
+            # Text nachbearbeiten (entfällt, wenn keine Sprache erkannt wurde)
+            processed_text = (
+                self.post_process_transcription(raw_text, result.get("segments"))
+                if raw_text else raw_text
+            )
             
             # Konfidenz aus Segmenten berechnen (falls vorhanden)
-            confidence = 0.0
-            if "segments" in result and result["segments"]:
-                # Durchschnittliche Log-Wahrscheinlichkeit über alle Segmente
-                confidences = [seg.get("avg_logprob", 0.0) for seg in result["segments"]]
-                confidence = np.mean(confidences) if confidences else 0.0
+            confidence = self._confidence(result)
             
             logger.info(f"Transkription erfolgreich: {len(processed_text)} Zeichen")
             return processed_text, confidence
@@ -122,39 +414,126 @@ class Transcriber(Singleton):
             logger.error(f"Fehler bei der Transkription: {str(e)}")
             raise
 
+    def transcribe_batch(
+        self,
+        audio_chunks: List[PCMInput],
+        previous_texts: Optional[List[Optional[str]]] = None,
+        post_process: bool = True,
+        profile: Optional[str] = None,
+        language: Optional[str] = None,
+        model_size: Optional[str] = None,
+        with_segments: bool = False
+    ) -> List[tuple]:
+        """
+        Transkribiert mehrere kurze Chunks (<= 30 s) gemeinsam, sofern die
+        Engine Batches unterstützt (Whisper: ein Encoder- und Greedy-Decoder-
+        Durchlauf pro gemeinsamem Prompt). Längere Chunks werden einzeln verarbeitet.
+        Mit with_segments enthält jedes Ergebnis zusätzlich die Segmente.
+        """
+        if previous_texts is None:
+            previous_texts = [None] * len(audio_chunks)
+
+        try:
+            pcm_chunks = [self._voice_activity(pcm_to_float32(chunk)) for chunk in audio_chunks]
+            # Chunks ohne Sprache werden nicht an die Engine übergeben
+            active = [index for index, pcm in enumerate(pcm_chunks) if pcm is not None]
+            raw_results = [self._empty_result() for _ in pcm_chunks]
+            if active:
+                options = self._decoding_options(profile, language)
+                with self._acquire_engine(model_size=model_size) as engine:
+                    start = time.perf_counter()
+                    decoded = engine.transcribe_batch(
+                        [pcm_chunks[index] for index in active],
+                        [previous_texts[index] for index in active],
+                        options
+                    )
+                    self._record_decode(
+                        time.perf_counter() - start,
+                        sum(duration_seconds(pcm_chunks[index]) for index in active),
+                        calls=len(active)
+                    )
+                for index, result in zip(active, decoded):
+                    raw_results[index] = self._drop_no_speech(result)
+
+            results = []
+            for result in raw_results:
+                text = result["text"].strip()
+                if post_process and text:
+                    text = self.post_process_transcription(text, result.get("segments"))
+                if with_segments:
+                    results.append((text, self._confidence(result), self._segments(result)))
+                else:
+                    results.append((text, self._confidence(result)))
+
+            logger.info(f"Batch-Transkription erfolgreich: {len(pcm_chunks)} Chunks")
+            return results
+
+        except Exception as e:
+            logger.error(f"Fehler bei der Batch-Transkription: {str(e)}")
+            raise
+
     def transcribe_chunk(
         self, 
-        audio_chunk: bytes, 
-        previous_text: Optional[str] = None
-    ) -> Tuple[str, float]:
+        audio_chunk: PCMInput, 
+        previous_text: Optional[str] = None,
+        profile: Optional[str] = None,
+        language: Optional[str] = None,
+        model_size: Optional[str] = None,
+        with_segments: bool = False
+    ) -> tuple:
         """
         Für Chunks keine Nachbearbeitung, da der Text noch unvollständig ist.
+        Der Chunk wird im Speicher dekodiert und direkt an Whisper übergeben.
+        Mit with_segments werden zusätzlich die Segmente für die spätere
+        Formatierung zurückgegeben: (Text, Konfidenz, Segmente).
         """
         try:
-            temp_path = Path("temp") / f"chunk_{id(audio_chunk)}.wav"
-            with open(temp_path, "wb") as f:
-                f.write(audio_chunk)
-            
-            result = self.model.transcribe(
-                str(temp_path),
-                language="de",
-                initial_prompt=previous_text,
-                word_timestamps=True,
-                fp16=(self.device == "cuda")
-            )
+            result = self._run_whisper(audio_chunk, previous_text, profile, language=language, model_size=model_size)
             
             # Für Chunks einfache Formatierung
             text = result["text"].strip()
             
-            # Konfidenz aus Segmenten
-            confidence = 0.0
-            if "segments" in result and result["segments"]:
-                confidences = [seg.get("avg_logprob", 0.0) for seg in result["segments"]]
-                confidence = np.mean(confidences) if confidences else 0.0
-            
-            temp_path.unlink()
-            return text, confidence
+            if with_segments:
+                return text, self._confidence(result), self._segments(result)
+            return text, self._confidence(result)
             
         except Exception as e:
             logger.error(f"Fehler bei der Chunk-Transkription: {str(e)}")
             raise
+
+    def transcribe_draft(
+        self,
+        audio_chunk: PCMInput,
+        previous_text: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> Tuple[str, float]:
+        """
+        Schneller Entwurf für Live-Slices: Entwurfsmodell (WHISPER_DRAFT_MODEL)
+        mit dem Profil "live". Der Text wird später durch den finalen Durchlauf
+        mit dem Hauptmodell ersetzt.
+        """
+        try:
+            result = self._run_whisper(audio_chunk, previous_text, DRAFT_PROFILE, draft=True, language=language)
+            return result["text"].strip(), self._confidence(result)
+            
+        except Exception as e:
+            logger.error(f"Fehler bei der Entwurfs-Transkription: {str(e)}")
+            raise
+
+    def detect_language(self, audio: PCMInput) -> Tuple[str, float]:
+        """
+        Erkennt die Sprache eines Sprachabschnitts mit dem Hauptmodell
+        (ein Encoder-Durchlauf, ohne Dekodierung des Texts).
+
+        Returns:
+            (Sprachcode, Wahrscheinlichkeit)
+        """
+        try:
+            with self._acquire_engine() as engine:
+                language, probability = engine.detect_language(pcm_to_float32(audio))
+            logger.info(f"Sprache erkannt: {language} ({probability:.2f})")
+            return language, probability
+
+        except Exception as e:
+            logger.error(f"Fehler bei der Spracherkennung: {str(e)}")
+            raise
@@ -0,0 +1,87 @@
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Callable, Optional
+
+from config import settings
+from utils.exceptions import ServiceOverloadedError
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class BoundedExecutor:
+    """
+    Thread-Pool fester Größe für blockierende Verarbeitungsschritte
+    (ffmpeg, Dateizugriffe, Dekodierung, Hashing) mit Zugangskontrolle.
+
+    admit() lässt höchstens max_pending Aufträge gleichzeitig zu; was über
+    die Worker hinausgeht, wartet in der Warteschlange. Ist auch diese voll,
+    wird mit ServiceOverloadedError (HTTP 503 mit Retry-After) abgelehnt,
+    statt den Event-Loop oder den Speicher mit Rückstau zu belasten.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        retry_after: Optional[int] = None
+    ):
+        self.name = name
+        self.max_workers = max(1, max_workers or settings.UPLOAD_EXECUTOR_WORKERS)
+        self.max_pending = max(self.max_workers, max_pending or settings.UPLOAD_MAX_PENDING)
+        self.retry_after = settings.UPLOAD_RETRY_AFTER_S if retry_after is None else retry_after
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._pending = 0
+        # Gleitender Mittelwert der Auftragsdauer für die Retry-After-Schätzung
+        self._avg_seconds: Optional[float] = None
+
+    @property
+    def pending(self) -> int:
+        """Anzahl zugelassener, noch nicht abgeschlossener Aufträge"""
+        return self._pending
+
+    def _estimate_retry_after(self) -> int:
+        """Schätzt, wann wieder ein Platz frei wird (mindestens retry_after Sekunden)"""
+        if self._avg_seconds is None:
+            return self.retry_after
+        waves = self._pending / self.max_workers
+        return max(self.retry_after, math.ceil(self._avg_seconds * waves))
+
+    @asynccontextmanager
+    async def admit(self):
+        """Reserviert einen Platz für einen Auftrag oder lehnt ihn ab"""
+        if self._pending >= self.max_pending:
+            metrics.increment(f"executor.{self.name}.rejected")
+            retry_after = self._estimate_retry_after()
+            logger.warning(f"Executor '{self.name}' ausgelastet ({self._pending} Aufträge), Retry-After {retry_after} s")
+            raise ServiceOverloadedError(
+                f"Server ausgelastet, bitte in {retry_after} Sekunden erneut versuchen",
+                retry_after=retry_after
+            )
+
+        self._pending += 1
+        metrics.set_gauge(f"executor.{self.name}.pending", self._pending)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self._pending -= 1
+            metrics.set_gauge(f"executor.{self.name}.pending", self._pending)
+            seconds = time.perf_counter() - start
+            self._avg_seconds = seconds if self._avg_seconds is None else 0.8 * self._avg_seconds + 0.2 * seconds
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Führt einen blockierenden Aufruf auf dem Pool aus"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    def shutdown(self):
+        """Beendet den Pool; laufende Aufrufe werden noch abgeschlossen"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
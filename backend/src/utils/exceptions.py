@@ -25,12 +25,25 @@ class TemplateError(VoiceToDocException):
         self.original_error = original_error
         super().__init__(self.message)
 
+class ServiceOverloadedError(VoiceToDocException):
+    """Verarbeitungskapazität erschöpft; der Client soll es später erneut versuchen"""
+    def __init__(self, message: str, retry_after: int = 5):
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+class ModelNotReadyError(ServiceOverloadedError):
+    """Die Whisper-Modelle werden noch geladen"""
+    pass
+
 def handle_voice_to_doc_exception(exc: VoiceToDocException) -> HTTPException:
     """Konvertiert anwendungsspezifische Ausnahmen in HTTPException"""
     error_mappings = {
         AudioProcessingError: 400,
         TranscriptionError: 500,
-        TemplateError: 400
+        TemplateError: 400,
+        ServiceOverloadedError: 503,
+        ModelNotReadyError: 503
     }
     
     status_code = error_mappings.get(type(exc), 500)
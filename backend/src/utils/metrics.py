@@ -0,0 +1,67 @@
+import threading
+from typing import Dict, Any
+
+
+class MetricsRegistry:
+    """
+    Einfache, thread-sichere Sammlung von Zählern, Messwerten und
+    Verteilungen (Anzahl, Summe, Minimum, Maximum) für GET /metrics.
+
+    Gilt pro Prozess; Worker-Prozesse führen eigene Registries.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._observations: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1):
+        """Erhöht einen Zähler"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        """Setzt einen Momentanwert"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float):
+        """Erfasst einen Messwert (z.B. eine Latenz in Sekunden)"""
+        with self._lock:
+            stats = self._observations.get(name)
+            if stats is None:
+                self._observations[name] = {"count": 1, "sum": value, "min": value, "max": value}
+            else:
+                stats["count"] += 1
+                stats["sum"] += value
+                stats["min"] = min(stats["min"], value)
+                stats["max"] = max(stats["max"], value)
+
+    def get_counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Gibt eine Kopie aller Metriken zurück"""
+        with self._lock:
+            observations = {
+                name: {**stats, "avg": stats["sum"] / stats["count"]}
+                for name, stats in self._observations.items()
+            }
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "observations": observations
+            }
+
+    def reset(self):
+        """Setzt alle Metriken zurück"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._observations.clear()
+
+
+# Prozessweite Registry
+metrics = MetricsRegistry()
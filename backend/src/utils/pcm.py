@@ -0,0 +1,169 @@
+import io
+import wave
+from typing import NamedTuple, Union
+
+import numpy as np
+
+from utils.exceptions import AudioProcessingError
+
+# Whisper erwartet 16 kHz Mono-Audio als float32 im Bereich [-1, 1]
+SAMPLE_RATE = 16000
+
+PCMInput = Union[bytes, bytearray, memoryview, np.ndarray]
+
+
+def _int_to_float32(samples: np.ndarray) -> np.ndarray:
+    """Skaliert Integer-Samples auf float32 im Bereich [-1, 1]"""
+    if samples.dtype == np.uint8:
+        return (samples.astype(np.float32) - 128.0) / 128.0
+    scale = float(np.iinfo(samples.dtype).max) + 1.0
+    return samples.astype(np.float32) / scale
+
+
+def _resample(samples: np.ndarray, source_rate: int) -> np.ndarray:
+    """Einfaches lineares Resampling auf SAMPLE_RATE"""
+    if source_rate == SAMPLE_RATE or samples.size == 0:
+        return samples
+    target_length = int(round(samples.size * SAMPLE_RATE / source_rate))
+    source_positions = np.arange(samples.size, dtype=np.float64)
+    target_positions = np.linspace(0, samples.size - 1, target_length)
+    return np.interp(target_positions, source_positions, samples).astype(np.float32)
+
+
+class WavSamples(NamedTuple):
+    """Unveränderte Integer-Samples einer WAV-Datei (Kanäle verschränkt)"""
+    samples: np.ndarray
+    sample_rate: int
+    channels: int
+    sample_width: int
+
+
+def read_wav_samples(data: bytes) -> WavSamples:
+    """
+    Liest WAV-Bytes ohne Umrechnung als Integer-Samples (Sicht auf die
+    Frame-Daten). 8-bit-Samples werden wie bei pydub vorzeichenbehaftet.
+    """
+    dtypes = {1: np.uint8, 2: np.int16, 4: np.int32}
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        sample_width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        sample_rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+
+    if sample_width not in dtypes:
+        raise AudioProcessingError(f"Nicht unterstützte WAV-Samplebreite: {sample_width} Bytes")
+
+    samples = np.frombuffer(frames, dtype=np.dtype(dtypes[sample_width]).newbyteorder("<"))
+    if sample_width == 1:
+        samples = (samples.astype(np.int16) - 128).astype(np.int8)
+    return WavSamples(samples, sample_rate, channels, sample_width)
+
+
+def _decode_wav(data: bytes) -> np.ndarray:
+    """Dekodiert WAV-Bytes im Speicher zu 16 kHz Mono float32"""
+    wav = read_wav_samples(data)
+    samples = _int_to_float32(wav.samples)
+    if wav.channels > 1:
+        samples = samples[: samples.size - samples.size % wav.channels]
+        samples = samples.reshape(-1, wav.channels).mean(axis=1)
+    return _resample(samples, wav.sample_rate)
+
+
+def pcm_to_float32(audio: PCMInput) -> np.ndarray:
+    """
+    Wandelt PCM-Audio in das von Whisper erwartete float32-Array um.
+
+    Akzeptiert:
+        - float32-Arrays (16 kHz Mono), die unverändert durchgereicht werden
+        - Integer-Arrays, die auf [-1, 1] skaliert werden
+        - WAV-Bytes (RIFF-Header), die im Speicher dekodiert werden
+        - rohe Bytes, die als 16 kHz Mono s16le interpretiert werden
+    """
+    try:
+        if isinstance(audio, np.ndarray):
+            if audio.dtype == np.float32:
+                return audio
+            if np.issubdtype(audio.dtype, np.integer):
+                return _int_to_float32(audio)
+            return audio.astype(np.float32)
+
+        data = bytes(audio) if not isinstance(audio, bytes) else audio
+        if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+            return _decode_wav(data)
+
+        usable = len(data) - len(data) % 2
+        return _int_to_float32(np.frombuffer(data[:usable], dtype=np.int16))
+
+    except AudioProcessingError:
+        raise
+    except Exception as e:
+        raise AudioProcessingError(
+            "Fehler beim Dekodieren der PCM-Daten",
+            original_error=e
+        )
+
+
+def duration_seconds(audio: np.ndarray) -> float:
+    """Gibt die Dauer eines 16-kHz-PCM-Arrays in Sekunden zurück"""
+    return audio.shape[0] / SAMPLE_RATE
+
+
+def pcm_duration(audio: PCMInput) -> float:
+    """
+    Dauer beliebiger PCM-Eingaben (siehe pcm_to_float32) in Sekunden, ohne
+    das Audio zu dekodieren: bei WAV aus dem Header, sonst aus der Sampleanzahl.
+    """
+    if isinstance(audio, np.ndarray):
+        return duration_seconds(audio)
+
+    if bytes(audio[:4]) == b"RIFF" and bytes(audio[8:12]) == b"WAVE":
+        with wave.open(io.BytesIO(audio), "rb") as wav:
+            return wav.getnframes() / wav.getframerate()
+    return (len(audio) // 2) / SAMPLE_RATE
+
+
+def float32_to_int16(audio: np.ndarray) -> np.ndarray:
+    """Quantisiert float32-Audio auf 16-bit-Samples (little-endian)"""
+    samples = np.clip(audio, -1.0, 1.0 - 1.0 / 32768.0)
+    return (samples * 32768.0).astype("<i2")
+
+
+def samples_to_wav(
+    samples: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    channels: int = 1,
+    sample_width: int = 2
+) -> bytes:
+    """Kodiert Integer-Samples als WAV (Gegenstück zu read_wav_samples)"""
+    if sample_width == 1:
+        samples = (samples.astype(np.int16) + 128).astype(np.uint8)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(sample_rate)
+        wav.writeframes(np.ascontiguousarray(samples).tobytes())
+    return buffer.getvalue()
+
+
+def float32_to_wav(audio: np.ndarray) -> bytes:
+    """Kodiert 16-kHz-float32-Audio als 16-bit Mono-WAV (Gegenstück zu pcm_to_float32)"""
+    return samples_to_wav(float32_to_int16(audio))
+
+
+def synthetic_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """
+    Erzeugt ein sprachähnliches Testsignal: Harmonische mit Silbenrhythmus
+    und eingestreuten Pausen. Für Geschwindigkeitsmessungen ohne Referenz-Clip
+    (Benchmarks, Thread-Auto-Tuning).
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    syllables = 0.5 * (1 + np.sin(2 * np.pi * 4 * t))
+    # Alle ~3 Sekunden eine Pause von ~0,8 Sekunden
+    pauses = (t % 3.0) < 2.2
+    noise = 0.01 * rng.standard_normal(t.size)
+    return (0.3 * voice * syllables * pauses + noise).astype(np.float32)
@@ -0,0 +1,58 @@
+import math
+import os
+from pathlib import Path
+from typing import Optional
+
+from config import settings
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def available_cores() -> int:
+    """
+    Für diesen Prozess nutzbare CPU-Kerne: CPU-Affinität und,
+    falls gesetzt, das CPU-Limit der cgroup (z.B. docker --cpus).
+    """
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+
+    try:
+        quota, period = CGROUP_CPU_MAX.read_text().split()
+        if quota != "max":
+            cores = min(cores, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cores
+
+
+def thread_budget(workers: int, cores: Optional[int] = None) -> int:
+    """
+    Intra-op-Threads pro Whisper-Worker: TORCH_THREADS_PER_WORKER, sonst
+    die verfügbaren Kerne gleichmäßig auf die Worker verteilt.
+    """
+    if settings.TORCH_THREADS_PER_WORKER > 0:
+        return settings.TORCH_THREADS_PER_WORKER
+    cores = cores or available_cores()
+    return max(1, cores // max(1, workers))
+
+
+def apply_thread_budget(threads: int, interop_threads: Optional[int] = None):
+    """Setzt die torch-Threadzahlen des aktuellen Prozesses"""
+    import torch
+
+    torch.set_num_threads(threads)
+    interop_threads = settings.TORCH_INTEROP_THREADS if interop_threads is None else interop_threads
+    if interop_threads > 0:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            # Nur vor der ersten parallelen torch-Operation im Prozess möglich
+            logger.debug("Inter-op-Threads bereits festgelegt")
+    metrics.set_gauge("transcription.threads.intra", threads)
+    logger.info(f"torch-Threads: {threads} intra-op, {interop_threads or 'Standard'} inter-op")
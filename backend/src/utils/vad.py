@@ -0,0 +1,109 @@
+from typing import List, Tuple
+
+import numpy as np
+
+# Samples pro Block beim Aufsummieren der Energie (begrenzt den Speicherbedarf
+# langer Aufnahmen auf wenige MB statt eines int64-Arrays über die ganze Datei)
+ENERGY_BLOCK_SAMPLES = 1 << 20
+
+
+def runs(mask: np.ndarray) -> np.ndarray:
+    """
+    Zusammenhängende True-Bereiche einer Maske als (n, 2)-Array mit
+    [start, end) je Bereich, vektorisiert über die Flanken (np.diff).
+    """
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.column_stack((np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+
+def _cumulative_energy(samples: np.ndarray, positions: np.ndarray, exact: bool) -> np.ndarray:
+    """
+    Quadratsumme der Samples vor jeder (aufsteigend sortierten) Position.
+
+    Die kumulative Summe wird blockweise gebildet; für bis zu 16-bit-Samples
+    in int64 und damit exakt, sonst in float64 (wie audioop).
+    """
+    dtype = np.int64 if exact else np.float64
+    energy = np.zeros(len(positions), dtype=dtype)
+    total = dtype(0)
+    for block_start in range(0, len(samples), ENERGY_BLOCK_SAMPLES):
+        block = samples[block_start:block_start + ENERGY_BLOCK_SAMPLES].astype(dtype)
+        cumulative = np.cumsum(block * block)
+        cumulative += total
+        block_end = block_start + len(block)
+        lo, hi = np.searchsorted(positions, [block_start, block_end], side="right")
+        energy[lo:hi] = cumulative[positions[lo:hi] - block_start - 1]
+        total = cumulative[-1]
+    return energy
+
+
+def detect_nonsilent(
+    samples: np.ndarray,
+    sample_rate: int,
+    min_silence_len: int,
+    silence_thresh: float,
+    channels: int = 1,
+    sample_width: int = 2
+) -> List[Tuple[int, int]]:
+    """
+    Vektorisierte Entsprechung von pydub.silence.detect_nonsilent (seek_step=1).
+
+    Wie pydub wird für jede Millisekunde i geprüft, ob das Fenster
+    [i, i + min_silence_len) einen RMS-Pegel (ganzzahlig, wie audioop.rms)
+    unter silence_thresh (dBFS) hat. Statt jedes Fenster einzeln zu
+    berechnen, werden die Fenstersummen aus der kumulativen Energie an den
+    Millisekunden-Grenzen gebildet; Stillebereiche entstehen über np.diff.
+
+    Args:
+        samples: Integer-Samples (bei mehreren Kanälen verschränkt)
+        sample_rate: Abtastrate in Hz
+        min_silence_len: Mindestlänge einer Pause in ms
+        silence_thresh: Stilleschwelle in dBFS
+        channels: Anzahl Kanäle
+        sample_width: Samplebreite in Bytes (für den Vollausschlag)
+
+    Returns:
+        Sprachbereiche (start_ms, end_ms), identisch zu pydub
+    """
+    frame_count = len(samples) // channels
+    seg_len = round(1000 * (frame_count / sample_rate))
+    if seg_len < min_silence_len:
+        return [(0, seg_len)]
+
+    threshold = 10 ** (silence_thresh / 20) * (2 ** (sample_width * 8) / 2)
+
+    # Frame-Grenzen jeder Millisekunde wie AudioSegment.__getitem__; fehlende
+    # Frames am Ende füllt pydub mit Stille auf (zählen nur in der Länge mit)
+    bounds = (np.arange(seg_len + 1) * (sample_rate / 1000.0)).astype(np.int64)
+    energy = _cumulative_energy(
+        samples[:frame_count * channels],
+        np.minimum(bounds, frame_count) * channels,
+        exact=sample_width <= 2
+    )
+
+    window_energy = energy[min_silence_len:] - energy[:-min_silence_len]
+    window_samples = (bounds[min_silence_len:] - bounds[:-min_silence_len]) * channels
+    mean_square = np.divide(
+        window_energy, window_samples,
+        out=np.zeros(len(window_samples)), where=window_samples > 0
+    )
+    silence_starts = np.flatnonzero(np.floor(np.sqrt(mean_square)) <= threshold)
+    if len(silence_starts) == 0:
+        return [(0, seg_len)]
+
+    # Überlappende Stillefenster zu Bereichen zusammenfassen
+    gaps = np.flatnonzero(np.diff(silence_starts) > min_silence_len)
+    silent_starts = silence_starts[np.concatenate(([0], gaps + 1))]
+    silent_ends = silence_starts[np.concatenate((gaps, [len(silence_starts) - 1]))] + min_silence_len
+
+    if silent_starts[0] == 0 and silent_ends[0] == seg_len:
+        return []
+
+    starts = np.concatenate(([0], silent_ends))
+    ends = np.concatenate((silent_starts, [seg_len]))
+    if silent_ends[-1] == seg_len:
+        starts, ends = starts[:-1], ends[:-1]
+    nonsilent = [(int(start), int(end)) for start, end in zip(starts, ends)]
+    if nonsilent and nonsilent[0] == (0, 0):
+        nonsilent.pop(0)
+    return nonsilent
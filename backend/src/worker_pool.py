@@ -0,0 +1,506 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from config import settings
+from utils.logger import get_logger, configure_logging, log_function_call
+from utils.pcm import PCMInput, synthetic_speech, duration_seconds
+from utils.metrics import metrics
+from utils.thread_budget import available_cores, thread_budget, apply_thread_budget
+from engines.fidelity import resolve_profile
+
+if TYPE_CHECKING:
+    from transcriber import Transcriber
+
+logger = get_logger(__name__)
+
+# Transcriber-Instanz des jeweiligen Worker-Prozesses
+_worker_transcriber: Optional["Transcriber"] = None
+
+
+def _settings_snapshot() -> Dict[str, Any]:
+    """Aktuelle Einstellungen des API-Prozesses zur Übergabe an neue Worker"""
+    return settings.model_dump()
+
+
+def _apply_settings(values: Optional[Dict[str, Any]] = None):
+    """
+    Übernimmt die Einstellungen des API-Prozesses. Per spawn gestartete
+    Worker importieren config neu und sähen sonst nur die Standardwerte
+    statt der über PUT /config geänderten Konfiguration.
+    """
+    if values is None:
+        settings.load_from_file()
+        return
+    for key, value in values.items():
+        setattr(settings, key, value)
+
+
+def _init_worker(threads: int = 0, values: Optional[Dict[str, Any]] = None):
+    """Initialisiert einen Worker-Prozess mit eigenem Whisper-Modell und Thread-Budget"""
+    global _worker_transcriber
+    _apply_settings(values)
+    configure_logging(level=settings.log_level)
+    if threads:
+        apply_thread_budget(threads)
+    # torch/whisper erst im Worker importieren
+    from transcriber import Transcriber
+    _worker_transcriber = Transcriber()
+    if settings.WHISPER_WARMUP:
+        _worker_transcriber.warm_up()
+    logger.info(f"Whisper-Worker-Prozess {os.getpid()} bereit")
+
+
+def _worker_ping() -> Tuple[int, Optional[str]]:
+    """Dient zum Vorwärmen: kehrt erst zurück, wenn das Modell geladen ist"""
+    return os.getpid(), _worker_transcriber.model_size
+
+
+def _worker_benchmark(audio: PCMInput) -> float:
+    """Misst die Dauer einer Transkription im Worker-Prozess (Auto-Tuning)"""
+    start = time.perf_counter()
+    _worker_transcriber.transcribe_chunk(audio)
+    return time.perf_counter() - start
+
+
+def _worker_transcribe(
+    audio: Union[Path, PCMInput],
+    previous_text: Optional[str],
+    post_process: bool,
+    profile: Optional[str] = None,
+    language: Optional[str] = None,
+    model_size: Optional[str] = None,
+    with_segments: bool = False
+) -> tuple:
+    """Führt eine Transkription im Worker-Prozess durch"""
+    if post_process:
+        return _worker_transcriber.transcribe_audio(audio, previous_text, profile, language, model_size)
+    return _worker_transcriber.transcribe_chunk(audio, previous_text, profile, language, model_size, with_segments)
+
+
+def _worker_transcribe_draft(
+    audio: PCMInput,
+    previous_text: Optional[str],
+    language: Optional[str] = None
+) -> Tuple[str, float]:
+    """Führt eine Entwurfs-Transkription im Worker-Prozess durch"""
+    return _worker_transcriber.transcribe_draft(audio, previous_text, language)
+
+
+def _worker_detect_language(audio: PCMInput) -> Tuple[str, float]:
+    """Führt eine Spracherkennung im Worker-Prozess durch"""
+    return _worker_transcriber.detect_language(audio)
+
+
+def _worker_transcribe_batch(
+    audio_chunks: List[PCMInput],
+    previous_texts: List[Optional[str]],
+    post_process: bool,
+    profile: Optional[str] = None,
+    language: Optional[str] = None,
+    model_size: Optional[str] = None,
+    with_segments: bool = False
+) -> List[tuple]:
+    """Führt eine Batch-Transkription im Worker-Prozess durch"""
+    return _worker_transcriber.transcribe_batch(
+        audio_chunks, previous_texts, post_process, profile, language, model_size, with_segments
+    )
+
+
+@dataclass
+class ModelReloadStatus:
+    """Status des letzten (oder laufenden) Modell-Neuladens"""
+    state: str = "idle"  # idle, loading, draining, ready, failed
+    model: Optional[str] = None
+    progress: float = 0.0  # 0.0 - 1.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class TranscriptionWorkerPool:
+    """
+    Verteilt Transkriptionen auf einen Pool von Worker-Prozessen,
+    die jeweils ein eigenes Whisper-Modell besitzen.
+
+    Mit processes=0 läuft die Transkription im API-Prozess auf einem
+    einzelnen Thread (ein Modell, serialisiert), aber nicht auf dem Event-Loop.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        transcriber: Optional["Transcriber"] = None
+    ):
+        self.processes = settings.TRANSCRIPTION_PROCESSES if processes is None else processes
+        if self.processes < 0:
+            raise ValueError("Anzahl der Worker-Prozesse darf nicht negativ sein")
+
+        self.transcriber = transcriber
+        # torch-Threads pro Worker; wird beim Start festgelegt (ggf. per Auto-Tuning)
+        self.threads: Optional[int] = None
+        self._executor: Optional[Executor] = None
+        self._start_task: Optional[asyncio.Task] = None
+        self.reload_status = ModelReloadStatus()
+        self._reload_task: Optional[asyncio.Task] = None
+        self._reload_pending = False
+
+    @property
+    def size(self) -> int:
+        """Anzahl gleichzeitig möglicher Transkriptionen"""
+        return max(1, self.processes)
+
+    @property
+    def in_process(self) -> bool:
+        """True, wenn das Modell im API-Prozess liegt"""
+        return self.processes == 0
+
+    @property
+    def ready(self) -> bool:
+        """True, sobald alle Modelle geladen und aufgewärmt sind"""
+        return self._executor is not None
+
+    def _create_executor(self, processes: Optional[int] = None, threads: Optional[int] = None) -> Executor:
+        """
+        Erstellt den Executor; die Kerne werden auf die Worker aufgeteilt,
+        damit mehrere Modelle sich nicht gegenseitig die Kerne überbuchen.
+        """
+        processes = self.processes if processes is None else processes
+        threads = threads or self.threads or thread_budget(max(1, processes))
+
+        if processes == 0:
+            return ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+
+        return ProcessPoolExecutor(
+            max_workers=processes,
+            # spawn statt fork: CUDA/torch-Zustand darf nicht geerbt werden
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            # Momentaufnahme beim Erstellen: ein Neuladen erhält so die neue Konfiguration
+            initargs=(threads, _settings_snapshot())
+        )
+
+    @log_function_call
+    async def start(self):
+        """
+        Startet den Pool und wartet, bis alle Modelle geladen und aufgewärmt sind.
+        Das Laden blockiert den Event-Loop nicht; bis dahin ist ready False.
+        Gleichzeitige Aufrufe warten auf denselben Start.
+        """
+        if self._start_task is None:
+            self._start_task = asyncio.create_task(self._start())
+        await asyncio.shield(self._start_task)
+
+    async def _start(self):
+        started = time.perf_counter()
+        if not self.in_process and settings.TRANSCRIPTION_AUTOTUNE:
+            executor = await self._autotune()
+        else:
+            self.threads = self.threads or thread_budget(self.size)
+            executor = self._create_executor()
+
+        try:
+            if not self.in_process:
+                workers = await self._warm_up(executor)
+                logger.info(
+                    f"{len(set(workers))} Whisper-Worker-Prozesse mit je {self.threads} torch-Threads gestartet"
+                )
+            else:
+                await asyncio.to_thread(self._load_in_process)
+                logger.info(f"Whisper-Transkription läuft im API-Prozess mit {self.threads} torch-Threads")
+        except Exception:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        self._executor = executor
+        metrics.set_gauge("startup.model_load_seconds", time.perf_counter() - started)
+
+    def _load_in_process(self):
+        """Lädt das Modell im API-Prozess: Thread-Budget, Transcriber und Warm-up"""
+        apply_thread_budget(self.threads)
+        if self.transcriber is None:
+            from transcriber import Transcriber
+            self.transcriber = Transcriber()
+        if settings.WHISPER_WARMUP:
+            self.transcriber.warm_up()
+
+    async def _autotune(self) -> Executor:
+        """
+        Misst Aufteilungen der Kerne auf 1, 2, 4 ... bis self.processes
+        Worker-Prozesse und behält den Executor mit dem besten Gesamt-RTF
+        (Wanduhrzeit / verarbeitete Audiodauer bei voller Auslastung).
+        """
+        cores = available_cores()
+        candidates = sorted(
+            {2 ** i for i in range(self.processes.bit_length()) if 2 ** i <= self.processes} | {self.processes}
+        )
+        audio = synthetic_speech(settings.TRANSCRIPTION_AUTOTUNE_SECONDS)
+        audio_seconds = duration_seconds(audio)
+        loop = asyncio.get_running_loop()
+
+        best = None
+        for processes in candidates:
+            threads = thread_budget(processes, cores)
+            executor = self._create_executor(processes, threads)
+            try:
+                await self._warm_up(executor, processes)
+                # Erster Durchlauf je Worker ohne Messung (Speicher, Kernel-Auswahl)
+                await asyncio.gather(*[
+                    loop.run_in_executor(executor, _worker_benchmark, audio[:audio.size // 4])
+                    for _ in range(processes)
+                ])
+                start = time.perf_counter()
+                await asyncio.gather(*[
+                    loop.run_in_executor(executor, _worker_benchmark, audio) for _ in range(processes)
+                ])
+                rtf = (time.perf_counter() - start) / (processes * audio_seconds)
+            except Exception:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+            metrics.set_gauge(f"transcription.autotune.rtf.{processes}x{threads}", rtf)
+            logger.info(f"Auto-Tuning: {processes} Prozesse x {threads} Threads -> Gesamt-RTF {rtf:.3f}")
+            if best is None or rtf < best[0]:
+                if best is not None:
+                    best[3].shutdown(wait=False)
+                best = (rtf, processes, threads, executor)
+            else:
+                executor.shutdown(wait=False)
+
+        _, self.processes, self.threads, executor = best
+        metrics.set_gauge("transcription.processes", self.processes)
+        logger.info(f"Auto-Tuning gewählt: {self.processes} Prozesse x {self.threads} Threads")
+        return executor
+
+    async def _warm_up(self, executor: Executor, processes: Optional[int] = None) -> List[Tuple[int, Optional[str]]]:
+        """
+        Wartet, bis alle Worker-Prozesse eines Executors ihr Modell geladen
+        und aufgewärmt haben (siehe _init_worker).
+
+        Returns:
+            Liste von (PID, Modellgröße) je Worker
+        """
+        processes = processes or self.processes
+        loop = asyncio.get_running_loop()
+        futures = [loop.run_in_executor(executor, _worker_ping) for _ in range(processes)]
+        workers = []
+        for future in asyncio.as_completed(futures):
+            workers.append(await future)
+            self.reload_status.progress = len(workers) / len(futures)
+        return workers
+
+    @log_function_call
+    async def stop(self):
+        """Beendet den Pool und gibt die Modelle frei"""
+        if self.reloading:
+            self._reload_task.cancel()
+            await asyncio.gather(self._reload_task, return_exceptions=True)
+        if self._start_task is not None and not self._start_task.done():
+            self._start_task.cancel()
+            await asyncio.gather(self._start_task, return_exceptions=True)
+        self._start_task = None
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+            logger.info("Whisper-Worker-Pool gestoppt")
+
+    @property
+    def reloading(self) -> bool:
+        """True, solange ein Neuladen im Hintergrund läuft"""
+        return self._reload_task is not None and not self._reload_task.done()
+
+    def start_reload(self) -> ModelReloadStatus:
+        """
+        Startet das Neuladen der Modelle im Hintergrund und kehrt sofort zurück.
+        Läuft bereits ein Neuladen, wird danach erneut mit der aktuellen
+        Konfiguration geladen.
+        """
+        if self.reloading:
+            self._reload_pending = True
+        else:
+            self.reload_status = ModelReloadStatus(state="loading", started_at=time.time())
+            self._reload_task = asyncio.create_task(self._reload_loop())
+        return self.reload_status
+
+    async def _reload_loop(self):
+        while True:
+            self._reload_pending = False
+            try:
+                await self.reload()
+            except Exception:
+                # Fehler ist im reload_status festgehalten, das alte Modell bleibt aktiv
+                pass
+            if not self._reload_pending:
+                break
+
+    async def reload(self):
+        """
+        Lädt die Modelle mit der aktuellen Konfiguration neu, ohne den
+        Betrieb zu unterbrechen: Das neue Modell wird vollständig geladen,
+        dann atomar aktiviert; das alte wird erst nach Abarbeitung der
+        laufenden Transkriptionen freigegeben.
+        """
+        if self.reload_status.state != "loading":
+            self.reload_status = ModelReloadStatus(state="loading", started_at=time.time())
+        try:
+            if self.in_process:
+                # Eigener Thread: der Whisper-Thread transkribiert währenddessen weiter
+                await asyncio.to_thread(self.transcriber.reload_model)
+                self.reload_status.model = self.transcriber.model_size
+            else:
+                new_executor = self._create_executor()
+                try:
+                    workers = await self._warm_up(new_executor)
+                    self.reload_status.model = workers[0][1] if workers else None
+                except Exception:
+                    new_executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+
+                old_executor, self._executor = self._executor, new_executor
+                self.reload_status.state = "draining"
+                if old_executor is not None:
+                    # Laufende und bereits eingereihte Aufträge werden noch abgearbeitet
+                    await asyncio.to_thread(old_executor.shutdown, True)
+
+            self.reload_status.state = "ready"
+            self.reload_status.progress = 1.0
+            logger.info("Whisper-Modelle erfolgreich neu geladen")
+
+        except Exception as e:
+            logger.error(f"Fehler beim Neuladen der Whisper-Modelle: {str(e)}")
+            self.reload_status.state = "failed"
+            self.reload_status.error = str(e)
+            raise
+        finally:
+            self.reload_status.finished_at = time.time()
+
+    async def transcribe(
+        self,
+        audio: Union[Path, PCMInput],
+        previous_text: Optional[str] = None,
+        post_process: bool = True,
+        profile: Optional[str] = None,
+        language: Optional[str] = None,
+        model_size: Optional[str] = None,
+        with_segments: bool = False
+    ) -> tuple:
+        """
+        Transkribiert Audio auf dem nächsten freien Worker.
+
+        Args:
+            audio: Pfad oder PCM-Daten (siehe Transcriber.transcribe_audio)
+            previous_text: Optionaler Kontext für Whisper
+            post_process: LLM-Formatierung durchführen (wie transcribe_audio)
+            profile: Fidelity-Profil; Standard aus TRANSCRIPTION_PROFILE
+            language: Sprachcode; Standard aus WHISPER_LANGUAGE
+            model_size: Stufe der Lastleiter (MODEL_LADDER); None = Hauptmodell
+            with_segments: Ohne post_process zusätzlich die Whisper-Segmente
+                für den FormattingService liefern
+
+        Returns:
+            (Text, Konfidenz), mit with_segments (Text, Konfidenz, Segmente)
+        """
+        if self._executor is None:
+            raise RuntimeError("Worker-Pool wurde nicht gestartet")
+
+        profile = resolve_profile(profile)
+        if self.in_process:
+            if post_process:
+                func = partial(self.transcriber.transcribe_audio, audio, previous_text, profile, language, model_size)
+            else:
+                func = partial(
+                    self.transcriber.transcribe_chunk,
+                    audio, previous_text, profile, language, model_size, with_segments
+                )
+        else:
+            func = partial(
+                _worker_transcribe, audio, previous_text, post_process, profile, language, model_size, with_segments
+            )
+        return await self._run_timed(func, profile)
+
+    async def transcribe_draft(
+        self,
+        audio: PCMInput,
+        previous_text: Optional[str] = None,
+        language: Optional[str] = None
+    ) -> Tuple[str, float]:
+        """
+        Schneller Entwurf eines Live-Slices mit dem Entwurfsmodell
+        (siehe Transcriber.transcribe_draft), ohne LLM-Formatierung.
+        """
+        if self._executor is None:
+            raise RuntimeError("Worker-Pool wurde nicht gestartet")
+
+        if self.in_process:
+            func = partial(self.transcriber.transcribe_draft, audio, previous_text, language)
+        else:
+            func = partial(_worker_transcribe_draft, audio, previous_text, language)
+        return await self._run_timed(func, "draft")
+
+    async def detect_language(self, audio: PCMInput) -> Tuple[str, float]:
+        """
+        Erkennt die Sprache eines Sprachabschnitts auf dem nächsten freien Worker
+        (siehe Transcriber.detect_language).
+
+        Returns:
+            (Sprachcode, Wahrscheinlichkeit)
+        """
+        if self._executor is None:
+            raise RuntimeError("Worker-Pool wurde nicht gestartet")
+
+        if self.in_process:
+            func = partial(self.transcriber.detect_language, audio)
+        else:
+            func = partial(_worker_detect_language, audio)
+        return await self._run_timed(func, "language")
+
+    async def _run_timed(self, func, profile: str):
+        """Führt einen Auftrag im Executor aus und erfasst die Latenz je Profil"""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        result = await loop.run_in_executor(self._executor, func)
+        metrics.observe(f"transcription.latency.{profile}", time.perf_counter() - start)
+        return result
+
+    async def transcribe_batch(
+        self,
+        audio_chunks: List[PCMInput],
+        previous_texts: Optional[List[Optional[str]]] = None,
+        post_process: bool = True,
+        profile: Optional[str] = None,
+        language: Optional[str] = None,
+        model_size: Optional[str] = None,
+        with_segments: bool = False
+    ) -> List[tuple]:
+        """
+        Transkribiert mehrere Chunks als ein Batch auf dem nächsten freien Worker.
+
+        Returns:
+            Liste von (Text, Konfidenz) in der Reihenfolge der Eingabe,
+            mit with_segments (Text, Konfidenz, Segmente)
+        """
+        if self._executor is None:
+            raise RuntimeError("Worker-Pool wurde nicht gestartet")
+
+        profile = resolve_profile(profile)
+        previous_texts = previous_texts or [None] * len(audio_chunks)
+        if self.in_process:
+            func = partial(
+                self.transcriber.transcribe_batch,
+                audio_chunks, previous_texts, post_process, profile, language, model_size, with_segments
+            )
+        else:
+            func = partial(
+                _worker_transcribe_batch,
+                audio_chunks, previous_texts, post_process, profile, language, model_size, with_segments
+            )
+        return await self._run_timed(func, f"{profile}.batch")
@@ -31,8 +31,11 @@ def pytest_configure(config):
         mock_torch.cuda.empty_cache = MagicMock()
         sys.modules["torch"] = mock_torch
     
-    # Mock numpy vor Import (falls verwendet)
-    if "numpy" not in sys.modules:
+    # Mock numpy vor Import (nur falls numpy nicht installiert ist,
+    # die PCM-Verarbeitung wird sonst mit echtem numpy getestet)
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
         mock_numpy = MagicMock()
         # Mock np.mean für Konfidenz-Berechnung
         mock_numpy.mean = lambda x: sum(x) / len(x) if x else 0.0
@@ -66,6 +69,7 @@ def pytest_configure(config):
         mock_fastapi = MagicMock()
         mock_fastapi.HTTPException = Exception
         sys.modules["fastapi"] = mock_fastapi
+        sys.modules["fastapi.responses"] = mock_fastapi.responses
 
 
 @pytest.fixture
@@ -80,19 +84,19 @@ def mock_whisper_model(monkeypatch):
         ]
     }
     
-    # Mock whisper.load_model
-    import transcriber
-    original_load_model = getattr(transcriber.whisper, 'load_model', None)
-    transcriber.whisper.load_model = MagicMock(return_value=mock_model)
+    # Mock whisper.load_model (geladen wird in der Whisper-Engine)
+    from engines import whisper_engine
+    original_load_model = getattr(whisper_engine.whisper, 'load_model', None)
+    whisper_engine.whisper.load_model = MagicMock(return_value=mock_model)
     
     yield {
         "model": mock_model,
-        "load_model": transcriber.whisper.load_model
+        "load_model": whisper_engine.whisper.load_model
     }
     
     # Restore original
     if original_load_model:
-        transcriber.whisper.load_model = original_load_model
+        whisper_engine.whisper.load_model = original_load_model
 
 
 @pytest.fixture
@@ -124,18 +128,23 @@ def mock_openai_client(monkeypatch):
 def mock_torch(monkeypatch):
     """Mock für torch und CUDA-Funktionen"""
     import transcriber
+    from engines import whisper_engine
     original_torch = getattr(transcriber, 'torch', None)
+    original_engine_torch = getattr(whisper_engine, 'torch', None)
     
     mock_torch = MagicMock()
     mock_torch.cuda.is_available.return_value = False
     mock_torch.cuda.empty_cache = MagicMock()
     transcriber.torch = mock_torch
+    whisper_engine.torch = mock_torch
     
     yield mock_torch
     
     # Restore original
     if original_torch:
         transcriber.torch = original_torch
+    if original_engine_torch:
+        whisper_engine.torch = original_engine_torch
 
 
 @pytest.fixture
@@ -145,10 +154,21 @@ def mock_settings(monkeypatch):
     original_settings = getattr(transcriber, 'settings', None)
     
     mock_settings = MagicMock()
+    mock_settings.ASR_ENGINE = "whisper"
     mock_settings.WHISPER_MODEL = "base"
     mock_settings.WHISPER_DEVICE_CUDA = "large-v3"
+    mock_settings.WHISPER_QUANTIZATION = "none"
+    mock_settings.WHISPER_DRAFT_MODEL = ""
+    mock_settings.model_ladder = []
+    mock_settings.WHISPER_LANGUAGE = "de"
+    mock_settings.WHISPER_NO_SPEECH_THRESHOLD = 0.6
+    mock_settings.WHISPER_WARMUP = False
+    # VAD wird in den Tests gezielt aktiviert
+    mock_settings.VAD_ENABLED = False
     mock_settings.LLM_API_KEY = "test-api-key"
     mock_settings.LLM_MODEL_LIGHT = "gpt-4o-mini"
+    # Die Transcriber-Tests prüfen die LLM-Nachbearbeitung
+    mock_settings.FORMATTING_MODE = "llm"
     transcriber.settings = mock_settings
     
     yield mock_settings
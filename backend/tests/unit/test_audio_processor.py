@@ -28,6 +28,8 @@ class TestInitialization:
         mock_settings.AUDIO_SILENCE_THRESH = -32
         mock_settings.AUDIO_MIN_CHUNK_LENGTH = 2000
         mock_settings.AUDIO_MAX_CHUNK_LENGTH = 5000
+        mock_settings.FFMPEG_MAX_PROCESSES = 2
+        mock_settings.FFMPEG_TIMEOUT_S = 60
         
         # AudioProcessor initialisieren
         processor = AudioProcessor()
@@ -37,6 +39,7 @@ class TestInitialization:
         assert processor.silence_thresh == -32
         assert processor.min_chunk_length == 2000
         assert processor.max_chunk_length == 5000
+        assert processor.ffmpeg_timeout == 60
         
         # Verifizieren, dass Logger aufgerufen wurde
         mock_logger.debug.assert_called_once()
@@ -162,75 +165,181 @@ class TestConvertWebmToWav:
         assert "FFmpeg-Fehler" in str(exc_info.value) or "Unerwarteter Fehler" in str(exc_info.value)
 
 
-class TestDetectSilence:
-    """Tests für die detect_silence Methode"""
+class TestConvertToPcm:
+    """Tests für die convert_to_pcm Methode"""
     
-    @patch('audio_processor.detect_nonsilent')
-    @patch('audio_processor.AudioSegment')
-    def test_detect_silence(self, mock_audio_segment, mock_detect_nonsilent, tmp_path):
-        """Testet Stilleerkennung"""
-        # Temporäre Audio-Datei erstellen
-        audio_file = tmp_path / "test_audio.wav"
-        audio_file.write_bytes(b"fake audio data")
+    @patch('audio_processor.subprocess.run')
+    def test_convert_to_pcm_uses_pipes(self, mock_subprocess_run):
+        """Testet, dass Upload und PCM über stdin/stdout von ffmpeg laufen"""
+        import numpy as np
+        mock_result = MagicMock()
+        mock_result.stdout = np.array([0, 16384, -32768], dtype="<i2").tobytes()
+        mock_subprocess_run.return_value = mock_result
         
-        # Mock AudioSegment
-        mock_audio = MagicMock()
-        mock_audio_segment.from_wav.return_value = mock_audio
+        processor = AudioProcessor()
+        pcm = processor.convert_to_pcm(b"fake webm data")
+        
+        assert pcm.dtype == np.float32
+        assert pcm.tolist() == [0.0, 0.5, -1.0]
+        command = mock_subprocess_run.call_args[0][0]
+        assert command[0] == 'ffmpeg'
+        assert command[command.index('-i') + 1] == 'pipe:0'
+        assert command[-1] == 'pipe:1'
+        assert command[command.index('-f') + 1] == 's16le'
+        assert command[command.index('-ar') + 1] == '16000'
+        assert mock_subprocess_run.call_args[1]['input'] == b"fake webm data"
+        assert mock_subprocess_run.call_args[1]['check'] is True
+    
+    @patch('audio_processor.subprocess.run')
+    def test_convert_to_pcm_ffmpeg_error(self, mock_subprocess_run):
+        """Testet FFmpeg-Fehlerbehandlung"""
+        mock_subprocess_run.side_effect = subprocess.CalledProcessError(
+            returncode=1,
+            cmd=['ffmpeg'],
+            stderr=b"pipe:0: Invalid data found when processing input"
+        )
         
-        # Mock detect_nonsilent mit Stille-Bereichen
-        mock_detect_nonsilent.return_value = [(1000, 3000), (5000, 7000)]
+        processor = AudioProcessor()
+        with pytest.raises(AudioProcessingError) as exc_info:
+            processor.convert_to_pcm(b"kein audio")
         
-        # AudioProcessor initialisieren
+        assert "FFmpeg-Fehler" in str(exc_info.value)
+        assert "Invalid data" in str(exc_info.value)
+
+
+class TestAsyncConversion:
+    """Tests für die asynchrone ffmpeg-Konvertierung mit Obergrenze und Zeitlimit"""
+    
+    @staticmethod
+    def _command(code):
+        """Ersetzt ffmpeg durch ein Python-Skript"""
+        return lambda *args: [sys.executable, "-c", code]
+    
+    @pytest.mark.asyncio
+    async def test_convert_to_pcm_async(self):
+        """Testet, dass stdin an den Prozess geht und stdout als PCM zurückkommt"""
+        import numpy as np
         processor = AudioProcessor()
-        processor.min_silence_len = 500
-        processor.silence_thresh = -32
+        processor._pcm_command = self._command(
+            "import sys; sys.stdout.buffer.write(sys.stdin.buffer.read())"
+        )
         
-        # Stilleerkennung durchführen
-        result = processor.detect_silence(audio_file)
+        pcm = await processor.convert_to_pcm_async(np.array([16384, -16384], dtype="<i2").tobytes())
         
-        # Verifizieren
-        assert result == [(1000, 3000), (5000, 7000)]
-        mock_audio_segment.from_wav.assert_called_once_with(str(audio_file))
-        mock_detect_nonsilent.assert_called_once_with(
-            mock_audio,
-            min_silence_len=processor.min_silence_len,
-            silence_thresh=processor.silence_thresh
+        assert pcm.tolist() == [0.5, -0.5]
+    
+    @pytest.mark.asyncio
+    async def test_ffmpeg_error(self):
+        """Testet, dass ein Rückgabewert != 0 als AudioProcessingError gemeldet wird"""
+        processor = AudioProcessor()
+        processor._pcm_command = self._command(
+            "import sys; sys.stderr.write('Invalid data'); sys.exit(1)"
         )
+        
+        with pytest.raises(AudioProcessingError) as exc_info:
+            await processor.convert_to_pcm_async(b"kein audio")
+        
+        assert "FFmpeg-Fehler: Invalid data" in str(exc_info.value)
     
-    @patch('audio_processor.detect_nonsilent')
-    @patch('audio_processor.AudioSegment')
-    def test_detect_silence_no_silence(self, mock_audio_segment, mock_detect_nonsilent, tmp_path):
-        """Testet Stilleerkennung ohne gefundene Stille"""
-        # Temporäre Audio-Datei erstellen
-        audio_file = tmp_path / "test_audio.wav"
-        audio_file.write_bytes(b"fake audio data")
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        """Testet, dass nie mehr Prozesse als erlaubt gleichzeitig laufen"""
+        import asyncio
+        processor = AudioProcessor()
+        processor.ffmpeg_slots = asyncio.Semaphore(2)
+        processor._pcm_command = self._command("import time; time.sleep(0.2)")
         
-        # Mock AudioSegment
-        mock_audio = MagicMock()
-        mock_audio_segment.from_wav.return_value = mock_audio
+        running = []
+        original_create = asyncio.create_subprocess_exec
         
-        # Mock detect_nonsilent mit leerer Liste (keine Stille)
-        mock_detect_nonsilent.return_value = []
+        async def create(*args, **kwargs):
+            running.append(processor._ffmpeg_running + 1)
+            return await original_create(*args, **kwargs)
         
-        # AudioProcessor initialisieren
+        with patch('audio_processor.asyncio.create_subprocess_exec', side_effect=create):
+            await asyncio.gather(*[processor.convert_to_pcm_async(b"") for _ in range(5)])
+        
+        assert len(running) == 5
+        assert max(running) <= 2
+        assert processor._ffmpeg_running == 0
+    
+    @pytest.mark.asyncio
+    async def test_timeout_and_cancellation_kill_process(self):
+        """Testet, dass Zeitüberschreitung und Abbruch den Kindprozess beenden"""
+        import asyncio
         processor = AudioProcessor()
+        processor.ffmpeg_timeout = 0.5
+        processor._pcm_command = self._command("import time; time.sleep(30)")
         
-        # Stilleerkennung durchführen
-        result = processor.detect_silence(audio_file)
+        processes = []
+        original_create = asyncio.create_subprocess_exec
         
-        # Verifizieren
-        assert result == []
+        async def create(*args, **kwargs):
+            processes.append(await original_create(*args, **kwargs))
+            return processes[-1]
+        
+        with patch('audio_processor.asyncio.create_subprocess_exec', side_effect=create):
+            with pytest.raises(AudioProcessingError) as exc_info:
+                await processor.convert_to_pcm_async(b"")
+            assert "Zeitüberschreitung" in str(exc_info.value)
+            
+            processor.ffmpeg_timeout = 30
+            task = asyncio.create_task(processor.convert_to_pcm_async(b""))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        
+        assert len(processes) == 2
+        assert all(process.returncode is not None for process in processes)
+
+
+class TestDetectSilence:
+    """Tests für die detect_silence Methode"""
+    
+    @staticmethod
+    def _write_wav(path, pcm):
+        from utils.pcm import float32_to_wav
+        path.write_bytes(float32_to_wav(pcm))
+        return path
     
-    @patch('audio_processor.AudioSegment')
-    def test_detect_silence_error(self, mock_audio_segment, tmp_path):
+    def test_detect_silence(self, tmp_path):
+        """Testet Stilleerkennung auf einer WAV-Datei (Werte wie pydub.silence.detect_nonsilent)"""
+        import numpy as np
+        pcm = np.zeros(8 * 16000, dtype=np.float32)
+        pcm[16000:48000] = 0.3   # 1-3 s
+        pcm[80000:112000] = 0.3  # 5-7 s
+        audio_file = self._write_wav(tmp_path / "test_audio.wav", pcm)
+        
+        processor = AudioProcessor()
+        processor.min_silence_len = 500
+        processor.silence_thresh = -32
+        # Ein Fenster gilt erst als still, wenn sein RMS unter der Schwelle liegt
+        assert processor.detect_silence(audio_file) == [(1003, 2997), (5003, 6997)]
+        
+        processor.min_silence_len = 200
+        processor.silence_thresh = -20
+        assert processor.detect_silence(audio_file) == [(1022, 2978), (5022, 6978)]
+    
+    def test_detect_silence_no_silence(self, tmp_path):
+        """Testet Stilleerkennung ohne Stille bzw. ganz ohne Sprache"""
+        import numpy as np
+        processor = AudioProcessor()
+        processor.min_silence_len = 500
+        processor.silence_thresh = -32
+        
+        loud = self._write_wav(tmp_path / "loud.wav", np.full(32000, 0.3, dtype=np.float32))
+        silent = self._write_wav(tmp_path / "silent.wav", np.zeros(32000, dtype=np.float32))
+        
+        assert processor.detect_silence(loud) == [(0, 2000)]
+        assert processor.detect_silence(silent) == []
+    
+    def test_detect_silence_error(self, tmp_path):
         """Testet Fehlerbehandlung bei Stilleerkennung"""
         # Temporäre Audio-Datei erstellen
         audio_file = tmp_path / "test_audio.wav"
         audio_file.write_bytes(b"fake audio data")
         
-        # Mock AudioSegment mit Exception
-        mock_audio_segment.from_wav.side_effect = Exception("Audio load error")
-        
         # AudioProcessor initialisieren
         processor = AudioProcessor()
         
@@ -244,185 +353,219 @@ class TestDetectSilence:
 class TestSplitAudio:
     """Tests für die split_audio Methode"""
     
-    @patch('audio_processor.AudioSegment')
-    def test_split_audio_success(self, mock_audio_segment, tmp_path):
+    @staticmethod
+    def _speech(*ranges_ms, duration_ms=10000):
+        """16-kHz-PCM mit Ton in den angegebenen Bereichen (ms)"""
+        import numpy as np
+        pcm = np.zeros(duration_ms * 16, dtype=np.float32)
+        for start, end in ranges_ms:
+            pcm[start * 16:end * 16] = 0.3
+        return pcm
+    
+    @staticmethod
+    def _processor():
+        processor = AudioProcessor()
+        processor.min_silence_len = 500
+        processor.silence_thresh = -32
+        processor.min_chunk_length = 2000
+        processor.max_chunk_length = 5000
+        return processor
+    
+    def test_split_audio_success(self, tmp_path):
         """Testet erfolgreiche Audio-Aufteilung"""
-        # Temporäre Dateien erstellen
+        from utils.pcm import float32_to_wav, pcm_to_float32
+        pcm = self._speech((0, 3000), (4000, 7000), (8000, 10000))
         audio_file = tmp_path / "test_audio.wav"
+        audio_file.write_bytes(float32_to_wav(pcm))
         output_dir = tmp_path / "chunks"
-        audio_file.write_bytes(b"fake audio data")
-        
-        # Mock AudioSegment
-        mock_audio = MagicMock()
-        mock_audio.__len__.return_value = 10000  # 10 Sekunden Audio (in ms)
-        
-        # Mock AudioSegment.from_wav
-        mock_audio_segment.from_wav.return_value = mock_audio
-        
-        # Mock Chunks für Audio-Slicing
-        chunk_count = [0]  # Counter für Chunks
-        
-        def mock_getitem(self, key):
-            if isinstance(key, slice):
-                chunk = MagicMock()
-                chunk.export = MagicMock()
-                chunk_count[0] += 1
-                return chunk
-            return MagicMock()
         
-        mock_audio.__getitem__ = mock_getitem
+        result = self._processor().split_audio(audio_file, output_dir)
         
-        # AudioProcessor initialisieren
-        processor = AudioProcessor()
-        processor.min_chunk_length = 2000
-        processor.max_chunk_length = 5000
-        
-        # Mock detect_silence Rückgabe - Bereiche zwischen denen geteilt wird
-        # Format: [(start_ms, end_ms), ...] - nonsilent Bereiche
-        silence_ranges = [(3000, 4000), (7000, 8000)]
+        assert [path.name for path in result] == ["chunk_0.wav", "chunk_1.wav", "chunk_2.wav"]
+        chunks = [pcm_to_float32(path.read_bytes()) for path in result]
+        # Schnitte in den Pausenmitten bei 3,5 s und 7,5 s
+        assert [len(chunk) for chunk in chunks] == [56000, 64000, 40000]
+        assert sum(len(chunk) for chunk in chunks) == len(pcm)
+    
+    def test_split_pcm_returns_views_with_offsets(self):
+        """Testet, dass split_pcm Sichten auf den Originalpuffer mit Startzeit liefert"""
+        import numpy as np
+        pcm = self._speech((0, 3000), (4000, 7000), (8000, 10000))
         
-        with patch.object(processor, 'detect_silence', return_value=silence_ranges):
-            # Split durchführen
-            result = processor.split_audio(audio_file, output_dir)
+        chunks = self._processor().split_pcm(pcm)
         
-        # Verifizieren
-        assert len(result) > 0
-        assert all(isinstance(path, Path) for path in result)
-        assert output_dir.exists()
-        # Verifizieren, dass export aufgerufen wurde
-        assert chunk_count[0] > 0
+        assert [chunk.offset_ms for chunk in chunks] == [0, 3500, 7500]
+        assert all(chunk.audio.base is pcm for chunk in chunks)
+        assert np.shares_memory(chunks[1].audio, pcm[56000:120000])
+        assert len(chunks[-1].audio) == len(pcm) - 120000
     
-    @patch('audio_processor.AudioSegment')
-    def test_split_audio_no_silence_ranges(self, mock_audio_segment, tmp_path):
-        """Testet Fehlerbehandlung bei fehlenden Stille-Bereichen"""
-        # Temporäre Dateien erstellen
+    def test_split_audio_no_silence_ranges(self, tmp_path):
+        """Testet Fehlerbehandlung bei fehlenden Sprachbereichen"""
+        from utils.pcm import float32_to_wav
         audio_file = tmp_path / "test_audio.wav"
-        output_dir = tmp_path / "chunks"
-        audio_file.write_bytes(b"fake audio data")
+        audio_file.write_bytes(float32_to_wav(self._speech()))
         
-        # Mock AudioSegment
-        mock_audio = MagicMock()
-        mock_audio_segment.from_wav.return_value = mock_audio
-        
-        # AudioProcessor initialisieren
-        processor = AudioProcessor()
+        with pytest.raises(AudioProcessingError) as exc_info:
+            self._processor().split_audio(audio_file, tmp_path / "chunks")
         
-        # Mock detect_silence mit leerer Liste
-        with patch.object(processor, 'detect_silence', return_value=[]):
-            # Verifizieren, dass AudioProcessingError geworfen wird
-            with pytest.raises(AudioProcessingError) as exc_info:
-                processor.split_audio(audio_file, output_dir)
-            
-            assert "Keine geeigneten Stellen zum Teilen gefunden" in str(exc_info.value)
+        assert "Keine geeigneten Stellen zum Teilen gefunden" in str(exc_info.value)
     
-    @patch('audio_processor.AudioSegment')
-    def test_split_audio_chunks_too_short(self, mock_audio_segment, tmp_path):
+    def test_split_audio_chunks_too_short(self, tmp_path):
         """Testet Fehlerbehandlung bei zu kurzen Chunks"""
-        # Temporäre Dateien erstellen
+        from utils.pcm import float32_to_wav
         audio_file = tmp_path / "test_audio.wav"
-        output_dir = tmp_path / "chunks"
-        audio_file.write_bytes(b"fake audio data")
-        
-        # Mock AudioSegment
-        mock_audio = MagicMock()
-        mock_audio.__len__.return_value = 1000  # Sehr kurzes Audio (1 Sekunde)
-        mock_audio_segment.from_wav.return_value = mock_audio
+        # Sehr kurzes Audio (1 Sekunde), Min-Chunk ist länger
+        audio_file.write_bytes(float32_to_wav(self._speech((100, 200), duration_ms=1000)))
         
-        # Mock Chunks - werden nicht exportiert, da zu kurz
-        def mock_getitem(self, key):
-            if isinstance(key, slice):
-                chunk = MagicMock()
-                chunk.export = MagicMock()
-                return chunk
-            return MagicMock()
-        
-        mock_audio.__getitem__ = mock_getitem
-        
-        # AudioProcessor initialisieren
-        processor = AudioProcessor()
-        processor.min_chunk_length = 2000  # Min-Chunk ist länger als Audio
+        with pytest.raises(AudioProcessingError) as exc_info:
+            self._processor().split_audio(audio_file, tmp_path / "chunks")
         
-        # Mock detect_silence mit sehr kurzen Bereichen
-        # Die Segmente zwischen den Bereichen sind zu kurz
-        with patch.object(processor, 'detect_silence', return_value=[(100, 200)]):
-            # Verifizieren, dass AudioProcessingError geworfen wird
-            with pytest.raises(AudioProcessingError) as exc_info:
-                processor.split_audio(audio_file, output_dir)
-            
-            assert "Keine gültigen Audiochunks erzeugt" in str(exc_info.value)
+        assert "Keine gültigen Audiochunks erzeugt" in str(exc_info.value)
     
-    @patch('audio_processor.AudioSegment')
-    def test_split_audio_creates_output_dir(self, mock_audio_segment, tmp_path):
+    def test_split_audio_creates_output_dir(self, tmp_path):
         """Testet, dass das Ausgabeverzeichnis erstellt wird"""
-        # Temporäre Dateien erstellen
+        from utils.pcm import float32_to_wav
         audio_file = tmp_path / "test_audio.wav"
+        audio_file.write_bytes(float32_to_wav(self._speech((3000, 4000))))
         output_dir = tmp_path / "new_chunks"  # Nicht existierendes Verzeichnis
-        audio_file.write_bytes(b"fake audio data")
         
-        # Verifizieren, dass Verzeichnis noch nicht existiert
         assert not output_dir.exists()
+        self._processor().split_audio(audio_file, output_dir)
         
-        # Mock AudioSegment
-        mock_audio = MagicMock()
-        mock_audio.__len__.return_value = 10000
-        mock_audio_segment.from_wav.return_value = mock_audio
-        
-        # Mock Audio-Slicing
-        def mock_getitem(self, key):
-            if isinstance(key, slice):
-                chunk = MagicMock()
-                chunk.export = MagicMock()
-                return chunk
-            return MagicMock()
+        assert output_dir.exists()
+        assert output_dir.is_dir()
+
+    
+    def test_chunk_boundaries_cut_in_pauses(self):
+        """Testet, dass nur in Pausen geschnitten und das gesamte Audio abgedeckt wird"""
+        processor = AudioProcessor()
+        processor.min_chunk_length = 2000
+        processor.max_chunk_length = 5000
         
-        mock_audio.__getitem__ = mock_getitem
+        speech_ranges = [(0, 1500), (2500, 4000), (5000, 6000), (7000, 9500)]
+        boundaries = processor.chunk_boundaries(speech_ranges, 10000)
         
-        # AudioProcessor initialisieren
+        # Schnitte in den Pausenmitten 2000, 4500 und 6500
+        assert boundaries == [(0, 4500), (4500, 6500), (6500, 10000)]
+    
+    def test_chunk_boundaries_short_rest_is_merged(self):
+        """Testet, dass ein zu kurzer Rest dem letzten Chunk zugeschlagen wird"""
         processor = AudioProcessor()
         processor.min_chunk_length = 2000
+        processor.max_chunk_length = 5000
         
-        # Mock detect_silence
-        with patch.object(processor, 'detect_silence', return_value=[(3000, 4000)]):
-            # Split durchführen
-            processor.split_audio(audio_file, output_dir)
+        boundaries = processor.chunk_boundaries([(0, 4000), (5000, 5800)], 6000)
         
-        # Verifizieren, dass Verzeichnis erstellt wurde
-        assert output_dir.exists()
-        assert output_dir.is_dir()
+        assert boundaries == [(0, 6000)]
+
+
+class TestSpeechBounds:
+    """Tests für die Sprachaktivitätserkennung auf PCM"""
+    
+    def test_speech_bounds_trims_silence(self):
+        """Testet, dass Stille an den Rändern bis auf den Rand abgeschnitten wird"""
+        import numpy as np
+        processor = AudioProcessor()
+        processor.vad_threshold = -45
+        processor.vad_frame_ms = 30
+        processor.vad_padding_ms = 100
+        processor.vad_min_speech_ms = 250
+        
+        pcm = np.zeros(48000, dtype=np.float32)
+        pcm[16000:32000] = 0.1 * np.sin(np.arange(16000) * 0.1)
+        start, end = processor.speech_bounds(pcm)
+        
+        # Sprache 1,0-2,0 s, Rand 0,1 s (auf Frame-Raster gerundet)
+        assert 14000 <= start <= 14400
+        assert 33600 <= end <= 34100
+    
+    def test_speech_bounds_no_speech(self):
+        """Testet, dass Stille und zu kurze Geräusche als 'keine Sprache' gelten"""
+        import numpy as np
+        processor = AudioProcessor()
+        processor.vad_threshold = -45
+        processor.vad_frame_ms = 30
+        processor.vad_min_speech_ms = 250
+        
+        pcm = np.full(32000, 1e-4, dtype=np.float32)
+        assert processor.speech_bounds(pcm) is None
+        
+        pcm[1000:1960] = 0.5  # Klick von 60 ms
+        assert processor.speech_bounds(pcm) is None
+        assert processor.speech_bounds(np.zeros(10, dtype=np.float32)) is None
 
 
 class TestProcessAudioChunk:
     """Tests für die process_audio_chunk Methode"""
     
-    def test_process_audio_chunk(self):
-        """Testet Chunk-Verarbeitung"""
+    @staticmethod
+    def _processor():
         processor = AudioProcessor()
+        processor.vad_threshold = -45
+        processor.vad_frame_ms = 30
+        processor.min_silence_len = 300
+        processor.min_chunk_length = 2000
+        processor.max_chunk_length = 5000
+        return processor
+    
+    def test_process_audio_chunk_splits_in_pauses(self):
+        """Testet, dass lange Chunks in Pausen geteilt und als Sichten zurückgegeben werden"""
+        import numpy as np
+        processor = self._processor()
+        
+        # 8 s: Sprache 0-3,5 s und 4,5-8 s; Schnitt in der Pausenmitte (Frame-Raster 30 ms)
+        pcm = np.zeros(8 * 16000, dtype=np.float32)
+        pcm[:56000] = 0.1
+        pcm[72000:] = 0.1
+        audio = (pcm * 32767).astype("<i2").tobytes()
+        
+        chunks = processor.process_audio_chunk(audio)
+        
+        assert [len(chunk) for chunk in chunks] == [64080, 63920]
+        assert all(chunk.dtype == np.float32 for chunk in chunks)
+        assert chunks[0].base is chunks[1].base
+    
+    def test_process_audio_chunk_short_or_silent(self):
+        """Testet, dass kurze Chunks unverändert bleiben und Stille nichts liefert"""
+        import numpy as np
+        processor = self._processor()
+        
+        pcm = np.zeros(16000, dtype=np.float32)
+        assert processor.process_audio_chunk(pcm) == []
+        
+        pcm[4000:12000] = 0.1
+        chunks = processor.process_audio_chunk(pcm)
+        assert len(chunks) == 1
+        assert np.shares_memory(chunks[0], pcm) and len(chunks[0]) == len(pcm)
+    
+    def test_speech_ranges_bridge_short_pauses(self):
+        """Testet, dass Pausen unter min_silence_len überbrückt werden"""
+        import numpy as np
+        processor = self._processor()
+        
+        pcm = np.zeros(48000, dtype=np.float32)
+        pcm[0:9600] = 0.1        # 0-600 ms
+        pcm[12000:19200] = 0.1   # 750-1200 ms (Pause 150 ms)
+        pcm[32000:40000] = 0.1   # 2000-2500 ms (Pause 800 ms)
         
-        # Prüfen, ob Methode existiert
-        if hasattr(processor, 'process_audio_chunk'):
-            # Falls Methode existiert, Test implementieren
-            audio_chunk = b"fake audio chunk data"
-            # Hier würde der eigentliche Test stehen
-            # Da die Methode nicht in der Klasse existiert, skip
-            pytest.skip("process_audio_chunk Methode existiert nicht in AudioProcessor")
-        else:
-            pytest.skip("process_audio_chunk Methode existiert nicht in AudioProcessor")
+        assert processor.speech_ranges(pcm) == [(0, 1200), (1980, 2520)]
 
 
 class TestIsSilence:
     """Tests für die is_silence Methode"""
     
     def test_is_silence(self):
-        """Testet Stille-Erkennung für Bytes"""
+        """Testet Stille-Erkennung für s16le- und WAV-Bytes"""
+        import numpy as np
+        from utils.pcm import float32_to_wav
         processor = AudioProcessor()
+        processor.vad_threshold = -45
+        processor.vad_frame_ms = 30
+        processor.vad_min_speech_ms = 250
         
-        # Prüfen, ob Methode existiert
-        if hasattr(processor, 'is_silence'):
-            # Falls Methode existiert, Test implementieren
-            audio_bytes = b"fake audio bytes"
-            # Hier würde der eigentliche Test stehen
-            # Da die Methode nicht in der Klasse existiert, skip
-            pytest.skip("is_silence Methode existiert nicht in AudioProcessor")
-        else:
-            pytest.skip("is_silence Methode existiert nicht in AudioProcessor")
-
+        pcm = np.zeros(16000, dtype=np.float32)
+        assert processor.is_silence((pcm * 32767).astype("<i2").tobytes())
+        
+        pcm[:8000] = 0.1 * np.sin(np.arange(8000) * 0.1)
+        assert not processor.is_silence((pcm * 32767).astype("<i2").tobytes())
+        assert not processor.is_silence(float32_to_wav(pcm))
@@ -0,0 +1,83 @@
+"""
+Unit-Tests für den BoundedExecutor
+"""
+import asyncio
+import threading
+import pytest
+from pathlib import Path
+import sys
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from utils.bounded_executor import BoundedExecutor
+from utils.exceptions import ServiceOverloadedError
+from utils.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestBoundedExecutor:
+    """Tests für Auslagerung und Zugangskontrolle"""
+
+    @pytest.mark.asyncio
+    async def test_runs_off_event_loop(self):
+        executor = BoundedExecutor("test", max_workers=1, max_pending=1)
+        try:
+            async with executor.admit():
+                thread_name = await executor.run(lambda: threading.current_thread().name)
+        finally:
+            executor.shutdown()
+
+        assert thread_name.startswith("test")
+        assert executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self):
+        executor = BoundedExecutor("test", max_workers=1, max_pending=2, retry_after=3)
+        release = threading.Event()
+        started = asyncio.Event()
+
+        async def job():
+            async with executor.admit():
+                started.set()
+                await executor.run(release.wait, 5)
+
+        try:
+            running = [asyncio.create_task(job()), asyncio.create_task(job())]
+            await started.wait()
+
+            with pytest.raises(ServiceOverloadedError) as exc_info:
+                async with executor.admit():
+                    pass
+
+            release.set()
+            await asyncio.gather(*running)
+        finally:
+            executor.shutdown()
+
+        assert exc_info.value.retry_after == 3
+        assert metrics.get_counter("executor.test.rejected") == 1
+        # Nach Abschluss werden wieder Aufträge angenommen
+        assert executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_slot_is_released_on_error(self):
+        executor = BoundedExecutor("test", max_workers=1, max_pending=1)
+        try:
+            with pytest.raises(ValueError):
+                async with executor.admit():
+                    raise ValueError("kaputt")
+            async with executor.admit():
+                pass
+        finally:
+            executor.shutdown()
+
+        assert executor.pending == 0
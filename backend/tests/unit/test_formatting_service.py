@@ -0,0 +1,291 @@
+"""
+Unit-Tests für den FormattingService
+"""
+import asyncio
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+import sys
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.formatting_service import FormattingService
+from worker_pool import TranscriptionWorkerPool
+from queue_manager import TranscriptionQueueManager
+
+
+@pytest.fixture
+def llm_client():
+    """AsyncOpenAI-Mock, der den Rohtext in <p>-Tags zurückgibt"""
+    client = MagicMock()
+
+    async def create(**kwargs):
+        raw_text = kwargs["messages"][-1]["content"].split("\n\n", 1)[1]
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = f"<p>{raw_text}</p>"
+        return response
+
+    client.chat.completions.create = AsyncMock(side_effect=create)
+    return client
+
+
+async def wait_for_job(service, job_id, timeout=5):
+    """Wartet, bis ein Job abgeschlossen ist"""
+    async def poll():
+        while service.get_job(job_id).finished_at is None:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+    return service.get_job(job_id)
+
+
+# Zwei Sätze mit einer Sprechpause von 3 s dazwischen
+SEGMENTS = [
+    {"start": 0.0, "end": 1.0, "text": " erster satz."},
+    {"start": 4.0, "end": 5.0, "text": " zweiter satz."}
+]
+
+
+@pytest.fixture
+def paragraph_pause(monkeypatch):
+    """Absatz ab 1,5 s Sprechpause"""
+    from services import local_formatter
+    monkeypatch.setattr(local_formatter.settings, "FORMATTING_PARAGRAPH_PAUSE_S", 1.5)
+
+
+class TestFormattingService:
+    """Tests für die asynchrone LLM-Formatierung"""
+
+    @pytest.mark.asyncio
+    async def test_submit_returns_immediately(self, llm_client):
+        """submit() wartet nicht auf das LLM"""
+        service = FormattingService(client=llm_client, mode="llm", max_workers=1, batch_size=1)
+        job_id = service.submit("hallo welt")
+
+        assert service.get_job(job_id).status == "pending"
+        llm_client.chat.completions.create.assert_not_called()
+
+        await service.start()
+        try:
+            job = await wait_for_job(service, job_id)
+        finally:
+            await service.stop()
+
+        assert job.status == "completed"
+        assert job.text == "<p>hallo welt</p>"
+        assert job.batch == [job_id]
+
+    @pytest.mark.asyncio
+    async def test_session_slices_are_batched(self, llm_client):
+        """Aufeinanderfolgende Slices einer Session werden gemeinsam formatiert"""
+        service = FormattingService(client=llm_client, mode="llm", max_workers=1, batch_size=4, batch_window_ms=50)
+        updates = []
+
+        async def callback(update):
+            updates.append(update)
+
+        first = service.submit("erster teil", session_id="s1", callback=callback, task_id="t1")
+        second = service.submit("zweiter teil", session_id="s1", callback=callback, task_id="t2")
+        other = service.submit("andere session", session_id="s2")
+
+        await service.start()
+        try:
+            await wait_for_job(service, second)
+            await wait_for_job(service, other)
+        finally:
+            await service.stop()
+
+        assert llm_client.chat.completions.create.await_count == 2
+        assert service.get_job(first).text == "<p>erster teil zweiter teil</p>"
+        assert service.get_job(other).text == "<p>andere session</p>"
+        # Ein Update pro Empfänger für den gesamten Batch
+        assert len(updates) == 1
+        assert updates[0]["type"] == "formatting_result"
+        assert updates[0]["formatting_ids"] == [first, second]
+        assert updates[0]["task_ids"] == ["t1", "t2"]
+
+    @pytest.mark.asyncio
+    async def test_llm_error_keeps_raw_text(self, llm_client):
+        """Bei LLM-Fehlern bleibt der Rohtext als Ergebnis erhalten"""
+        llm_client.chat.completions.create = AsyncMock(side_effect=TimeoutError("Timeout"))
+        service = FormattingService(client=llm_client, mode="llm", max_workers=1, batch_size=1)
+        job_id = service.submit("roher text")
+
+        await service.start()
+        try:
+            job = await wait_for_job(service, job_id)
+        finally:
+            await service.stop()
+
+        assert job.status == "failed"
+        assert job.text == "roher text"
+        assert "Timeout" in job.error
+
+    @pytest.mark.asyncio
+    async def test_local_mode_needs_no_llm(self, llm_client):
+        """Im lokalen Modus wird ohne LLM-Aufruf formatiert"""
+        service = FormattingService(client=llm_client, mode="local", max_workers=1, batch_size=1)
+        job_id = service.submit("erster satz. zweiter satz.")
+
+        await service.start()
+        try:
+            job = await wait_for_job(service, job_id)
+        finally:
+            await service.stop()
+
+        assert job.status == "completed"
+        assert job.text == "<p>Erster satz. zweiter satz.</p>"
+        llm_client.chat.completions.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_local_mode_uses_segment_pauses(self, llm_client, paragraph_pause):
+        """Mit Segmenten beginnt an einer langen Sprechpause ein neuer Absatz"""
+        service = FormattingService(client=llm_client, mode="local", max_workers=1, batch_size=1)
+        job_id = service.submit("erster satz. zweiter satz.", segments=SEGMENTS)
+
+        await service.start()
+        try:
+            job = await wait_for_job(service, job_id)
+        finally:
+            await service.stop()
+
+        assert job.text == "<p>Erster satz.</p><p>Zweiter satz.</p>"
+
+    def test_expired_results_are_purged(self, llm_client):
+        """Abgeschlossene Jobs werden nach Ablauf der TTL entfernt"""
+        service = FormattingService(client=llm_client, mode="llm", result_ttl=0)
+        job_id = service.submit("alt")
+        service.get_job(job_id).finished_at = 0.0
+
+        service.submit("neu")
+
+        assert service.get_job(job_id) is None
+
+
+class TestQueueManagerFormatting:
+    """Tests für die Anbindung des Queue-Managers an den FormattingService"""
+
+    @pytest.mark.asyncio
+    async def test_raw_text_first_then_formatting(self, llm_client):
+        """Der Rohtext wird ohne LLM gesendet, die Formatierung folgt als Update"""
+        transcriber = MagicMock()
+        transcriber.transcribe_chunk.return_value = ("roh", -0.3)
+        pool = TranscriptionWorkerPool(processes=0, transcriber=transcriber)
+        formatter = FormattingService(client=llm_client, mode="llm", max_workers=1, batch_size=1)
+        manager = TranscriptionQueueManager(worker_pool=pool, max_workers=1, formatter=formatter)
+
+        updates = []
+        done = asyncio.Event()
+
+        async def callback(update):
+            updates.append(update)
+            if update["type"] == "formatting_result":
+                done.set()
+
+        await formatter.start()
+        await manager.start()
+        try:
+            task_id = await manager.add_task(b"\x00\x00" * 10, "", "ws-1", callback)
+            await asyncio.wait_for(done.wait(), timeout=5)
+        finally:
+            await manager.stop()
+            await formatter.stop()
+
+        transcriber.transcribe_audio.assert_not_called()
+        types = [update["type"] for update in updates]
+        assert types.index("transcription_result") < types.index("formatting_result")
+
+        result = next(u for u in updates if u["type"] == "transcription_result")["result"]
+        assert result["text"] == "roh"
+        assert result["formatting_status"] == "pending"
+
+        formatted = updates[-1]
+        assert formatted["task_ids"] == [task_id]
+        assert formatted["text"] == "<p>roh</p>"
+
+    @pytest.mark.asyncio
+    async def test_segments_reach_local_formatter(self, llm_client, paragraph_pause):
+        """Die Segmente des Live-Chunks bestimmen die Absätze der Formatierung"""
+        transcriber = MagicMock()
+        transcriber.transcribe_chunk.return_value = ("erster satz. zweiter satz.", -0.3, SEGMENTS)
+        pool = TranscriptionWorkerPool(processes=0, transcriber=transcriber)
+        formatter = FormattingService(client=llm_client, mode="local", max_workers=1, batch_size=1)
+        manager = TranscriptionQueueManager(worker_pool=pool, max_workers=1, formatter=formatter)
+
+        done = asyncio.Event()
+        formatted = []
+
+        async def callback(update):
+            if update["type"] == "formatting_result":
+                formatted.append(update["text"])
+                done.set()
+
+        await formatter.start()
+        await manager.start()
+        try:
+            await manager.add_task(b"\x00\x00" * 10, "", "ws-1", callback)
+            await asyncio.wait_for(done.wait(), timeout=5)
+        finally:
+            await manager.stop()
+            await formatter.stop()
+
+        assert transcriber.transcribe_chunk.call_args[0][-1] is True
+        assert formatted == ["<p>Erster satz.</p><p>Zweiter satz.</p>"]
+
+
+@pytest.fixture
+def main_module(monkeypatch):
+    """Importiert die API mit dem echten FastAPI (conftest ersetzt es sonst durch einen Mock)"""
+    import importlib
+    for name in [name for name in sys.modules if name == "fastapi" or name.startswith("fastapi.")]:
+        monkeypatch.delitem(sys.modules, name)
+    pytest.importorskip("fastapi")
+    return importlib.import_module("main")
+
+
+class TestUploadFormatting:
+    """Tests für die Formatierung von Uploads über /upload_audio"""
+
+    @pytest.mark.asyncio
+    async def test_upload_passes_segments_to_formatter(self, main_module, monkeypatch, llm_client, paragraph_pause):
+        """Die Whisper-Segmente des Uploads erreichen die lokale Formatierung"""
+        import numpy as np
+        from services.prompt_context import SessionPromptContext
+        from utils.bounded_executor import BoundedExecutor
+
+        worker_pool = MagicMock()
+        worker_pool.ready = True
+        worker_pool.reloading = False
+        worker_pool.transcribe = AsyncMock(return_value=("erster satz. zweiter satz.", -0.2, SEGMENTS))
+        language_cache = MagicMock()
+        language_cache.resolve = AsyncMock(return_value="de")
+        formatter = FormattingService(client=llm_client, mode="local", max_workers=1, batch_size=1)
+
+        state = main_module.app.state
+        monkeypatch.setattr(state, "worker_pool", worker_pool, raising=False)
+        monkeypatch.setattr(state, "upload_executor", BoundedExecutor("upload", max_workers=1), raising=False)
+        monkeypatch.setattr(state, "language_cache", language_cache, raising=False)
+        monkeypatch.setattr(state, "prompt_context", SessionPromptContext(), raising=False)
+        monkeypatch.setattr(state, "transcription_cache", None, raising=False)
+        monkeypatch.setattr(state, "formatting_service", formatter, raising=False)
+        monkeypatch.setattr(main_module.settings, "LONG_AUDIO_THRESHOLD_S", 0)
+        monkeypatch.setattr(main_module, "convert_upload", AsyncMock(return_value=np.zeros(16000, dtype=np.float32)))
+
+        upload = MagicMock()
+        upload.filename = "aufnahme.wav"
+        upload.read = AsyncMock(return_value=b"RIFF")
+
+        await formatter.start()
+        try:
+            response = await main_module.upload_audio(file=upload, session_id=None, profile=None, draft=False)
+            job = await wait_for_job(formatter, response["formatting_id"])
+        finally:
+            await formatter.stop()
+            state.upload_executor.shutdown()
+
+        assert response["text"] == "erster satz. zweiter satz."
+        assert worker_pool.transcribe.call_args.kwargs["with_segments"] is True
+        assert job.text == "<p>Erster satz.</p><p>Zweiter satz.</p>"
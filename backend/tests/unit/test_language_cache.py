@@ -0,0 +1,124 @@
+"""
+Unit-Tests für die Spracherkennung pro Aufnahme (SessionLanguageCache)
+"""
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+import sys
+
+import numpy as np
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services import language_cache
+from services.language_cache import SessionLanguageCache
+
+SPEECH = np.zeros(16000 * 5, dtype=np.float32)
+
+
+@pytest.fixture
+def auto_language(monkeypatch):
+    """Automatische Erkennung mit Standard-Schwellen"""
+    monkeypatch.setattr(language_cache.settings, "WHISPER_LANGUAGE", "auto")
+    monkeypatch.setattr(language_cache.settings, "LANGUAGE_DETECTION_MIN_SPEECH_S", 3.0)
+    monkeypatch.setattr(language_cache.settings, "LANGUAGE_MIN_PROBABILITY", 0.5)
+    monkeypatch.setattr(language_cache.settings, "LANGUAGE_RECHECK_LOGPROB", -1.0)
+
+
+def make_cache(speech_seconds=5.0, detected=("en", 0.9)):
+    """Cache mit Worker-Pool- und AudioProcessor-Mock"""
+    pool = MagicMock()
+    pool.detect_language = AsyncMock(return_value=detected)
+    audio_processor = MagicMock()
+    audio_processor.speech_bounds.return_value = (
+        (0, int(speech_seconds * 16000)) if speech_seconds else None
+    )
+    return SessionLanguageCache(pool, audio_processor, ttl=3600), pool
+
+
+class TestSessionLanguageCache:
+    """Tests für Erkennung, Wiederverwendung und Neuerkennung"""
+
+    @pytest.mark.asyncio
+    async def test_fixed_language_skips_detection(self, monkeypatch):
+        monkeypatch.setattr(language_cache.settings, "WHISPER_LANGUAGE", "de")
+        cache, pool = make_cache()
+
+        assert await cache.resolve("s1", SPEECH) == "de"
+        pool.detect_language.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_detects_once_per_session(self, auto_language):
+        cache, pool = make_cache()
+
+        assert await cache.resolve("s1", SPEECH) == "en"
+        assert await cache.resolve("s1", SPEECH) == "en"
+        assert await cache.resolve("s2", SPEECH) == "en"
+        assert pool.detect_language.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_waits_for_enough_speech(self, auto_language):
+        cache, pool = make_cache(speech_seconds=1.0)
+
+        assert await cache.resolve("s1", SPEECH) is None
+        pool.detect_language.assert_not_called()
+        assert cache.get("s1") is None
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_triggers_recheck(self, auto_language):
+        cache, pool = make_cache()
+        await cache.resolve("s1", SPEECH)
+
+        cache.report("s1", -0.3)
+        await cache.resolve("s1", SPEECH)
+        assert pool.detect_language.await_count == 1
+
+        cache.report("s1", -1.5)
+        pool.detect_language.return_value = ("de", 0.95)
+        assert await cache.resolve("s1", SPEECH) == "de"
+        assert pool.detect_language.await_count == 2
+        assert cache.get("s1").recheck is False
+
+    @pytest.mark.asyncio
+    async def test_uncertain_detection_is_not_reused(self, auto_language):
+        cache, pool = make_cache(detected=("nl", 0.3))
+
+        assert await cache.resolve("s1", SPEECH) == "nl"
+        await cache.resolve("s1", SPEECH)
+        assert pool.detect_language.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_upload_without_session_is_not_cached(self, auto_language):
+        cache, pool = make_cache()
+
+        assert await cache.resolve(None, SPEECH) == "en"
+        # Nur der Sprachabschnitt wird an die Erkennung übergeben
+        assert len(pool.detect_language.call_args[0][0]) == 5 * 16000
+        assert cache._entries == {}
+
+    @pytest.mark.asyncio
+    async def test_discard_keeps_lock_of_running_detection(self, auto_language):
+        import asyncio
+
+        cache, pool = make_cache()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def detect(pcm):
+            started.set()
+            await release.wait()
+            return ("en", 0.9)
+
+        pool.detect_language.side_effect = detect
+        first = asyncio.create_task(cache.resolve("s1", SPEECH))
+        await started.wait()
+        cache.discard("s1")
+        second = asyncio.create_task(cache.resolve("s1", SPEECH))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(first, second) == ["en", "en"]
+        assert pool.detect_language.await_count == 1
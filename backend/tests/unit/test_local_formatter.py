@@ -0,0 +1,50 @@
+"""
+Unit-Tests für die regelbasierte lokale Formatierung
+"""
+import pytest
+from pathlib import Path
+import sys
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.local_formatter import format_segments, format_text
+
+
+def segment(start, end, text):
+    return {"start": start, "end": end, "text": text}
+
+
+class TestFormatSegments:
+    """Tests für Absätze aus Pausen, Satzgrenzen und Satzanzahl"""
+
+    def test_long_pause_starts_paragraph(self):
+        segments = [
+            segment(0.0, 2.0, " Befund unauffällig."),
+            segment(2.2, 4.0, " Keine Infiltrate."),
+            segment(6.5, 8.0, " Beurteilung folgt."),
+        ]
+        assert format_segments(segments, paragraph_pause=1.5) == (
+            "<p>Befund unauffällig. Keine Infiltrate.</p><p>Beurteilung folgt.</p>"
+        )
+
+    def test_pause_inside_sentence_does_not_split(self):
+        segments = [
+            segment(0.0, 2.0, " Die Aufnahme erfolgte wegen"),
+            segment(5.0, 7.0, " Dyspnoe. Danach Besserung."),
+        ]
+        assert format_segments(segments, paragraph_pause=1.5) == (
+            "<p>Die Aufnahme erfolgte wegen Dyspnoe. Danach Besserung.</p>"
+        )
+
+    def test_sentence_limit_and_abbreviations(self):
+        text = "Termin am 3. März bei Dr. Meier. Zwei. Drei. Vier."
+        assert format_segments([segment(0, 1, text)], max_sentences=2) == (
+            "<p>Termin am 3. März bei Dr. Meier. Zwei.</p><p>Drei. Vier.</p>"
+        )
+
+    def test_text_is_escaped_and_kept(self):
+        assert format_text("  wert  < 5 & stabil ") == "<p>Wert &lt; 5 &amp; stabil</p>"
+        assert format_text("") == ""
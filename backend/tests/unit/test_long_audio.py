@@ -0,0 +1,121 @@
+"""
+Unit-Tests für die parallele Transkription langer Aufnahmen
+"""
+import asyncio
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+import sys
+
+import numpy as np
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.long_audio import stitch_texts, transcribe_long_audio
+from audio_processor import AudioChunk
+
+
+class TestStitchTexts:
+    """Tests für das Zusammenfügen der Chunk-Texte"""
+
+    def test_removes_duplicated_phrase_at_boundary(self):
+        texts = ["Wir beginnen mit dem Bericht.", "dem Bericht des Vorstands.", "Danke."]
+        assert stitch_texts(texts) == "Wir beginnen mit dem Bericht. des Vorstands. Danke."
+
+    def test_removes_single_long_word(self):
+        assert stitch_texts(["Das Protokoll", "protokoll wurde verlesen"]) == "Das Protokoll wurde verlesen"
+
+    def test_keeps_short_repeated_words(self):
+        assert stitch_texts(["Hier und", "und dort"]) == "Hier und und dort"
+
+    def test_skips_empty_chunks(self):
+        assert stitch_texts(["Eins", "", "Zwei"]) == "Eins Zwei"
+
+
+class TestTranscribeLongAudio:
+    """Tests für Aufteilung, Fan-out und Reihenfolge"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_run_in_parallel_and_keep_order(self, tmp_path):
+        lengths = [48000, 16000, 32000]
+        audio_processor = MagicMock()
+
+        def split_pcm(pcm, max_chunk_length=None):
+            assert max_chunk_length == 30000
+            offsets = np.cumsum([0] + lengths[:-1])
+            return [
+                AudioChunk(pcm[offset:offset + length], offset // 16)
+                for offset, length in zip(offsets, lengths)
+            ]
+
+        audio_processor.split_pcm.side_effect = split_pcm
+
+        running = 0
+        max_running = 0
+
+        async def transcribe(audio, previous_text=None, post_process=True, profile=None, language=None,
+                             with_segments=False):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            # Längere Chunks brauchen länger: Abschluss in anderer Reihenfolge
+            await asyncio.sleep(len(audio) / 1_000_000)
+            running -= 1
+            segments = [{"start": 0.5, "end": len(audio) / 16000, "text": f" teil{len(audio)}"}]
+            return f"teil{len(audio)}", -0.1 * len(audio) / 16000, segments
+
+        pool = MagicMock()
+        pool.transcribe = AsyncMock(side_effect=transcribe)
+
+        text, confidence, segments = await transcribe_long_audio(
+            pool, audio_processor, np.zeros(96000, dtype=np.float32), tmp_path,
+            profile="balanced", max_chunk_length=30000
+        )
+
+        assert text == "teil48000 teil16000 teil32000"
+        assert max_running == 3
+        assert confidence == pytest.approx((-0.3 * 3 + -0.1 * 1 + -0.2 * 2) / 6)
+        assert all(call.kwargs["profile"] == "balanced" for call in pool.transcribe.call_args_list)
+        # Segmentzeiten relativ zum Beginn der Aufnahme
+        assert [(seg["start"], seg["end"]) for seg in segments] == [(0.5, 3.0), (3.5, 4.0), (4.5, 6.0)]
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_split_runs_on_upload_executor_and_exports_are_removed(self, tmp_path, monkeypatch):
+        """Die Aufteilung nutzt den begrenzten Executor; exportierte Chunks werden auch bei Fehlern entfernt"""
+        import threading
+        from services import long_audio
+        from utils.bounded_executor import BoundedExecutor
+
+        monkeypatch.setattr(long_audio.settings, "AUDIO_EXPORT_CHUNKS", True)
+        threads = []
+        audio_processor = MagicMock()
+
+        def split_pcm(pcm, max_chunk_length=None):
+            threads.append(threading.current_thread().name)
+            return [AudioChunk(pcm[:16000], 0), AudioChunk(pcm[16000:], 1000)]
+
+        def export_chunks(chunks, work_dir):
+            work_dir.mkdir(parents=True)
+            (work_dir / "chunk_0.wav").write_bytes(b"RIFF")
+            return [work_dir / "chunk_0.wav"]
+
+        audio_processor.split_pcm.side_effect = split_pcm
+        audio_processor.export_chunks.side_effect = export_chunks
+        pool = MagicMock()
+        pool.transcribe = AsyncMock(side_effect=RuntimeError("Worker abgestürzt"))
+        executor = BoundedExecutor("upload", max_workers=1)
+
+        try:
+            with pytest.raises(RuntimeError, match="Worker abgestürzt"):
+                await transcribe_long_audio(
+                    pool, audio_processor, np.zeros(32000, dtype=np.float32), tmp_path, executor=executor
+                )
+        finally:
+            executor.shutdown()
+
+        assert threads and threads[0].startswith("upload")
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,103 @@
+"""
+Unit-Tests für Echtzeitfaktor und lastabhängige Modellwahl (ModelLadder)
+"""
+import asyncio
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+import sys
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.model_ladder import ModelLadder
+from queue_manager import TranscriptionQueueManager
+from utils.metrics import metrics
+from worker_pool import TranscriptionWorkerPool
+
+
+def make_ladder(**kwargs):
+    options = dict(queue_depth=4, wait_s=2.0, recover_depth=1, hold_s=0.0)
+    options.update(kwargs)
+    return ModelLadder(["large-v3", "small", "base"], **options)
+
+
+class TestModelLadder:
+    """Tests für Stufenwechsel und Messung"""
+
+    def test_steps_down_under_load_and_back(self):
+        ladder = make_ladder()
+        switches = metrics.get_counter("transcription.ladder.switches")
+
+        assert ladder.select(queue_depth=0, wait_seconds=0.0) is None
+        assert ladder.select(queue_depth=4, wait_seconds=0.0) == "small"
+        assert ladder.select(queue_depth=0, wait_seconds=2.5) == "base"
+        # Unterste Stufe erreicht
+        assert ladder.select(queue_depth=9, wait_seconds=9.0) == "base"
+        # Zwischen den Schwellen bleibt die Stufe
+        assert ladder.select(queue_depth=2, wait_seconds=0.0) == "base"
+        assert ladder.select(queue_depth=1, wait_seconds=0.5) == "small"
+        assert ladder.select(queue_depth=0, wait_seconds=0.0) is None
+
+        assert metrics.get_counter("transcription.ladder.switches") - switches == 4
+
+    def test_hold_time_prevents_flapping(self):
+        ladder = make_ladder(hold_s=60.0)
+
+        assert ladder.select(queue_depth=4, wait_seconds=0.0) == "small"
+        assert ladder.select(queue_depth=9, wait_seconds=0.0) == "small"
+        assert ladder.select(queue_depth=0, wait_seconds=0.0) == "small"
+
+    def test_disabled_without_smaller_models(self):
+        ladder = ModelLadder(["base"], queue_depth=1, hold_s=0.0)
+        assert not ladder.enabled
+        assert ladder.select(queue_depth=50, wait_seconds=50.0) is None
+
+    def test_rtf_per_model(self):
+        ladder = make_ladder()
+        ladder.record(None, 2.0, 4.0)
+        ladder.record("small", 1.0, 10.0)
+        ladder.record("small", 3.0, 10.0)
+        ladder.record("base", 1.0, 0.0)
+
+        assert ladder.rtf["large-v3"] == pytest.approx(0.5)
+        assert ladder.rtf["small"] == pytest.approx(0.1 + 0.2 * (0.3 - 0.1))
+        assert "base" not in ladder.rtf
+
+
+class TestQueueManagerLadder:
+    """Tests für die Modellwahl neuer Live-Chunks im Queue-Manager"""
+
+    @pytest.mark.asyncio
+    async def test_backlog_routes_new_chunks_to_smaller_model(self):
+        transcriber = MagicMock()
+        transcriber.transcribe_audio.return_value = ("<p>Text</p>", -0.1)
+        pool = TranscriptionWorkerPool(processes=0, transcriber=transcriber)
+        manager = TranscriptionQueueManager(
+            worker_pool=pool, max_workers=1, batch_size=1,
+            model_ladder=make_ladder(queue_depth=2)
+        )
+
+        done = asyncio.Event()
+        completed = []
+
+        async def callback(update):
+            if update["type"] == "transcription_result":
+                completed.append(update["task_id"])
+                if len(completed) == 4:
+                    done.set()
+
+        # 1 s s16le-Audio je Chunk; die Queue läuft voll, bevor die Worker starten
+        for i in range(4):
+            await manager.add_task(b"\x00\x00" * 16000, "", f"ws-{i}", callback)
+        await manager.start()
+        try:
+            await asyncio.wait_for(done.wait(), timeout=5)
+        finally:
+            await manager.stop()
+
+        model_sizes = [call.args[4] for call in transcriber.transcribe_audio.call_args_list]
+        assert model_sizes == [None, None, "small", "base"]
+        assert set(manager.model_ladder.rtf) == {"large-v3", "small", "base"}
@@ -0,0 +1,117 @@
+"""
+Unit-Tests für Modell-Server und -Client (Unix-Socket)
+"""
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+import sys
+
+import numpy as np
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from model_server import ModelServer, ModelServerClient
+from worker_pool import TranscriptionWorkerPool
+from utils.exceptions import ModelNotReadyError
+
+
+@pytest.fixture
+def fake_transcriber():
+    """Transcriber-Mock mit festen Ergebnissen"""
+    transcriber = MagicMock()
+    transcriber.transcribe_audio.return_value = ("<p>Formatiert</p>", -0.2)
+    transcriber.transcribe_chunk.return_value = ("Roh", np.float32(-0.3))
+    transcriber.transcribe_draft.return_value = ("Entwurf", -0.5)
+    transcriber.detect_language.return_value = ("en", 0.9)
+    transcriber.transcribe_batch.side_effect = lambda chunks, prompts, *_: [
+        (f"Text {len(chunk)}", -0.1) for chunk in chunks
+    ]
+    return transcriber
+
+
+async def start_server(tmp_path, transcriber) -> ModelServer:
+    """Startet einen Modell-Server mit In-Process-Pool auf einem Socket in tmp_path"""
+    pool = TranscriptionWorkerPool(processes=0, transcriber=transcriber)
+    server = ModelServer(socket_path=tmp_path / "model.sock", worker_pool=pool)
+    await server.start()
+    return server
+
+
+class TestModelServer:
+    """Tests für die Übergabe von Aufträgen über den Socket"""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, tmp_path, fake_transcriber):
+        """PCM, Kontext und Ergebnisse kommen unverändert an"""
+        server = await start_server(tmp_path, fake_transcriber)
+        client = ModelServerClient(socket_path=server.socket_path, connections=2)
+        await client.start()
+        try:
+            pcm = np.linspace(-0.5, 0.5, 1600, dtype=np.float32)
+            text, confidence = await client.transcribe(
+                pcm, "Kontext", post_process=False, profile="live", language="en"
+            )
+            draft, _ = await client.transcribe_draft(b"\x00\x01" * 10)
+            language = await client.detect_language(pcm)
+            batch = await client.transcribe_batch([pcm, pcm[:100]], post_process=False)
+            assert client.ready
+        finally:
+            await client.stop()
+            await server.stop()
+
+        assert (text, confidence) == ("Roh", pytest.approx(-0.3))
+        audio, previous_text, profile, language_arg, _, with_segments = fake_transcriber.transcribe_chunk.call_args[0]
+        np.testing.assert_array_equal(audio, pcm)
+        assert (previous_text, profile, language_arg, with_segments) == ("Kontext", "live", "en", False)
+        assert draft == "Entwurf"
+        fake_transcriber.transcribe_draft.assert_called_once_with(b"\x00\x01" * 10, None, None)
+        assert language == ("en", pytest.approx(0.9))
+        assert [text for text, _ in batch] == ["Text 1600", "Text 100"]
+        assert client.processes == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_propagated(self, tmp_path, fake_transcriber):
+        """Fehler des Servers kommen als ValueError bzw. TranscriptionError an"""
+        from utils.exceptions import TranscriptionError
+        fake_transcriber.transcribe_audio.side_effect = RuntimeError("Modell defekt")
+        server = await start_server(tmp_path, fake_transcriber)
+        client = ModelServerClient(socket_path=server.socket_path)
+        await client.start()
+        try:
+            with pytest.raises(ValueError, match="Unbekannte Operation"):
+                await client._request({"op": "unbekannt"})
+            with pytest.raises(TranscriptionError, match="Modell defekt"):
+                await client.transcribe(b"\x00\x00")
+        finally:
+            await client.stop()
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_start_is_shared(self, tmp_path, fake_transcriber):
+        """Mehrfache Aufrufe von start() teilen sich Start und Monitor-Task"""
+        import asyncio
+
+        server = await start_server(tmp_path, fake_transcriber)
+        client = ModelServerClient(socket_path=server.socket_path)
+        try:
+            await asyncio.gather(client.start(), client.start())
+            monitor = client._monitor_task
+            await client.start()
+            assert client._monitor_task is monitor
+            assert len([task for task in asyncio.all_tasks() if task.get_coro().__name__ == "_monitor"]) == 1
+        finally:
+            await client.stop()
+            await server.stop()
+
+        assert monitor.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server(self, tmp_path):
+        """Ohne Server wird mit 503 (ModelNotReadyError) abgelehnt"""
+        client = ModelServerClient(socket_path=tmp_path / "fehlt.sock")
+        with pytest.raises(ModelNotReadyError):
+            await client._request({"op": "status"})
+        assert not client.ready
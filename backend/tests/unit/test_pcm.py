@@ -0,0 +1,111 @@
+"""
+Unit-Tests für die In-Memory-PCM-Dekodierung
+"""
+import io
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+np = pytest.importorskip("numpy")
+
+from utils.pcm import pcm_to_float32, pcm_duration, read_wav_samples, SAMPLE_RATE
+from utils.exceptions import AudioProcessingError
+
+
+def _wav_bytes(samples, sample_rate=SAMPLE_RATE, channels=1) -> bytes:
+    """Erzeugt WAV-Bytes aus int16-Samples"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+
+class TestPcmToFloat32:
+    """Tests für pcm_to_float32"""
+
+    def test_float32_array_passthrough(self):
+        """float32-Arrays werden ohne Kopie durchgereicht"""
+        samples = np.zeros(SAMPLE_RATE, dtype=np.float32)
+        assert pcm_to_float32(samples) is samples
+
+    def test_raw_s16le_bytes(self):
+        """Rohe Bytes werden als s16le interpretiert und skaliert"""
+        raw = np.array([0, 16384, -32768], dtype=np.int16).tobytes()
+        result = pcm_to_float32(raw)
+        assert result.dtype == np.float32
+        assert np.allclose(result, [0.0, 0.5, -1.0])
+
+    def test_wav_bytes_mono(self):
+        """WAV-Bytes werden im Speicher dekodiert"""
+        samples = np.full(SAMPLE_RATE, 8192, dtype=np.int16)
+        result = pcm_to_float32(_wav_bytes(samples))
+        assert result.shape == (SAMPLE_RATE,)
+        assert np.allclose(result, 0.25)
+
+    def test_wav_bytes_stereo_resampled(self):
+        """Stereo-WAV mit 32 kHz wird zu 16 kHz Mono"""
+        stereo = np.tile(np.array([8192, -8192], dtype=np.int16), 32000)
+        result = pcm_to_float32(_wav_bytes(stereo, sample_rate=32000, channels=2))
+        assert result.shape == (SAMPLE_RATE,)
+        assert np.allclose(result, 0.0)
+
+    def test_wav_bytes_8bit(self):
+        """8-bit-WAV (vorzeichenlos) wird über denselben Parser wie read_wav_samples gelesen"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(1)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes(bytes([128, 192, 64]))
+        data = buffer.getvalue()
+
+        assert read_wav_samples(data).samples.tolist() == [0, 64, -64]
+        assert np.allclose(pcm_to_float32(data), [0.0, 0.5, -0.5])
+
+    def test_unsupported_sample_width_raises(self):
+        """24-bit-WAV wird in beiden Lesepfaden mit derselben Meldung abgelehnt"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(3)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes(bytes(6))
+        data = buffer.getvalue()
+
+        for read in (read_wav_samples, pcm_to_float32):
+            with pytest.raises(AudioProcessingError, match="Samplebreite"):
+                read(data)
+
+    def test_invalid_wav_raises(self):
+        """Defekte WAV-Header führen zu AudioProcessingError"""
+        with pytest.raises(AudioProcessingError):
+            pcm_to_float32(b"RIFF\x00\x00\x00\x00WAVEgarbage")
+
+
+class TestPcmDuration:
+    """Tests für die Dauer ohne Dekodierung"""
+
+    def test_duration_from_wav_header(self, monkeypatch):
+        """WAV-Dauer stammt aus dem Header, auch bei anderer Abtastrate und Stereo"""
+        import utils.pcm
+        data = _wav_bytes(np.zeros(2 * 44100, dtype=np.int16), sample_rate=44100, channels=2)
+        # Die Samples werden dafür nicht dekodiert
+        monkeypatch.setattr(utils.pcm, "_decode_wav", None)
+
+        assert pcm_duration(data) == pytest.approx(1.0)
+        assert pcm_duration(memoryview(data)) == pytest.approx(1.0)
+
+    def test_duration_of_raw_bytes_and_arrays(self):
+        """Rohe s16le-Bytes und Arrays ergeben die Dauer aus der Sampleanzahl"""
+        assert pcm_duration(b"\x00\x00" * 8000) == pytest.approx(0.5)
+        assert pcm_duration(np.zeros(4000, dtype=np.float32)) == pytest.approx(0.25)
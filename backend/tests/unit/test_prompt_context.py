@@ -0,0 +1,86 @@
+"""
+Unit-Tests für den rollierenden Prompt-Kontext pro Aufnahme
+"""
+import pytest
+from pathlib import Path
+import sys
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.prompt_context import SessionPromptContext, estimate_tokens, trim_prompt
+
+
+class TestTrimPrompt:
+    """Tests für das Kürzen auf das Token-Budget"""
+
+    def test_keeps_most_recent_words(self):
+        text = "eins zwei drei vier fuenf"
+        budget = estimate_tokens("vier") + estimate_tokens("fuenf")
+        assert trim_prompt(text, budget) == "vier fuenf"
+
+    def test_disabled_or_empty(self):
+        assert trim_prompt("Protokoll der Sitzung", 0) is None
+        assert trim_prompt("", 10) is None
+
+
+class TestSessionPromptContext:
+    """Tests für Fortschreiben, Begrenzung und Isolation der Sessions"""
+
+    def test_confirmed_text_becomes_prompt(self):
+        context = SessionPromptContext(max_tokens=50, ttl=3600)
+        assert context.get("s1") is None
+
+        context.confirm("s1", "Der Anästhesist")
+        context.confirm("s1", "prüft die Prämedikation.")
+        assert context.get("s1") == "Der Anästhesist prüft die Prämedikation."
+        assert context.get("s2") is None
+
+    def test_context_is_bounded(self):
+        context = SessionPromptContext(max_tokens=12, ttl=3600)
+        for index in range(50):
+            context.confirm("s1", f"wort{index} weiter")
+
+        prompt = context.get("s1")
+        assert prompt.endswith("wort49 weiter")
+        assert sum(estimate_tokens(word) for word in prompt.split()) <= 12
+
+    def test_no_context_without_session_or_budget(self):
+        context = SessionPromptContext(max_tokens=0, ttl=3600)
+        context.confirm("s1", "Text")
+        assert context.get("s1") is None
+
+        context = SessionPromptContext(max_tokens=50, ttl=3600)
+        context.confirm(None, "Text")
+        assert context.get(None) is None
+
+    def test_confirm_in_chunk_order(self):
+        context = SessionPromptContext(max_tokens=50, ttl=3600)
+        first, second, third = (context.reserve("s1") for _ in range(3))
+
+        context.confirm("s1", "drei", third)
+        context.confirm("s1", "zwei", second)
+        assert context.get("s1") is None
+
+        # Fehlgeschlagener Chunk gibt die folgenden frei
+        context.confirm("s1", "", first)
+        assert context.get("s1") == "zwei drei"
+
+    def test_confirm_after_discard_is_ignored(self):
+        context = SessionPromptContext(max_tokens=50, ttl=3600)
+        first, second = context.reserve("s1"), context.reserve("s1")
+        context.discard("s1")
+
+        # Noch laufende Chunks der getrennten Session
+        context.confirm("s1", "zwei", second)
+        context.confirm("s1", "eins", first)
+        assert context._contexts == {}
+
+    def test_expired_sessions_are_removed(self):
+        context = SessionPromptContext(max_tokens=50, ttl=0)
+        context.confirm("s1", "Text")
+        context._contexts["s1"].last_used -= 1
+        assert context.get("s1") is None
+        assert context._contexts == {}
@@ -96,7 +96,7 @@ class TestTranscribeChunk:
     
     def test_transcribe_chunk(self, reset_singleton, mock_whisper_model,
                               mock_openai_client, mock_torch, mock_settings,
-                              mock_logger, tmp_path):
+                              mock_logger):
         """Testet Chunk-Transkription ohne LLM-Nachbearbeitung"""
         transcriber = Transcriber()
         
@@ -109,23 +109,11 @@ class TestTranscribeChunk:
             ]
         }
         
-        # Temporäres Verzeichnis für Chunk-Datei erstellen
-        temp_dir = tmp_path / "temp"
-        temp_dir.mkdir(exist_ok=True)
+        # Audio-Chunk-Daten (rohes 16-bit PCM)
+        audio_chunk = b"\x00\x01" * 1600
         
-        # Mock Path("temp") um auf unser temporäres Verzeichnis zu zeigen
-        def mock_path_constructor(path_str):
-            if path_str == "temp":
-                return temp_dir
-            return Path(path_str)
-        
-        # Audio-Chunk-Daten
-        audio_chunk = b"fake audio chunk data"
-        
-        # Mock Path-Konstruktor in transcriber-Modul
-        with patch("transcriber.Path", side_effect=lambda x: mock_path_constructor(x) if isinstance(x, str) else Path(x)):
-            # Chunk-Transkription durchführen
-            text, confidence = transcriber.transcribe_chunk(audio_chunk)
+        # Chunk-Transkription durchführen
+        text, confidence = transcriber.transcribe_chunk(audio_chunk)
         
         # Verifizieren
         assert text == "Chunk Text"  # Strip angewendet
@@ -135,6 +123,39 @@ class TestTranscribeChunk:
         
         # Verifizieren, dass keine LLM-Nachbearbeitung stattfindet
         mock_openai_client["client"].chat.completions.create.assert_not_called()
+    
+    def test_transcribe_chunk_passes_pcm_in_memory(self, reset_singleton, mock_whisper_model,
+                                                   mock_openai_client, mock_torch, mock_settings,
+                                                   mock_logger):
+        """Testet, dass Chunks als float32-Array statt als Datei an Whisper gehen"""
+        import numpy as np
+        transcriber = Transcriber()
+        
+        samples = np.zeros(16000, dtype=np.float32)
+        transcriber.transcribe_chunk(samples)
+        
+        audio_arg = mock_whisper_model["model"].transcribe.call_args[0][0]
+        assert audio_arg is samples
+
+
+class TestTranscribeAudioPCM:
+    """Tests für transcribe_audio mit PCM-Eingabe"""
+    
+    def test_transcribe_audio_with_pcm_bytes(self, reset_singleton, mock_whisper_model,
+                                             mock_openai_client, mock_torch, mock_settings,
+                                             mock_logger):
+        """Testet, dass rohe PCM-Bytes ohne Temp-Datei dekodiert werden"""
+        import numpy as np
+        transcriber = Transcriber()
+        
+        pcm = (np.ones(8000, dtype=np.int16) * 16384).tobytes()
+        transcriber.transcribe_audio(pcm)
+        
+        audio_arg = mock_whisper_model["model"].transcribe.call_args[0][0]
+        assert isinstance(audio_arg, np.ndarray)
+        assert audio_arg.dtype == np.float32
+        assert audio_arg.shape == (8000,)
+        assert abs(float(audio_arg[0]) - 0.5) < 1e-6
 
 
 class TestPostProcessTranscription:
@@ -220,6 +241,29 @@ class TestReloadModel:
         
         # Verifizieren, dass load_model aufgerufen wurde
         assert mock_whisper_model["load_model"].call_count >= 2  # Einmal bei Init, einmal bei Reload
+    
+    def test_reload_model_waits_for_inflight(self, reset_singleton, mock_whisper_model,
+                                             mock_openai_client, mock_torch, mock_settings,
+                                             mock_logger):
+        """Testet, dass das alte Modell erst nach laufenden Aufrufen freigegeben wird"""
+        import threading
+        transcriber = Transcriber()
+        old_model = transcriber.model
+        new_model = MagicMock()
+        mock_whisper_model["load_model"].return_value = new_model
+        
+        with transcriber._acquire_engine() as engine:
+            reload_thread = threading.Thread(target=transcriber.reload_model)
+            reload_thread.start()
+            reload_thread.join(timeout=0.2)
+            
+            # Neues Modell ist bereits aktiv, Reload wartet aber noch auf den laufenden Aufruf
+            assert engine.model is old_model
+            assert transcriber.model is new_model
+            assert reload_thread.is_alive()
+        
+        reload_thread.join(timeout=2)
+        assert not reload_thread.is_alive()
 
 
 class TestConfidenceCalculation:
@@ -293,3 +337,309 @@ class TestConfidenceCalculation:
         # Verifizieren, dass Konfidenz 0.0 ist
         assert confidence == 0.0
 
+
+
+class TestQuantization:
+    """Tests für die int8-Quantisierung"""
+    
+    def test_int8_quantization_on_cpu(self, reset_singleton, mock_whisper_model,
+                                      mock_openai_client, mock_torch, mock_settings,
+                                      mock_logger):
+        """Testet, dass das Modell auf CPU dynamisch quantisiert wird"""
+        mock_settings.WHISPER_QUANTIZATION = "int8"
+        quantized_model = MagicMock()
+        mock_torch.ao.quantization.quantize_dynamic.return_value = quantized_model
+        
+        transcriber = Transcriber()
+        
+        assert transcriber.model is quantized_model
+        args, kwargs = mock_torch.ao.quantization.quantize_dynamic.call_args
+        assert args[0] is mock_whisper_model["model"]
+        assert kwargs["dtype"] is mock_torch.qint8
+    
+    def test_quantization_skipped_on_cuda(self, reset_singleton, mock_whisper_model,
+                                          mock_openai_client, mock_torch, mock_settings,
+                                          mock_logger):
+        """Testet, dass auf der GPU keine int8-Quantisierung erfolgt"""
+        mock_settings.WHISPER_QUANTIZATION = "int8"
+        mock_torch.cuda.is_available.return_value = True
+        
+        transcriber = Transcriber()
+        
+        assert transcriber.model is mock_whisper_model["model"]
+        mock_torch.ao.quantization.quantize_dynamic.assert_not_called()
+    
+    def test_unknown_quantization_mode(self, reset_singleton, mock_whisper_model,
+                                       mock_openai_client, mock_torch, mock_settings,
+                                       mock_logger):
+        """Testet, dass unbekannte Modi abgelehnt werden"""
+        mock_settings.WHISPER_QUANTIZATION = "int4"
+        
+        with pytest.raises(ValueError, match="Quantisierungsmodus"):
+            Transcriber()
+
+
+class TestEngineSelection:
+    """Tests für die Auswahl der ASR-Engine"""
+    
+    def test_default_engine_is_whisper(self, reset_singleton, mock_whisper_model,
+                                       mock_openai_client, mock_torch, mock_settings,
+                                       mock_logger):
+        """Testet, dass standardmäßig openai-whisper verwendet wird"""
+        from engines.whisper_engine import WhisperEngine
+        transcriber = Transcriber()
+        
+        assert isinstance(transcriber.engine, WhisperEngine)
+        assert transcriber.model is mock_whisper_model["model"]
+        assert transcriber.model_size == "base"
+    
+    def test_unknown_engine(self, reset_singleton, mock_whisper_model,
+                            mock_openai_client, mock_torch, mock_settings,
+                            mock_logger):
+        """Testet, dass unbekannte Engines abgelehnt werden"""
+        mock_settings.ASR_ENGINE = "kaldi"
+        
+        with pytest.raises(ValueError, match="ASR-Engine"):
+            Transcriber()
+    
+    def test_transcribe_batch_uses_engine(self, reset_singleton, mock_whisper_model,
+                                          mock_openai_client, mock_torch, mock_settings,
+                                          mock_logger):
+        """Testet, dass Batches an die Engine delegiert werden"""
+        transcriber = Transcriber()
+        transcriber.engine = MagicMock()
+        transcriber.engine.transcribe_batch.return_value = [
+            {"text": " Eins ", "segments": [{"avg_logprob": -0.1}]},
+            {"text": " Zwei ", "segments": [{"avg_logprob": -0.3}]}
+        ]
+        
+        results = transcriber.transcribe_batch(
+            [b"\x00\x01" * 1600, b"\x00\x01" * 1600], post_process=False
+        )
+        
+        assert [text for text, _ in results] == ["Eins", "Zwei"]
+        args, _ = transcriber.engine.transcribe_batch.call_args
+        assert args[2]["language"] == "de"
+
+
+    @pytest.mark.parametrize("beam_size, batch_sizes", [(None, [2, 1]), (5, [1, 1, 1])])
+    def test_batch_decoding_with_beam_search(self, mock_whisper_model, monkeypatch, beam_size, batch_sizes):
+        """Testet, dass Beam-Search jeden Chunk einzeln an whisper.decode übergibt"""
+        from types import SimpleNamespace
+        import numpy as np
+        from engines import whisper_engine
+
+        calls = []
+
+        def decode(model, mel, options):
+            # Whisper scheitert bei Beam-Search mit mehr als einem Chunk (Tensorgrößen)
+            if options.beam_size and mel.shape[0] > 1:
+                raise RuntimeError("The size of tensor a must match the size of tensor b")
+            calls.append((mel.shape[0], options.prompt))
+            return [
+                SimpleNamespace(text=f" {options.prompt}", language="de", avg_logprob=-0.1, no_speech_prob=0.0)
+                for _ in range(mel.shape[0])
+            ]
+
+        # Shape-prüfender Ersatz für whisper/torch: Mel-Spektrogramm = PCM
+        monkeypatch.setattr(whisper_engine.whisper, "decode", decode)
+        monkeypatch.setattr(whisper_engine.whisper, "DecodingOptions", SimpleNamespace)
+        monkeypatch.setattr(whisper_engine.whisper, "pad_or_trim", lambda pcm: pcm)
+        monkeypatch.setattr(whisper_engine.whisper, "log_mel_spectrogram", lambda pcm, n_mels, device: pcm)
+        monkeypatch.setattr(whisper_engine.whisper.audio, "N_SAMPLES", 480000)
+        monkeypatch.setattr(whisper_engine.whisper.audio, "SAMPLE_RATE", 16000)
+        monkeypatch.setattr(whisper_engine, "torch", SimpleNamespace(stack=np.stack))
+        mock_whisper_model["model"].dims.n_mels = 80
+        mock_whisper_model["model"].device = "cpu"
+        engine = whisper_engine.WhisperEngine("base", "cpu")
+        pcms = [np.zeros(16000, dtype=np.float32) for _ in range(3)]
+
+        results = engine.transcribe_batch(pcms, ["A", "A", "B"], {"language": "de", "beam_size": beam_size})
+
+        assert [result["text"] for result in results] == [" A", " A", " B"]
+        assert [size for size, _ in calls] == batch_sizes
+    
+    def test_draft_engine_for_live_slices(self, reset_singleton, mock_whisper_model,
+                                          mock_openai_client, mock_torch, mock_settings,
+                                          mock_logger):
+        """Testet, dass Entwürfe auf dem Entwurfsmodell mit dem Live-Profil laufen"""
+        mock_settings.WHISPER_DRAFT_MODEL = "tiny"
+        transcriber = Transcriber()
+        transcriber.engine = MagicMock()
+        transcriber.draft_engine = MagicMock()
+        transcriber.draft_engine.transcribe.return_value = {"text": " Entwurf ", "segments": []}
+        
+        text, _ = transcriber.transcribe_draft(b"\x00\x01" * 1600)
+        
+        assert text == "Entwurf"
+        transcriber.engine.transcribe.assert_not_called()
+        args, _ = transcriber.draft_engine.transcribe.call_args
+        assert args[2]["temperature"] == (0.0,)
+    
+    def test_draft_falls_back_to_main_engine(self, reset_singleton, mock_whisper_model,
+                                             mock_openai_client, mock_torch, mock_settings,
+                                             mock_logger):
+        """Testet, dass ohne Entwurfsmodell das Hauptmodell verwendet wird"""
+        transcriber = Transcriber()
+        
+        assert transcriber.draft_engine is None
+        transcriber.transcribe_draft(b"\x00\x01" * 1600)
+        mock_whisper_model["model"].transcribe.assert_called_once()
+
+
+class TestFidelityProfiles:
+    """Tests für die Fidelity-Profile"""
+    
+    def test_live_profile_skips_word_timestamps_and_fallback(self, reset_singleton, mock_whisper_model,
+                                                             mock_openai_client, mock_torch, mock_settings,
+                                                             mock_logger):
+        """Testet, dass das Live-Profil nur einen greedy Durchlauf anfordert"""
+        transcriber = Transcriber()
+        
+        transcriber.transcribe_chunk(b"\x00\x01" * 1600, profile="live")
+        
+        _, kwargs = mock_whisper_model["model"].transcribe.call_args
+        assert kwargs["word_timestamps"] is False
+        assert kwargs["temperature"] == (0.0,)
+        assert kwargs["beam_size"] is None
+        assert kwargs["language"] == "de"
+    
+    def test_archival_profile_uses_beam_search(self, reset_singleton, mock_whisper_model,
+                                               mock_openai_client, mock_torch, mock_settings,
+                                               mock_logger):
+        """Testet, dass das Archiv-Profil Beam-Search und Wortzeitstempel nutzt"""
+        transcriber = Transcriber()
+        
+        transcriber.transcribe_chunk(b"\x00\x01" * 1600, profile="archival")
+        
+        _, kwargs = mock_whisper_model["model"].transcribe.call_args
+        assert kwargs["word_timestamps"] is True
+        assert kwargs["beam_size"] == 5
+        assert len(kwargs["temperature"]) == 6
+    
+    def test_unknown_profile(self, reset_singleton, mock_whisper_model,
+                             mock_openai_client, mock_torch, mock_settings,
+                             mock_logger):
+        """Testet, dass unbekannte Profile abgelehnt werden"""
+        transcriber = Transcriber()
+        
+        with pytest.raises(ValueError, match="Fidelity-Profil"):
+            transcriber.transcribe_chunk(b"\x00\x01" * 1600, profile="ultra")
+
+    
+    def test_session_language_overrides_default(self, reset_singleton, mock_whisper_model,
+                                                mock_openai_client, mock_torch, mock_settings,
+                                                mock_logger):
+        """Testet, dass eine erkannte Sitzungssprache an Whisper übergeben wird"""
+        transcriber = Transcriber()
+        
+        transcriber.transcribe_chunk(b"\x00\x01" * 1600, profile="live", language="en")
+        _, kwargs = mock_whisper_model["model"].transcribe.call_args
+        assert kwargs["language"] == "en"
+        
+        # "auto" ohne erkannte Sprache: Whisper erkennt selbst
+        mock_settings.WHISPER_LANGUAGE = "auto"
+        transcriber.transcribe_chunk(b"\x00\x01" * 1600, profile="live")
+        _, kwargs = mock_whisper_model["model"].transcribe.call_args
+        assert kwargs["language"] is None
+
+
+class TestVoiceActivity:
+    """Tests für VAD-Vorschnitt und das Verwerfen von 'keine Sprache'-Segmenten"""
+    
+    @pytest.fixture(autouse=True)
+    def reset_metrics(self):
+        from utils.metrics import metrics
+        metrics.reset()
+        yield
+        metrics.reset()
+    
+    @staticmethod
+    def _speech(seconds_silence: float, seconds_speech: float):
+        import numpy as np
+        silence = np.zeros(int(seconds_silence * 16000), dtype=np.float32)
+        speech = 0.1 * np.sin(np.arange(int(seconds_speech * 16000), dtype=np.float32) * 0.1)
+        return np.concatenate([silence, speech, silence])
+    
+    def test_silent_chunk_is_not_decoded(self, reset_singleton, mock_whisper_model,
+                                         mock_openai_client, mock_torch, mock_settings,
+                                         mock_logger):
+        """Testet, dass Chunks ohne Sprache Whisper nicht erreichen"""
+        import numpy as np
+        from utils.metrics import metrics
+        mock_settings.VAD_ENABLED = True
+        transcriber = Transcriber()
+        
+        text, _ = transcriber.transcribe_chunk(np.zeros(32000, dtype=np.float32))
+        
+        assert text == ""
+        mock_whisper_model["model"].transcribe.assert_not_called()
+        assert metrics.get_counter("vad.chunks_skipped") == 1
+        assert metrics.get_counter("vad.skipped_seconds") == pytest.approx(2.0)
+    
+    def test_leading_and_trailing_silence_trimmed(self, reset_singleton, mock_whisper_model,
+                                                  mock_openai_client, mock_torch, mock_settings,
+                                                  mock_logger):
+        """Testet, dass nur der Sprachbereich an Whisper übergeben wird"""
+        from utils.metrics import metrics
+        mock_settings.VAD_ENABLED = True
+        transcriber = Transcriber()
+        
+        transcriber.transcribe_chunk(self._speech(2.0, 1.0))
+        
+        audio_arg = mock_whisper_model["model"].transcribe.call_args[0][0]
+        # 1 s Sprache plus Rand (VAD_PADDING_MS) statt 5 s
+        assert len(audio_arg) < 2 * 16000
+        assert metrics.get_counter("vad.trimmed_seconds") > 3.0
+    
+    def test_no_speech_segments_discarded(self, reset_singleton, mock_whisper_model,
+                                          mock_openai_client, mock_torch, mock_settings,
+                                          mock_logger):
+        """Testet, dass von Whisper als 'keine Sprache' markierte Segmente entfallen"""
+        from utils.metrics import metrics
+        mock_whisper_model["model"].transcribe.return_value = {
+            "text": " Hallo Untertitel",
+            "segments": [
+                {"text": " Hallo", "avg_logprob": -0.2, "no_speech_prob": 0.1},
+                {"text": " Untertitel", "avg_logprob": -1.5, "no_speech_prob": 0.9}
+            ]
+        }
+        transcriber = Transcriber()
+        
+        text, confidence = transcriber.transcribe_chunk(b"\x00\x01" * 1600)
+        
+        assert text == "Hallo"
+        assert confidence == pytest.approx(-0.2)
+        assert metrics.get_counter("no_speech.discarded_segments") == 1
+    
+    def test_batch_skips_silent_chunks(self, reset_singleton, mock_whisper_model,
+                                       mock_openai_client, mock_torch, mock_settings,
+                                       mock_logger):
+        """Testet, dass stille Chunks aus dem Batch herausgenommen werden"""
+        import numpy as np
+        mock_settings.VAD_ENABLED = True
+        transcriber = Transcriber()
+        transcriber.engine = MagicMock()
+        transcriber.engine.transcribe_batch.return_value = [{"text": " Zwei", "segments": []}]
+        
+        results = transcriber.transcribe_batch(
+            [np.zeros(16000, dtype=np.float32), self._speech(0.5, 1.0)], post_process=False
+        )
+        
+        assert [text for text, _ in results] == ["", "Zwei"]
+        args, _ = transcriber.engine.transcribe_batch.call_args
+        assert len(args[0]) == 1
+    
+    def test_warm_up_bypasses_vad(self, reset_singleton, mock_whisper_model,
+                                  mock_openai_client, mock_torch, mock_settings,
+                                  mock_logger):
+        """Testet, dass der Warm-up den stillen Clip trotz VAD dekodiert"""
+        mock_settings.VAD_ENABLED = True
+        transcriber = Transcriber()
+        
+        transcriber.warm_up()
+        
+        audio_arg = mock_whisper_model["model"].transcribe.call_args[0][0]
+        assert len(audio_arg) == 16000
+        assert not audio_arg.any()
+
@@ -0,0 +1,99 @@
+"""
+Unit-Tests für den TranscriptionCache
+"""
+import pytest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.transcription_cache import TranscriptionCache
+from utils.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def pcm():
+    return np.linspace(-0.5, 0.5, 16000, dtype=np.float32)
+
+
+class TestCacheKey:
+    """Tests für die Schlüsselbildung"""
+
+    def test_same_audio_same_key(self, pcm):
+        assert TranscriptionCache.make_key(pcm) == TranscriptionCache.make_key(pcm.copy())
+
+    def test_key_depends_on_audio_prompt_and_model(self, pcm, monkeypatch):
+        from services import transcription_cache
+        base = TranscriptionCache.make_key(pcm)
+
+        assert TranscriptionCache.make_key(pcm[:-1]) != base
+        assert TranscriptionCache.make_key(pcm, prompt="Kontext") != base
+        assert TranscriptionCache.make_key(pcm, language="en") != base
+
+        monkeypatch.setattr(transcription_cache.settings, "WHISPER_MODEL", "large-v3")
+        assert TranscriptionCache.make_key(pcm) != base
+
+
+class TestCacheTiers:
+    """Tests für Speicher- und Festplatten-Tier"""
+
+    def test_miss_then_memory_hit(self, tmp_path):
+        cache = TranscriptionCache(cache_dir=tmp_path, memory_limit_bytes=10_000, disk_limit_bytes=10_000)
+
+        assert cache.get("a") is None
+        cache.put("a", "Hallo", -0.2)
+        entry = cache.get("a")
+
+        assert entry["text"] == "Hallo"
+        assert entry["formatted_text"] is None
+        counters = metrics.snapshot()["counters"]
+        assert counters["transcription_cache.misses"] == 1
+        assert counters["transcription_cache.hits.memory"] == 1
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        cache = TranscriptionCache(cache_dir=tmp_path, memory_limit_bytes=10_000, disk_limit_bytes=10_000)
+        cache.put("a", "Hallo", -0.2)
+        cache.set_formatted("a", "<p>Hallo.</p>")
+
+        restarted = TranscriptionCache(cache_dir=tmp_path, memory_limit_bytes=10_000, disk_limit_bytes=10_000)
+        entry = restarted.get("a")
+
+        assert entry["formatted_text"] == "<p>Hallo.</p>"
+        assert metrics.get_counter("transcription_cache.hits.disk") == 1
+        # Festplatten-Treffer landen im Speicher-Tier
+        restarted.get("a")
+        assert metrics.get_counter("transcription_cache.hits.memory") == 1
+
+    def test_memory_lru_eviction_by_size(self, tmp_path):
+        cache = TranscriptionCache(cache_dir=tmp_path, memory_limit_bytes=350, disk_limit_bytes=0)
+        cache.put("a", "x" * 60, 0.0)
+        cache.put("b", "x" * 60, 0.0)
+        cache.get("a")  # a ist jetzt zuletzt verwendet
+        cache.put("c", "x" * 60, 0.0)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert metrics.get_counter("transcription_cache.evictions.memory") == 1
+
+    def test_disk_lru_eviction_by_size(self, tmp_path):
+        cache = TranscriptionCache(cache_dir=tmp_path, memory_limit_bytes=0, disk_limit_bytes=350)
+        cache.put("a", "x" * 60, 0.0)
+        cache.put("b", "x" * 60, 0.0)
+        cache.put("c", "x" * 60, 0.0)
+
+        assert not (tmp_path / "a.json").exists()
+        assert (tmp_path / "c.json").exists()
+        assert cache.stats()["disk_bytes"] <= 350
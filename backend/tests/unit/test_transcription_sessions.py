@@ -0,0 +1,195 @@
+"""
+Unit-Tests für den TranscriptionSessionManager (zweistufige Transkription)
+"""
+import asyncio
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+import sys
+
+import numpy as np
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from services.transcription_sessions import TranscriptionSessionManager
+from utils.exceptions import AudioProcessingError
+from audio_processor import AudioChunk
+
+
+@pytest.fixture
+def worker_pool():
+    """Worker-Pool-Mock, der die Chunk-Länge als Text zurückgibt"""
+    pool = MagicMock()
+
+    async def transcribe(audio, previous_text=None, post_process=True, profile=None, language=None):
+        return f"chunk{len(audio)}", -0.2
+
+    pool.transcribe = AsyncMock(side_effect=transcribe)
+    return pool
+
+
+@pytest.fixture
+def draft_model(monkeypatch):
+    """Entwürfe stammen von einem eigenen Entwurfsmodell"""
+    from services import transcription_sessions
+    monkeypatch.setattr(transcription_sessions.settings, "WHISPER_MODEL", "large-v3")
+    monkeypatch.setattr(transcription_sessions.settings, "WHISPER_DRAFT_MODEL", "tiny")
+
+
+@pytest.fixture
+def no_draft_model(monkeypatch):
+    """Entwürfe stammen vom Hauptmodell"""
+    from services import transcription_sessions
+    monkeypatch.setattr(transcription_sessions.settings, "WHISPER_MODEL", "large-v3")
+    monkeypatch.setattr(transcription_sessions.settings, "WHISPER_DRAFT_MODEL", "")
+
+
+async def wait_for_session(manager, session_id, timeout=5):
+    """Wartet, bis der finale Durchlauf abgeschlossen ist"""
+    async def poll():
+        while manager.get(session_id).finished_at is None:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+    return manager.get(session_id)
+
+
+class TestTranscriptionSessions:
+    """Tests für Entwürfe und den finalen Durchlauf"""
+
+    @pytest.mark.asyncio
+    async def test_final_pass_reuses_draft_boundaries(self, worker_pool, tmp_path, draft_model):
+        """Der finale Durchlauf transkribiert an den Grenzen der Entwürfe, mit Kontext"""
+        audio_processor = MagicMock()
+        formatter = MagicMock()
+        formatter.submit.return_value = "fmt-1"
+        manager = TranscriptionSessionManager(
+            worker_pool, audio_processor, formatter=formatter, work_dir=tmp_path, profile="archival"
+        )
+
+        manager.add_draft("s1", np.zeros(16000, dtype=np.float32), "entwurf eins")
+        manager.add_draft("s1", np.zeros(8000, dtype=np.float32), "entwurf zwei")
+        assert manager.get("s1").to_dict()["draft_text"] == "entwurf eins entwurf zwei"
+        assert manager.get("s1").boundaries == [16000, 24000]
+
+        manager.finalize("s1")
+        session = await wait_for_session(manager, "s1")
+
+        assert session.state == "completed"
+        assert session.text == "chunk16000 chunk8000"
+        assert session.chunks == 2
+        assert session.formatting_id == "fmt-1"
+        audio_processor.split_pcm.assert_not_called()
+        second_call = worker_pool.transcribe.call_args_list[1]
+        assert second_call.kwargs["previous_text"] == "chunk16000"
+        assert second_call.kwargs["profile"] == "archival"
+        assert second_call.kwargs["post_process"] is False
+        # Ohne AUDIO_EXPORT_CHUNKS entstehen keine Dateien
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_uploaded_recording_adds_tail_chunk(self, worker_pool, tmp_path, draft_model):
+        """Audio hinter dem letzten Slice der Gesamtaufnahme wird als eigener Chunk transkribiert"""
+        manager = TranscriptionSessionManager(worker_pool, MagicMock(), work_dir=tmp_path)
+
+        manager.add_draft("s1", np.zeros(16000, dtype=np.float32), "entwurf")
+        manager.finalize("s1", np.zeros(20000, dtype=np.float32))
+        session = await wait_for_session(manager, "s1")
+
+        assert session.text == "chunk16000 chunk4000"
+
+    @pytest.mark.asyncio
+    async def test_drafts_of_main_model_are_reused(self, worker_pool, tmp_path, no_draft_model):
+        """Mit Hauptmodell und Live-Profil werden die Entwürfe übernommen und nur der Rest transkribiert"""
+        formatter = MagicMock()
+        manager = TranscriptionSessionManager(
+            worker_pool, MagicMock(), formatter=formatter, work_dir=tmp_path, profile="live"
+        )
+
+        manager.add_draft("s1", np.zeros(16000, dtype=np.float32), "eins")
+        manager.add_draft("s1", np.zeros(16000, dtype=np.float32), "")
+        manager.add_draft("s1", np.zeros(16000, dtype=np.float32), "drei")
+        manager.finalize("s1", np.zeros(56000, dtype=np.float32))
+        session = await wait_for_session(manager, "s1")
+
+        assert session.text == "eins drei chunk8000"
+        worker_pool.transcribe.assert_called_once()
+        assert worker_pool.transcribe.call_args.kwargs["previous_text"] == "drei"
+        formatter.submit.assert_called_once_with("eins drei chunk8000", session_id="s1")
+
+    @pytest.mark.asyncio
+    async def test_drafts_without_tail_skip_final_pass(self, worker_pool, tmp_path, no_draft_model):
+        """Ohne Entwurfsmodell, mit Live-Profil und ohne Rest läuft Whisper kein zweites Mal"""
+        manager = TranscriptionSessionManager(worker_pool, MagicMock(), work_dir=tmp_path, profile="live")
+
+        manager.add_draft("s1", np.zeros(16000, dtype=np.float32), "eins")
+        manager.add_draft("s1", np.zeros(16000, dtype=np.float32), "zwei")
+        manager.finalize("s1")
+        session = await wait_for_session(manager, "s1")
+
+        assert session.state == "completed"
+        assert session.text == "eins zwei"
+        assert session.progress == 1.0
+        worker_pool.transcribe.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_drafts_are_retranscribed_with_final_profile(self, worker_pool, tmp_path, no_draft_model):
+        """Ohne Entwurfsmodell transkribiert das finale Profil trotzdem jeden Chunk neu"""
+        manager = TranscriptionSessionManager(worker_pool, MagicMock(), work_dir=tmp_path, profile="archival")
+
+        manager.add_draft("s1", np.zeros(16000, dtype=np.float32), "eins")
+        manager.add_draft("s1", np.zeros(8000, dtype=np.float32), "zwei")
+        manager.finalize("s1")
+        session = await wait_for_session(manager, "s1")
+
+        assert session.text == "chunk16000 chunk8000"
+        assert [call.kwargs["profile"] for call in worker_pool.transcribe.call_args_list] == ["archival"] * 2
+
+    @pytest.mark.asyncio
+    async def test_unsplittable_recording_is_transcribed_whole(self, worker_pool, tmp_path):
+        """Ohne Pausen wird die vollständige Aufnahme als ein Chunk transkribiert"""
+        audio_processor = MagicMock()
+        audio_processor.split_pcm.side_effect = AudioProcessingError("Keine gültigen Audiochunks erzeugt")
+        manager = TranscriptionSessionManager(worker_pool, audio_processor, work_dir=tmp_path)
+
+        # Ohne Entwürfe wird die hochgeladene Aufnahme an Pausen geteilt
+        manager.finalize("s1", np.zeros(32000, dtype=np.float32))
+        session = await wait_for_session(manager, "s1")
+
+        assert session.state == "completed"
+        assert session.text == "chunk32000"
+        assert session.chunks == 1
+
+    def test_finalize_without_audio(self, worker_pool, tmp_path):
+        """Unbekannte Sessions ohne Audio werden abgelehnt"""
+        manager = TranscriptionSessionManager(worker_pool, MagicMock(), work_dir=tmp_path)
+
+        with pytest.raises(ValueError, match="Unbekannte Session"):
+            manager.finalize("fehlt")
+
+    def test_expired_sessions_are_purged(self, worker_pool, tmp_path):
+        """Abgeschlossene Sessions werden nach Ablauf der TTL entfernt"""
+        manager = TranscriptionSessionManager(worker_pool, MagicMock(), work_dir=tmp_path, ttl=0)
+        manager.add_draft("alt", np.zeros(10, dtype=np.float32), "text")
+        manager.sessions["alt"].finished_at = 0.0
+
+        manager.add_draft("neu", np.zeros(10, dtype=np.float32), "text")
+
+        assert manager.get("alt") is None
+
+    def test_expired_sessions_are_purged_on_lookup(self, worker_pool, tmp_path):
+        """Auch get und finalize entfernen abgelaufene Sessions samt Audio"""
+        manager = TranscriptionSessionManager(worker_pool, MagicMock(), work_dir=tmp_path, ttl=60)
+        manager.add_draft("abgebrochen", np.zeros(10, dtype=np.float32), "text")
+        manager.get("abgebrochen").created_at -= 120
+
+        assert manager.get("andere") is None
+        assert "abgebrochen" not in manager.sessions
+
+        manager.add_draft("fertig", np.zeros(10, dtype=np.float32), "text")
+        manager.get("fertig").finished_at = 0.0
+        with pytest.raises(ValueError):
+            manager.finalize("neu")
+        assert manager.sessions == {}
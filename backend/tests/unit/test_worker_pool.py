@@ -0,0 +1,463 @@
+"""
+Unit-Tests für den TranscriptionWorkerPool
+"""
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+import sys
+
+# Import-Pfad anpassen für Tests
+backend_src = Path(__file__).parent.parent.parent / "src"
+if str(backend_src) not in sys.path:
+    sys.path.insert(0, str(backend_src))
+
+from worker_pool import TranscriptionWorkerPool
+from queue_manager import TranscriptionQueueManager
+
+
+def _read_setting(name):
+    """Liest eine Einstellung im Worker-Prozess"""
+    from config import settings
+    return getattr(settings, name)
+
+
+@pytest.fixture
+def fake_transcriber():
+    """Transcriber-Mock mit festen Ergebnissen"""
+    transcriber = MagicMock()
+    transcriber.transcribe_audio.return_value = ("<p>Formatiert</p>", -0.2)
+    transcriber.transcribe_chunk.return_value = ("Roh", -0.3)
+    return transcriber
+
+
+class TestInProcessPool:
+    """Tests für den Pool ohne Worker-Prozesse"""
+
+    def test_size_in_process(self, fake_transcriber):
+        """Ohne Prozesse steht genau ein Slot zur Verfügung"""
+        pool = TranscriptionWorkerPool(processes=0, transcriber=fake_transcriber)
+        assert pool.in_process
+        assert pool.size == 1
+
+    def test_negative_processes_rejected(self, fake_transcriber):
+        """Negative Prozessanzahl wird abgelehnt"""
+        with pytest.raises(ValueError):
+            TranscriptionWorkerPool(processes=-1, transcriber=fake_transcriber)
+
+    @pytest.mark.asyncio
+    async def test_transcribe_runs_off_loop(self, fake_transcriber):
+        """Transkription läuft im Executor und liefert das Ergebnis zurück"""
+        pool = TranscriptionWorkerPool(processes=0, transcriber=fake_transcriber)
+        await pool.start()
+        try:
+            text, confidence = await pool.transcribe(b"\x00\x00", "Kontext")
+            raw_text, _ = await pool.transcribe(b"\x00\x00", post_process=False)
+        finally:
+            await pool.stop()
+
+        assert text == "<p>Formatiert</p>"
+        assert confidence == -0.2
+        assert raw_text == "Roh"
+        fake_transcriber.transcribe_audio.assert_called_once_with(b"\x00\x00", "Kontext", "balanced", None, None)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_start_loads_once(self, fake_transcriber):
+        """Gleichzeitige start()-Aufrufe teilen sich Laden und Warm-up"""
+        import asyncio
+
+        pool = TranscriptionWorkerPool(processes=0, transcriber=fake_transcriber)
+        assert not pool.ready
+        try:
+            await asyncio.gather(pool.start(), pool.start())
+            assert pool.ready
+        finally:
+            await pool.stop()
+
+        fake_transcriber.warm_up.assert_called_once()
+        assert not pool.ready
+
+    @pytest.mark.asyncio
+    async def test_transcribe_requires_start(self, fake_transcriber):
+        """Ohne start() wird ein Fehler geworfen"""
+        pool = TranscriptionWorkerPool(processes=0, transcriber=fake_transcriber)
+        with pytest.raises(RuntimeError):
+            await pool.transcribe(b"\x00\x00")
+
+
+class TestQueueManagerWithPool:
+    """Tests für die Anbindung des Queue-Managers an den Pool"""
+
+    def test_requires_transcriber_or_pool(self):
+        """Ohne Transcriber und Pool wird ein ValueError geworfen"""
+        with pytest.raises(ValueError):
+            TranscriptionQueueManager()
+
+    def test_workers_match_pool_size(self, fake_transcriber):
+        """Standardmäßig ein Queue-Worker pro Pool-Slot"""
+        pool = TranscriptionWorkerPool(processes=4, transcriber=fake_transcriber)
+        manager = TranscriptionQueueManager(worker_pool=pool)
+        assert manager.max_workers == 4
+
+    @pytest.mark.asyncio
+    async def test_waiting_chunks_are_batched(self, fake_transcriber):
+        """Wartende Chunks werden gemeinsam an den Pool übergeben"""
+        import asyncio
+
+        fake_transcriber.transcribe_batch.side_effect = lambda chunks, prompts, *_: [
+            (f"Text {i}", -0.1) for i in range(len(chunks))
+        ]
+        pool = TranscriptionWorkerPool(processes=0, transcriber=fake_transcriber)
+        manager = TranscriptionQueueManager(
+            worker_pool=pool, max_workers=1, batch_size=4, batch_window_ms=50
+        )
+
+        results = {}
+        done = asyncio.Event()
+
+        async def callback(update):
+            if update["type"] == "transcription_result":
+                results[update["task_id"]] = update["result"]["text"]
+                if len(results) == 3:
+                    done.set()
+
+        task_ids = [
+            await manager.add_task(b"\x00\x00" * 10, "", f"ws-{i}", callback, profile="live")
+            for i in range(3)
+        ]
+        await manager.start()
+        try:
+            await asyncio.wait_for(done.wait(), timeout=5)
+        finally:
+            await manager.stop()
+
+        fake_transcriber.transcribe_batch.assert_called_once()
+        assert [results[task_id] for task_id in task_ids] == ["Text 0", "Text 1", "Text 2"]
+
+    @pytest.mark.asyncio
+    async def test_batched_chunks_skip_prompt_context(self, fake_transcriber):
+        """Gebatchte Live-Chunks laufen ohne Prompt, damit Sessions einen Batch teilen"""
+        import asyncio
+        from services.prompt_context import SessionPromptContext
+
+        fake_transcriber.transcribe_batch.side_effect = lambda chunks, prompts, *_: [
+            (f"Text {i}", -0.1) for i in range(len(chunks))
+        ]
+        pool = TranscriptionWorkerPool(processes=0, transcriber=fake_transcriber)
+        context = SessionPromptContext(max_tokens=50, ttl=3600)
+        manager = TranscriptionQueueManager(
+            worker_pool=pool, max_workers=1, batch_size=4, batch_window_ms=50, prompt_context=context
+        )
+        for i in range(2):
+            context.confirm(f"ws-{i}", f"Kontext {i}")
+
+        results = []
+        done = asyncio.Event()
+
+        async def callback(update):
+            if update["type"] == "transcription_result":
+                results.append(update["result"]["text"])
+                if len(results) == 2:
+                    done.set()
+
+        for i in range(2):
+            await manager.add_task(b"\x00\x00" * 10, None, f"ws-{i}", callback, profile="live")
+        await manager.start()
+        try:
+            await asyncio.wait_for(done.wait(), timeout=5)
+        finally:
+            await manager.stop()
+
+        fake_transcriber.transcribe_batch.assert_called_once()
+        assert fake_transcriber.transcribe_batch.call_args.args[1] == [None, None]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("profile", ["balanced", "archival"])
+    async def test_fallback_profiles_are_not_batched(self, fake_transcriber, profile):
+        """Profile mit Fallback-Leiter oder Beam-Search werden einzeln transkribiert"""
+        import asyncio
+
+        pool = TranscriptionWorkerPool(processes=0, transcriber=fake_transcriber)
+        manager = TranscriptionQueueManager(
+            worker_pool=pool, max_workers=1, batch_size=4, batch_window_ms=50
+        )
+
+        results = []
+        done = asyncio.Event()
+
+        async def callback(update):
+            if update["type"] == "transcription_result":
+                results.append(update["result"]["text"])
+                if len(results) == 3:
+                    done.set()
+
+        for i in range(3):
+            await manager.add_task(b"\x00\x00" * 10, "", f"ws-{i}", callback, profile=profile)
+        await manager.start()
+        try:
+            await asyncio.wait_for(done.wait(), timeout=5)
+        finally:
+            await manager.stop()
+
+        fake_transcriber.transcribe_batch.assert_not_called()
+        assert fake_transcriber.transcribe_audio.call_count == 3
+        assert {call.args[2] for call in fake_transcriber.transcribe_audio.call_args_list} == {profile}
+
+    @pytest.mark.asyncio
+    async def test_prompt_context_follows_chunk_order(self, fake_transcriber):
+        """Kontext wird in Chunk-Reihenfolge bestätigt und beim Start gelesen"""
+        import asyncio
+        import time
+        from services.prompt_context import SessionPromptContext
+
+        prompts = []
+        fake_transcriber.transcribe_audio.side_effect = lambda audio, prompt, *_: (
+            prompts.append(prompt) or ("dritter", -0.1)
+        )
+        pool = TranscriptionWorkerPool(processes=0, transcriber=fake_transcriber)
+        context = SessionPromptContext(max_tokens=50, ttl=3600)
+        manager = TranscriptionQueueManager(
+            worker_pool=pool, max_workers=1, batch_size=1, prompt_context=context
+        )
+
+        done = asyncio.Event()
+
+        async def callback(update):
+            if update["type"] == "transcription_result" and update["result"]["text"] == "dritter":
+                done.set()
+
+        first, second, _ = [
+            manager.active_tasks[await manager.add_task(b"\x00\x00" * 10, None, "ws-1", callback)]
+            for _ in range(3)
+        ]
+
+        # Der zweite Chunk wird vor dem ersten fertig
+        for task, text in ((second, "zweiter"), (first, "erster")):
+            task.start_time = time.time()
+            await manager._complete_task(task, text, -0.1, 0.1)
+            manager.active_tasks.pop(task.id)
+            if task is second:
+                assert context.get("ws-1") is None
+        assert context.get("ws-1") == "erster zweiter"
+
+        await manager.start()
+        try:
+            await asyncio.wait_for(done.wait(), timeout=5)
+        finally:
+            await manager.stop()
+
+        assert prompts == ["erster zweiter"]
+        assert context.get("ws-1") == "erster zweiter dritter"
+
+
+class TestBackgroundReload:
+    """Tests für das Neuladen der Modelle im Hintergrund"""
+
+    @pytest.mark.asyncio
+    async def test_start_reload_returns_immediately(self, fake_transcriber):
+        """start_reload blockiert nicht und meldet den Status"""
+        import asyncio
+        import threading
+
+        release = threading.Event()
+        fake_transcriber.reload_model.side_effect = lambda: release.wait(5)
+        fake_transcriber.model_size = "small"
+
+        pool = TranscriptionWorkerPool(processes=0, transcriber=fake_transcriber)
+        await pool.start()
+        try:
+            status = pool.start_reload()
+            assert status.state == "loading"
+            assert pool.reloading
+
+            # Transkription läuft während des Ladens weiter
+            text, _ = await pool.transcribe(b"\x00\x00")
+            assert text == "<p>Formatiert</p>"
+
+            release.set()
+            await asyncio.wait_for(pool._reload_task, timeout=5)
+        finally:
+            await pool.stop()
+
+        assert pool.reload_status.state == "ready"
+        assert pool.reload_status.model == "small"
+        assert pool.reload_status.progress == 1.0
+
+    @pytest.mark.asyncio
+    async def test_failed_reload_keeps_old_model(self, fake_transcriber):
+        """Ein Fehler beim Laden wird im Status festgehalten"""
+        fake_transcriber.reload_model.side_effect = RuntimeError("Download fehlgeschlagen")
+
+        pool = TranscriptionWorkerPool(processes=0, transcriber=fake_transcriber)
+        await pool.start()
+        try:
+            pool.start_reload()
+            await pool._reload_task
+            text, _ = await pool.transcribe(b"\x00\x00")
+        finally:
+            await pool.stop()
+
+        assert pool.reload_status.state == "failed"
+        assert "Download fehlgeschlagen" in pool.reload_status.error
+        assert text == "<p>Formatiert</p>"
+
+
+class TestWorkerSettings:
+    """Tests für die Übergabe der Konfiguration an Worker-Prozesse"""
+
+    def test_spawned_worker_sees_changed_setting(self, monkeypatch):
+        """Eine zur Laufzeit geänderte Einstellung erreicht neu gestartete Worker"""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        import worker_pool
+
+        monkeypatch.setattr(worker_pool.settings, "WHISPER_MODEL", "tiny-geaendert")
+
+        executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=worker_pool._apply_settings,
+            initargs=(worker_pool._settings_snapshot(),)
+        )
+        try:
+            assert executor.submit(_read_setting, "WHISPER_MODEL").result(timeout=60) == "tiny-geaendert"
+        finally:
+            executor.shutdown()
+
+    def test_executor_passes_settings_snapshot(self, monkeypatch):
+        """Der Executor übergibt den Workern die Einstellungen zum Zeitpunkt seiner Erstellung"""
+        import worker_pool
+
+        monkeypatch.setattr(worker_pool.settings, "WHISPER_MODEL", "small")
+        executor = TranscriptionWorkerPool(processes=1)._create_executor(threads=2)
+        try:
+            threads, values = executor._initargs
+        finally:
+            executor.shutdown()
+
+        assert threads == 2
+        assert values["WHISPER_MODEL"] == "small"
+
+    def test_worker_loads_model_with_snapshot(self, monkeypatch):
+        """_init_worker übernimmt die Einstellungen vor dem Laden des Modells"""
+        import transcriber
+        import worker_pool
+
+        monkeypatch.setattr(worker_pool.settings, "WHISPER_WARMUP", False)
+        values = worker_pool._settings_snapshot()
+        values["WHISPER_MODEL"] = "medium"
+        loaded = []
+        monkeypatch.setattr(transcriber, "Transcriber", lambda: loaded.append(worker_pool.settings.WHISPER_MODEL))
+        # Ursprünglichen Wert nach dem Test wiederherstellen
+        monkeypatch.setattr(worker_pool.settings, "WHISPER_MODEL", worker_pool.settings.WHISPER_MODEL)
+        monkeypatch.setattr(worker_pool, "_worker_transcriber", None)
+
+        worker_pool._init_worker(0, values)
+
+        assert loaded == ["medium"]
+
+
+    @pytest.mark.asyncio
+    async def test_reload_uses_new_model_in_new_workers(self, monkeypatch):
+        """Nach dem Neuladen arbeiten die neuen Worker mit dem geänderten WHISPER_MODEL"""
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        import transcriber
+        import worker_pool
+
+        class FakeTranscriber:
+            def __init__(self):
+                self.model_size = worker_pool.settings.WHISPER_MODEL
+
+        def inline_pool(max_workers, mp_context, initializer, initargs):
+            # Threads statt Prozesse; wie nach spawn startet der Worker mit den Standardwerten
+            def spawned(*args):
+                worker_pool.settings.WHISPER_MODEL = "base"
+                initializer(*args)
+            return ThreadPoolExecutor(max_workers=max_workers, initializer=spawned, initargs=initargs)
+
+        monkeypatch.setattr(worker_pool, "ProcessPoolExecutor", inline_pool)
+        monkeypatch.setattr(transcriber, "Transcriber", FakeTranscriber)
+        monkeypatch.setattr(worker_pool, "_worker_transcriber", None)
+        monkeypatch.setattr(worker_pool, "configure_logging", lambda level: None)
+        monkeypatch.setattr(worker_pool, "apply_thread_budget", lambda threads: None)
+        monkeypatch.setattr(worker_pool.settings, "TRANSCRIPTION_AUTOTUNE", False)
+        monkeypatch.setattr(worker_pool.settings, "WHISPER_WARMUP", False)
+        monkeypatch.setattr(worker_pool.settings, "WHISPER_MODEL", "base")
+
+        pool = TranscriptionWorkerPool(processes=1)
+        await pool.start()
+        try:
+            old_executor = pool._executor
+            worker_pool.settings.WHISPER_MODEL = "small"
+            pool.start_reload()
+            await asyncio.wait_for(pool._reload_task, timeout=5)
+            new_executor = pool._executor
+            _, model = await asyncio.get_running_loop().run_in_executor(new_executor, worker_pool._worker_ping)
+        finally:
+            await pool.stop()
+
+        assert new_executor is not old_executor
+        assert pool.reload_status.state == "ready"
+        assert pool.reload_status.model == "small"
+        assert model == "small"
+
+
+class TestThreadBudget:
+    """Tests für die Aufteilung der Kerne auf die Worker"""
+
+    def test_cores_are_split_across_workers(self, monkeypatch):
+        """Ohne feste Vorgabe erhält jeder Worker einen gleichen Anteil der Kerne"""
+        from utils import thread_budget
+        monkeypatch.setattr(thread_budget.settings, "TORCH_THREADS_PER_WORKER", 0)
+
+        assert thread_budget.thread_budget(4, cores=16) == 4
+        assert thread_budget.thread_budget(3, cores=8) == 2
+        assert thread_budget.thread_budget(16, cores=4) == 1
+
+        monkeypatch.setattr(thread_budget.settings, "TORCH_THREADS_PER_WORKER", 3)
+        assert thread_budget.thread_budget(4, cores=16) == 3
+
+    def test_cgroup_cpu_limit(self, monkeypatch, tmp_path):
+        """Ein CPU-Limit der cgroup begrenzt die verfügbaren Kerne"""
+        from utils import thread_budget
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("250000 100000\n")
+        monkeypatch.setattr(thread_budget, "CGROUP_CPU_MAX", cpu_max)
+        monkeypatch.setattr(thread_budget.os, "sched_getaffinity", lambda pid: set(range(32)))
+
+        assert thread_budget.available_cores() == 3
+
+        cpu_max.write_text("max 100000\n")
+        assert thread_budget.available_cores() == 32
+
+    @pytest.mark.asyncio
+    async def test_autotune_keeps_best_split(self, monkeypatch):
+        """Das Auto-Tuning behält die Aufteilung mit dem besten Gesamt-RTF"""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        import worker_pool
+
+        fake_transcriber = MagicMock()
+        fake_transcriber.model_size = "base"
+        # Konstante Dauer je Aufruf: mehr parallele Worker ergeben den besten Durchsatz
+        fake_transcriber.transcribe_chunk.side_effect = lambda audio: time.sleep(0.02)
+        monkeypatch.setattr(worker_pool, "_worker_transcriber", fake_transcriber)
+        monkeypatch.setattr(worker_pool, "available_cores", lambda: 8)
+        monkeypatch.setattr(worker_pool.settings, "TRANSCRIPTION_AUTOTUNE", True)
+        monkeypatch.setattr(worker_pool.settings, "TRANSCRIPTION_AUTOTUNE_SECONDS", 1)
+        monkeypatch.setattr(worker_pool.settings, "TORCH_THREADS_PER_WORKER", 0)
+
+        created = []
+
+        def create_executor(self, processes=None, threads=None):
+            created.append((processes, threads))
+            return ThreadPoolExecutor(max_workers=processes)
+
+        monkeypatch.setattr(TranscriptionWorkerPool, "_create_executor", create_executor)
+
+        pool = TranscriptionWorkerPool(processes=4)
+        await pool.start()
+        await pool.stop()
+
+        assert created == [(1, 8), (2, 4), (4, 2)]
+        assert (pool.processes, pool.threads) == (4, 2)
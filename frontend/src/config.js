@@ -52,6 +52,8 @@ export const API_CONFIG = {
     // Lokale Entwicklung: KEIN /api/ Prefix (Backend hat keine /api/ Routes)
     // Production: MIT /api/ Prefix (Traefik entfernt es und leitet an Backend weiter)
     UPLOAD: isLocalDevelopment ? '/upload_audio' : '/api/upload_audio',
+    FORMATTING: isLocalDevelopment ? '/formatting' : '/api/formatting',
+    SESSIONS: isLocalDevelopment ? '/sessions' : '/api/sessions',
     TEMPLATES: isLocalDevelopment ? '/templates/' : '/api/templates/',
     PROCESS: isLocalDevelopment ? '/process_template' : '/api/process_template',
     CONFIG: isLocalDevelopment ? '/config' : '/api/config',
@@ -127,11 +127,14 @@ class ApiService {
   /**
    * Audio-Datei hochladen
    * @param {File} file - Audio-Datei
+   * @param {Object} options - Optional { sessionId, draft } für Live-Entwürfe
    * @returns {Promise<Object>} - Transkriptionsergebnis
    */
-  async uploadAudio(file) {
+  async uploadAudio(file, { sessionId = null, draft = false } = {}) {
     const formData = new FormData()
     formData.append('file', file)
+    if (sessionId) formData.append('session_id', sessionId)
+    if (draft) formData.append('draft', 'true')
     
     // Audio-Upload braucht längeres Timeout (Transkription + LLM-Processing)
     const options = { 
@@ -144,6 +147,41 @@ class ApiService {
     return this.request(API_CONFIG.ENDPOINTS.UPLOAD, options)
   }
 
+  /**
+   * Stand der asynchronen LLM-Formatierung abrufen
+   * @param {string} formattingId - ID aus der Upload-Antwort
+   * @returns {Promise<Object>} - Status und formatierter Text
+   */
+  async getFormatting(formattingId) {
+    return this.get(`${API_CONFIG.ENDPOINTS.FORMATTING}/${formattingId}`)
+  }
+
+  /**
+   * Finalen Durchlauf einer Live-Aufnahme mit dem Hauptmodell starten
+   * @param {string} sessionId - ID der Aufnahme
+   * @param {File} file - Optional die vollständige Aufnahme
+   * @returns {Promise<Object>} - Stand der Session
+   */
+  async finalizeSession(sessionId, file = null) {
+    const formData = new FormData()
+    if (file) formData.append('file', file)
+    return this.request(`${API_CONFIG.ENDPOINTS.SESSIONS}/${sessionId}/finalize`, {
+      method: 'POST',
+      headers: {},
+      body: formData,
+      timeout: 120000
+    })
+  }
+
+  /**
+   * Stand einer Live-Aufnahme abrufen (Entwurf, finaler Text)
+   * @param {string} sessionId - ID der Aufnahme
+   * @returns {Promise<Object>} - Stand der Session
+   */
+  async getSession(sessionId) {
+    return this.get(`${API_CONFIG.ENDPOINTS.SESSIONS}/${sessionId}`)
+  }
+
   /**
    * Alle Templates abrufen
    * @returns {Promise<Array>} - Template-Liste